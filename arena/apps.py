@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ArenaConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'arena'
+
+    def ready(self):
+        # DB 커넥션 생성 시그널에 쿼리 계측을 등록하고 경기장 지표를 /metrics에 올림
+        import config.metrics  # noqa: F401
+        from .domain import arena_manager  # noqa: F401
@@ -2,18 +2,45 @@ from channels.generic.websocket import AsyncWebsocketConsumer
 from .services import ArenaService
 from .domain.arena import Arena
 from .domain.player import Player
+from .domain.remote_arena import RemoteArena
+from .domain.replay import Replay
+from .domain.replay_player import ReplayPlayer
 import json
 from config.services import UserService
 from .domain.arena_manager import ArenaManager
-from .enums import Direction, ArenaType
+from .enums import Direction, ArenaType, InputCommand
+from .models import BaseMatch
 from reception.services import ReceptionService
-from config.redis_services import ReceptionRedisService, ArenaRedisService
+from config.redis_services import ArenaRedisService, ArenaSpectatorRedisService, ArenaReplayRedisService
 from tournament.services import TournamentService
 from asgiref.sync import sync_to_async
 from config.close_codes import CloseCode
+from config.local_fanout import LocalFanout
+from config.metrics import ConsumerMetricsMixin
+from django.conf import settings
+from .protocol import BINARY_SUBPROTOCOL, INPUT_DIRECTIONS, INPUT_KEYFRAME, INPUT_RELEASE, encode_state_frame, decode_input_frame
+from config.rate_limit import TokenBucket
+from .domain.snapshot import SnapshotThrottle
+from urllib.parse import parse_qs
+import asyncio
 
-class ArenaConsumer(AsyncWebsocketConsumer):
+async def send_client_event(consumer, event):
+    if 'text' not in event:
+        # 다른 워커에서 온 state는 message만 실려 오므로 이 연결에 필요한 형식만 직렬화
+        if consumer.binary:
+            await consumer.send(bytes_data=encode_state_frame(event['message']))
+        else:
+            await consumer.send_json({'type': event['message_type'], 'message': event['message']})
+    elif consumer.binary and 'bytes' in event:
+        await consumer.send(bytes_data=event['bytes'])
+    else:
+        await consumer.send(text_data=event['text'])
+
+
+class ArenaConsumer(ConsumerMetricsMixin, AsyncWebsocketConsumer):
+    metrics_label = 'arena'
     directions = {d.value for d in Direction}
+    arena = None
     
     async def connect(self):
         await self.initialize_data()
@@ -22,8 +49,9 @@ class ArenaConsumer(AsyncWebsocketConsumer):
             self.close(code=CloseCode.INVALID_ACCESS)
             return
         
-        await self.accept()
+        await self.accept(subprotocol=BINARY_SUBPROTOCOL if self.binary else None)
         await self.channel_layer.group_add(self.arena_group_name, self.channel_name)
+        await LocalFanout.join(self.arena_group_name, self)
         
         await self.initialize_arena()
         
@@ -32,6 +60,10 @@ class ArenaConsumer(AsyncWebsocketConsumer):
         self.user_id = self.scope.get('user_id')
         self.token = self.scope.get('token')
         self.arena = None
+        self.binary = BINARY_SUBPROTOCOL in self.scope.get('subprotocols', [])
+        self.input_limiter = TokenBucket(settings.ARENA_INPUT_RATE_LIMIT, settings.ARENA_INPUT_BURST)
+        self.keyframe_limiter = TokenBucket(1, 1)
+        self.snapshot_throttle = self.get_snapshot_throttle()
         self.user_name = await UserService.get_user_name(self.user_id, self.token)
         
         if "arena_id" in kwargs:
@@ -46,6 +78,22 @@ class ArenaConsumer(AsyncWebsocketConsumer):
             self.arena_group_name = TournamentService.get_group_name(self.arena_id)
             self.type = ArenaType.TOURNAMENT
         
+    def get_snapshot_throttle(self):
+        # 클라이언트가 ?snapshot_rate=10 처럼 더 낮은 수신 Hz를 요청할 수 있음
+        query = parse_qs(self.scope.get('query_string', b'').decode())
+        try:
+            snapshot_rate = float(query['snapshot_rate'][0])
+        except (KeyError, ValueError):
+            return None
+        if snapshot_rate <= 0 or snapshot_rate >= settings.ARENA_SNAPSHOT_RATE:
+            return None
+        return SnapshotThrottle(round(settings.ARENA_SNAPSHOT_RATE / snapshot_rate))
+        
+    def get_snapshot_rate(self):
+        if self.snapshot_throttle:
+            return settings.ARENA_SNAPSHOT_RATE / self.snapshot_throttle.every
+        return settings.ARENA_SNAPSHOT_RATE
+        
     async def validate_access(self):
         if self.type == ArenaType.NORMAL:
             if not await ArenaRedisService.is_allowed_user(self.arena_id, self.user_id):
@@ -59,66 +107,165 @@ class ArenaConsumer(AsyncWebsocketConsumer):
             return True
         
     async def initialize_arena(self):
-        self.arena:Arena = ArenaManager.get_arena(self.arena_id)
+        owner = await ArenaManager.claim(self.arena_id)
+        if owner is None:
+            # 과부하 워커는 새 경기장을 거절하고 클라이언트가 다른 워커로 재접속하게 함
+            await self.close(code=CloseCode.WORKER_OVERLOADED.value)
+            return
+        if not ArenaManager.is_local(owner):
+            return await self.join_remote_arena(owner)
+        
+        self.arena:Arena = await ArenaManager.get_or_restore_arena(self.arena_id)
         self.arena.set_messenger(self.arena_group_name, self.broadcast_message)
         
+        self.player = ArenaManager.rejoin(self.arena, self.user_id)
+        if self.player:
+            self.team = self.player.team
+        elif not await self.add_player():
+            self.arena = None
+            await self.close(code=CloseCode.ARENA_FULL.value)
+            return
+        self.arena.request_keyframe()
+        await self.send_team()
+        
+    async def add_player(self):
         if self.type == ArenaType.TOURNAMENT:
             self.team = await TournamentService.get_user_team(self.tournament_id, self.match_number, self.user_id)
         else:
-            self.team = self.arena.get_remaining_team()
+            self.team = self.arena.get_remaining_team(self.user_id)
         self.player = Player(self.user_id, self.arena, self.team)
-        if not await self.arena.add_player(self.player):
-            self.close(code=CloseCode.ARENA_FULL)
+        return await self.arena.add_player(self.player)
+        
+    async def join_remote_arena(self, owner):
+        # 경기장은 소유 워커에서 돌고, 이 컨슈머는 입력 전달과 그룹 브로드캐스트 수신만 담당
+        self.arena = RemoteArena(self.arena_id, owner)
+        self.player = None
+        team = None
+        if self.type == ArenaType.TOURNAMENT:
+            team = await TournamentService.get_user_team(self.tournament_id, self.match_number, self.user_id)
+        await self.arena.join(self.arena_group_name, self.user_id, team, self.channel_name)
+        
+    async def arena_joined(self, event):
+        if not event['team']:
+            self.arena = None
+            await self.close(code=CloseCode.ARENA_FULL.value)
             return
+        self.team = BaseMatch.Team(event['team'])
+        await self.send_team()
+        
+    @property
+    def is_remote(self):
+        return isinstance(self.arena, RemoteArena)
         
+    async def send_team(self):
         await self.send_json({
             'type': 'team',
             'message': self.team.value
         })
+        await self.send_json({
+            'type': 'timing',
+            'message': {
+                'tick_rate': settings.ARENA_TICK_RATE,
+                'snapshot_rate': self.get_snapshot_rate(),
+                'broadcast_mode': settings.ARENA_BROADCAST_MODE
+            }
+        })
 
     async def disconnect(self, close_code):
         await self.channel_layer.group_discard(
             self.arena_group_name,
             self.channel_name
         )
+        await LocalFanout.leave(self.arena_group_name, self)
         
         if not self.arena:
             return
         
-        if self.arena.is_started() and not self.arena.is_finished:
-            self.handle_player_forfeit()
-            
-        await self.arena.remove_player(self.player)
-        await ArenaRedisService.remove_allowed_user(self.arena_id, self.user_id)
-        
-    async def handle_player_forfeit(self):
-        await self.broadcast_message('exit', f'{self.user_name} is exit arena.')
-        await self.arena.forfeit(self.user_id)
-        await ReceptionRedisService.remove_allowed_user(self.match.reception_id, self.user_id)
-        await ReceptionRedisService.remove_user(self.match.reception_id, self.user_id)
-        
-        if await ReceptionRedisService.should_remove(self.match.reception_id):
-            await ReceptionService.remove(self.match.reception_id)
+        # 기권 여부는 소유 워커가 유예 시간 뒤에 판단. 입장 허용 키는 경기가 끝날 때까지 유지
+        reception_id = self.match.reception_id if self.type == ArenaType.NORMAL else None
+        if self.is_remote:
+            await self.arena.leave(self.user_id, self.user_name, reception_id)
+        else:
+            await ArenaManager.arena_leave({
+                'arena_id': self.arena_id,
+                'user_id': self.user_id,
+                'user_name': self.user_name,
+                'reception_id': reception_id,
+            })
         
-    async def receive(self, text_data):
+    async def receive(self, text_data=None, bytes_data=None):
+        if bytes_data is not None:
+            return await self.receive_input_frame(bytes_data)
         try:
             data = json.loads(text_data)
             message_type = data.get('type')
             
-            if message_type == 'move':
+            if message_type == 'press':
+                await self.handle_press(data.get('direction'))
+            elif message_type == 'release':
+                await self.handle_release(data.get('direction'))
+            elif message_type == 'move':
                 await self.handle_move(data.get('direction'))
+            elif message_type == 'keyframe':
+                await self.apply_input(InputCommand.KEYFRAME)
         except json.JSONDecodeError:
             await self.send_json({'error': 'json decode error'})
         
-    async def handle_move(self, direction):
+    async def receive_input_frame(self, bytes_data):
+        try:
+            command = decode_input_frame(bytes_data)
+        except ValueError:
+            return await self.send_json({'type': 'error', 'message': 'invalid input frame'})
+        
+        if command == INPUT_KEYFRAME:
+            await self.apply_input(InputCommand.KEYFRAME)
+        elif command == INPUT_RELEASE:
+            await self.apply_input(InputCommand.RELEASE)
+        elif command in INPUT_DIRECTIONS:
+            await self.apply_input(InputCommand.PRESS, INPUT_DIRECTIONS[command])
+            
+    def allow_input(self, command):
+        # release를 버리면 패들이 계속 움직이므로 항상 통과. keyframe은 1초에 한 번으로 합침(이미 요청한 키프레임이 곧 전송됨)
+        if command == InputCommand.RELEASE:
+            return True
+        if command == InputCommand.KEYFRAME:
+            return self.keyframe_limiter.consume()
+        return self.input_limiter.consume()
+    
+    async def apply_input(self, command, direction=None):
+        if not self.arena or not self.allow_input(command):
+            return
+        if self.is_remote:
+            await self.arena.handle_input(self.user_id, command, direction)
+        else:
+            self.arena.handle_input(self.player, command, direction)
+        
+    async def parse_direction(self, direction):
         if direction not in self.directions:
             await self.send_json({
                 'type': 'error',
                 'message': 'invalid direction' 
             })
-            return
+            return None
+        return Direction(direction)
+        
+    async def handle_press(self, direction):
+        direction = await self.parse_direction(direction)
+        if direction:
+            await self.apply_input(InputCommand.PRESS, direction)
             
-        self.player.move(direction)
+    async def handle_release(self, direction):
+        if direction is None:
+            await self.apply_input(InputCommand.RELEASE)
+            return
+        direction = await self.parse_direction(direction)
+        if direction:
+            await self.apply_input(InputCommand.RELEASE, direction)
+        
+    async def handle_move(self, direction):
+        direction = await self.parse_direction(direction)
+        if direction:
+            await self.apply_input(InputCommand.TAP, direction)
             
     async def arena_end(self, event):
         result = event['message']
@@ -139,24 +286,167 @@ class ArenaConsumer(AsyncWebsocketConsumer):
             await self.send_json(message)
             
             await ReceptionService.reset_state(self.match.reception_id)
+            await ArenaRedisService.remove_allowed_user(self.arena_id, self.user_id)
         
         await self.close()
         
+    async def arena_expired(self, event):
+        await self.send_json({
+            'type': 'arena.expired',
+            'message': event['message']
+        })
+        await self.close(code=CloseCode.ARENA_EXPIRED.value)
+        
+    async def dispatch(self, message):
+        # 같은 프로세스에서 보낸 이벤트는 LocalFanout이 이미 전달함
+        if message.get('origin') == settings.WORKER_ID:
+            return
+        if self.is_remote:
+            self.arena.observe(message)
+        await super().dispatch(message)
+        
     async def broadcast_message(self, message_type, message):
-        await self.channel_layer.group_send(
-            self.arena_group_name,
-            {
-                'type': 'send_to_client',
-                'message_type': message_type,
-                'message': message
-            }
-        )
+        await ArenaService.broadcast(self.arena_group_name, message_type, message)
 
     async def send_to_client(self, event):
+        if self.snapshot_throttle and event['message_type'] == 'state':
+            return await self.send_throttled_state(event['message'])
+        await send_client_event(self, event)
+        
+    async def send_throttled_state(self, message):
+        # 건너뛴 delta를 합친 메시지는 이 연결에서만 쓰이므로 여기서 직렬화
+        merged = self.snapshot_throttle.push(message)
+        if merged is None:
+            return
+        if self.binary:
+            await self.send(bytes_data=encode_state_frame(merged))
+        else:
+            await self.send_json({'type': 'state', 'message': merged})
+        
+    async def send_json(self, message):
+        await self.send(text_data=json.dumps(message))
+
+
+class SpectatorConsumer(ConsumerMetricsMixin, AsyncWebsocketConsumer):
+    """읽기 전용 관전 연결. 선수 그룹과 분리된 관전자 그룹에서 저빈도 state를 받음"""
+    metrics_label = 'spectator'
+    
+    async def connect(self):
+        self.arena_id = self.scope['url_route']['kwargs']['arena_id']
+        self.group_name = ArenaService.get_spectator_group_name(self.arena_id)
+        self.binary = BINARY_SUBPROTOCOL in self.scope.get('subprotocols', [])
+        self.watching = await ArenaManager.watch(self.arena_id)
+        
+        if not self.watching:
+            await self.close(code=CloseCode.INVALID_ACCESS.value)
+            return
+        
+        await self.accept(subprotocol=BINARY_SUBPROTOCOL if self.binary else None)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await LocalFanout.join(self.group_name, self)
+        
+        latest = await ArenaSpectatorRedisService.get_latest(self.arena_id)
+        if latest:
+            if self.binary:
+                await self.send(bytes_data=encode_state_frame(latest))
+            else:
+                await self.send_json({'type': 'state', 'message': latest})
+    
+    async def disconnect(self, close_code):
+        await self.channel_layer.group_discard(self.group_name, self.channel_name)
+        await LocalFanout.leave(self.group_name, self)
+        if self.watching:
+            await ArenaManager.unwatch(self.arena_id)
+        
+    async def receive(self, text_data=None, bytes_data=None):
+        pass
+    
+    async def dispatch(self, message):
+        if message.get('origin') == settings.WORKER_ID:
+            return
+        await super().dispatch(message)
+        
+    async def send_to_client(self, event):
+        await send_client_event(self, event)
+            
+    async def send_json(self, message):
+        await self.send(text_data=json.dumps(message))
+
+
+class ReplayConsumer(ConsumerMetricsMixin, AsyncWebsocketConsumer):
+    """기록된 경기를 1~16배속으로 재생. seek은 가장 가까운 이전 키프레임부터 다시 시뮬레이션"""
+    metrics_label = 'replay'
+    min_speed = 1
+    max_speed = 16
+    
+    async def connect(self):
+        self.arena_id = self.scope['url_route']['kwargs']['arena_id']
+        self.stream_task = None
+        # 끝난 경기는 DB에, 아직 진행 중인 경기는 Redis 버퍼에 있음
+        data = await ArenaService.get_replay(self.arena_id) or await ArenaReplayRedisService.get(self.arena_id)
+        if not data:
+            await self.close(code=CloseCode.INVALID_ACCESS.value)
+            return
+        
+        try:
+            replay = Replay.parse(data)
+        except ValueError:
+            await self.close(code=CloseCode.INVALID_ACCESS.value)
+            return
+        
+        self.player = ReplayPlayer(replay)
+        self.speed = self.min_speed
+        self.playing = asyncio.Event()
+        self.playing.set()
+        
+        await self.accept()
         await self.send_json({
-            'type': event['message_type'],
-            'message': event['message']
+            'type': 'replay.info',
+            'message': {
+                'tick_rate': replay.tick_rate,
+                'last_tick': replay.last_tick,
+                'keyframes': replay.keyframe_ticks,
+                'left_player': replay.left_user_id,
+                'right_player': replay.right_user_id
+            }
         })
+        self.stream_task = asyncio.create_task(self.stream())
         
+    async def disconnect(self, close_code):
+        if self.stream_task:
+            self.stream_task.cancel()
+            
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            data = json.loads(text_data)
+            message_type = data.get('type')
+            
+            if message_type == 'speed':
+                self.speed = min(max(int(data.get('value')), self.min_speed), self.max_speed)
+            elif message_type == 'seek':
+                self.player.seek(int(data.get('tick')))
+                self.playing.set()
+            elif message_type == 'pause':
+                self.playing.clear()
+            elif message_type == 'play':
+                self.playing.set()
+        except json.JSONDecodeError:
+            await self.send_json({'error': 'json decode error'})
+        except (TypeError, ValueError):
+            await self.send_json({'type': 'error', 'message': 'invalid replay command'})
+            
+    async def stream(self):
+        while True:
+            await self.playing.wait()
+            if self.player.is_finished:
+                await self.send_json({'type': 'replay.end', 'message': self.player.get_result()})
+                self.playing.clear()
+                continue
+            
+            frame_ticks = self.player.arena.snapshot_interval
+            for message_type, message in self.player.advance(frame_ticks):
+                await self.send_json({'type': message_type, 'message': message})
+            await asyncio.sleep(frame_ticks / self.player.replay.tick_rate / self.speed)
+            
     async def send_json(self, message):
         await self.send(text_data=json.dumps(message))
\ No newline at end of file
@@ -1,15 +1,34 @@
+import time
 from typing import TYPE_CHECKING
 from .ball import Ball
+from .bar import Bar
+from .telemetry import TickTelemetry
+from .snapshot import SnapshotEncoder
+from .trajectory import TrajectoryEncoder
+from .spectator_feed import SpectatorFeed
+from .replay import ReplayRecorder
+from django.conf import settings
 from arena.models import BaseMatch
-import asyncio
+from arena.enums import ArenaPhase, InputCommand
 from config.consumer_utils import broadcast_event
 
 if TYPE_CHECKING:
     from .player import Player
+    from .tick_scheduler import TickScheduler
     
 
 class Arena:
-    def __init__(self, arena_id):
+    __slots__ = (
+        "arena_id", "width", "height", "left_player", "right_player",
+        "current_round", "max_score", "countdown_seconds", "countdown_ticks",
+        "snapshot_interval", "telemetry", "snapshot_encoder",
+        "trajectory_encoder", "spectator_feed", "recorder", "scheduler",
+        "group_name", "broadcast_func", "ball_class", "bar_class", "ball",
+        "created_at", "release_func", "_phase", "_outbox", "_state", "_resume",
+        "_tick", "_tick_offset", "_clock",
+    )
+    
+    def __init__(self, arena_id, scheduler: "TickScheduler", release_func=None):
         self.arena_id = arena_id
         self.width = 138
         self.height = 76
@@ -17,12 +36,41 @@ class Arena:
         self.right_player = None
         self.current_round = 1
         self.max_score = 2
-        self._loop_task = None
-        self.is_finished = False
-        self.speed = 5
+        self.countdown_seconds = 3
+        self.countdown_ticks = 0
+        self._tick = 0
+        self._tick_offset = 0
+        self._clock = None
+        self.snapshot_interval = max(1, round(scheduler.tick_rate / settings.ARENA_SNAPSHOT_RATE))
+        self.telemetry = TickTelemetry()
+        self.snapshot_encoder = SnapshotEncoder(settings.ARENA_KEYFRAME_INTERVAL)
+        self.trajectory_encoder = None
+        if settings.ARENA_BROADCAST_MODE == 'trajectory':
+            self.trajectory_encoder = TrajectoryEncoder()
+        self.spectator_feed = SpectatorFeed(arena_id, scheduler.tick_rate)
+        self.recorder = None
+        if settings.ARENA_REPLAY_ENABLED:
+            self.recorder = ReplayRecorder(
+                arena_id, settings.ARENA_REPLAY_KEYFRAME_INTERVAL, settings.ARENA_REPLAY_TTL
+            )
+        self.scheduler = scheduler
         self.group_name = None
         self.broadcast_func = None
-        self.ball = Ball(self)
+        self.created_at = time.monotonic()
+        self.release_func = release_func
+        self._outbox = []
+        self._resume = None
+        engine = scheduler.engine
+        self.ball_class = engine.ball_class if engine else Ball
+        self.bar_class = engine.bar_class if engine else Bar
+        self.ball = self.ball_class(self)
+        self.phase = ArenaPhase.WAITING
+        self._state = {
+            "tick": 0,
+            "ball": {"x": 0, "y": 0},
+            "left_player_bar": {"x": 0, "y": 0},
+            "right_player_bar": {"x": 0, "y": 0},
+        }
     
     def set_messenger(self, group_name, broadcast_func):
         if self.group_name is None:
@@ -30,7 +78,14 @@ class Arena:
         if self.broadcast_func is None:
             self.broadcast_func = broadcast_func
             
-    def get_remaining_team(self):
+    def get_remaining_team(self, user_id=None):
+        if self._resume:
+            # 복구된 경기는 체크포인트에 기록된 원래 자리로만 입장
+            if user_id == self._resume["left"][0] and not self.left_player:
+                return BaseMatch.Team.LEFT
+            if user_id == self._resume["right"][0] and not self.right_player:
+                return BaseMatch.Team.RIGHT
+            return None
         if not self.left_player:
             return BaseMatch.Team.LEFT
         elif not self.right_player:
@@ -47,57 +102,213 @@ class Arena:
         
         if self.left_player and self.right_player:
             await self.play()
-        else:
+        elif not self.scheduler.overload.is_overloaded:
+            # 과부하 중에는 필수가 아닌 대기 안내를 생략
             await self.broadcast_func('waiting', 'Waiting for other player.')
         
         return player.team
         
+    def get_player(self, user_id):
+        for player in (self.left_player, self.right_player):
+            if player and player.user_id == user_id:
+                return player
+        return None
+        
+    def handle_input(self, player: "Player", command: InputCommand, direction=None):
+        if self.recorder:
+            self.recorder.record_input(self.current_tick, player.team, command, direction)
+        if command == InputCommand.KEYFRAME:
+            self.request_keyframe()
+        elif command == InputCommand.PRESS:
+            player.press(direction)
+        elif command == InputCommand.RELEASE:
+            player.release(direction)
+        elif command == InputCommand.TAP:
+            player.tap(direction)
+            
     async def remove_player(self, player: "Player"):
         if player is self.left_player:
             self.left_player = None
         elif player is self.right_player:
             self.right_player = None
+        
+        # 시작 전에 모두 나간 대기방은 바로 정리
+        if self.is_empty() and not self.is_started():
+            self.release()
+            
+    def is_empty(self):
+        return not self.left_player and not self.right_player
+    
+    def release(self):
+        # 승자 기록 없이 해제되는 경우에도 남은 리플레이 버퍼를 내보내고 기록을 끝냄
+        if self.recorder:
+            self.recorder.close(self)
+        if self.release_func:
+            self.release_func(self)
+            
+    @property
+    def current_tick(self):
+        # 배치 엔진에 붙어 있으면 엔진이 모든 경기 틱을 한 번에 세므로 거기서 오프셋을 뺀 값
+        clock = self._clock
+        if clock is None:
+            return self._tick
+        return clock.ticks - self._tick_offset
+    
+    @current_tick.setter
+    def current_tick(self, tick):
+        if self._clock is None:
+            self._tick = tick
+        else:
+            self._tick_offset = self._clock.set_tick(self, tick)
             
+    def attach_clock(self, clock):
+        self._tick_offset = clock.ticks - self._tick
+        self._clock = clock
+        return self._tick_offset
+    
+    def detach_clock(self):
+        self._tick = self.current_tick
+        self._clock = None
+            
+    @property
+    def phase(self):
+        return self._phase
+    
+    @phase.setter
+    def phase(self, phase: ArenaPhase):
+        self._phase = phase
+        self.ball.playing = phase == ArenaPhase.PLAYING
+    
+    @property
+    def is_finished(self):
+        return self.phase == ArenaPhase.FINISHED
+    
     def is_started(self):
-        return self._loop_task is not None
+        return self.phase != ArenaPhase.WAITING
             
     async def play(self):
-        if self._loop_task is None:
-            self._loop_task = asyncio.create_task(self._game_loop())
+        if self.phase == ArenaPhase.WAITING:
+            if self._resume:
+                self.resume()
+            else:
+                self.begin()
+            if self.recorder:
+                self.recorder.start(self)
+            self.scheduler.register(self)
+            
+    def begin(self):
+        self.start()
+        self.start_countdown()
             
-    async def _game_loop(self):
-        await self.start()
-        await self.countdown()
+    def resume(self):
+        checkpoint, self._resume = self._resume, None
+        self.ball.x, self.ball.y, self.ball.vx, self.ball.vy = checkpoint["ball"]
+        for player, (_, score, bar_y) in (
+            (self.left_player, checkpoint["left"]),
+            (self.right_player, checkpoint["right"]),
+        ):
+            player.score = score
+            player.bar.y = bar_y
         
-        while not self.is_finished:
-            self.ball.update_position()
-            self.ball.handle_collision(self.left_player.bar, self.right_player.bar)
+        self.emit('start', 'Arena is resuming!')
+        self.emit('resume', {**self.get_scores(), "round": self.current_round})
+        self.request_keyframe()
+        self.start_countdown()
+            
+    def step(self):
+        self.current_tick += 1
+        if self.phase == ArenaPhase.COUNTDOWN:
+            self.step_countdown()
+        elif self.phase == ArenaPhase.PLAYING:
+            self.step_play()
+        if self.recorder and self.recorder.is_keyframe_due(self.current_tick):
+            self.recorder.record_keyframe(self)
+            
+    def step_play(self):
+        self.ball.update_position()
+        self.ball.handle_collision(self.left_player.bar, self.right_player.bar)
 
-            round_result = self.check_round_end()
-            if round_result:
-                await self.broadcast_func('round.over', self.get_scores())
-                self.reset_round()
-                if self.check_winner():
-                    break
-                await self.countdown()
+        round_result = self.check_round_end()
+        if not round_result:
+            self.left_player.apply_input()
+            self.right_player.apply_input()
 
-            await self.broadcast_func('state', self.get_state())
-            await asyncio.sleep(1 / self.speed)
+        # 과부하 단계에 따라 스냅샷과 관전 주기를 늘림
+        scale = self.scheduler.overload.snapshot_scale
+        self.emit_frame(
+            round_result,
+            self.current_tick % (self.snapshot_interval * scale) == 0,
+            self.spectator_feed.is_due(self.current_tick, scale),
+        )
         
-        await self.end_game()
+    def emit_frame(self, round_result, snapshot_due, spectator_due, positions=None):
+        """물리를 진행한 뒤의 라운드 처리와 상태 전송. 배치 엔진은 이 작업이 필요한 틱에만 부르고 위치도 미리 꺼내 넘김"""
+        if round_result:
+            self.emit('round.over', self.get_scores())
+            self.reset_round()
+            if self.check_winner():
+                return
+            self.start_countdown()
+            # 리셋으로 위치가 바뀌었으므로 다시 읽음
+            positions = None
+            
+        if self.trajectory_encoder:
+            self.emit_trajectory()
+        # 시뮬레이션은 매 틱, 스냅샷은 snapshot_interval 틱마다 (라운드 리셋은 즉시)
+        elif round_result or snapshot_due:
+            self.emit('state', self.snapshot_encoder.encode(self.get_state(positions)))
+            
+        if round_result or spectator_due:
+            self.spectator_feed.update(self.get_state(positions))
+            
+    def emit_trajectory(self):
+        # 공은 충돌, 리셋, 득점 때만 경로가 바뀌므로 그 사이는 클라이언트가 외삽
+        message = self.trajectory_encoder.encode(self.current_tick, self.ball, (
+            ("left_player_bar", self.left_player.bar),
+            ("right_player_bar", self.right_player.bar),
+        ))
+        if message:
+            self.emit('trajectory', message)
+        
+    def start_countdown(self):
+        self.phase = ArenaPhase.COUNTDOWN
+        self.countdown_ticks = self.countdown_seconds * self.scheduler.tick_rate
         
-    async def countdown(self):
-        countdown = 3
-        while countdown > 0:
-            await self.broadcast_func('countdown', countdown)
-            await asyncio.sleep(1)
-            countdown -= 1
+    def step_countdown(self):
+        tick_rate = self.scheduler.tick_rate
+        if self.countdown_ticks % tick_rate == 0:
+            self.emit('countdown', self.countdown_ticks // tick_rate)
+        self.countdown_ticks -= 1
+        if self.countdown_ticks <= 0:
+            self.phase = ArenaPhase.PLAYING
             
-    async def start(self):
-        await self.broadcast_func('start', 'Arena is starting!')
+    def request_keyframe(self):
+        if self.trajectory_encoder:
+            self.trajectory_encoder.request_keyframe()
+        else:
+            self.snapshot_encoder.request_keyframe()
+            
+    def start(self):
+        self.emit('start', 'Arena is starting!')
+        
+    def emit(self, message_type, message):
+        self._outbox.append((message_type, message))
+        
+    def has_outbox(self):
+        return bool(self._outbox)
+        
+    async def flush(self):
+        outbox, self._outbox = self._outbox, []
+        for message_type, message in outbox:
+            await self.broadcast_func(message_type, message)
+            self.spectator_feed.forward(message_type, message)
+        self.spectator_feed.publish()
+        
+        if self.is_finished and self.scheduler.is_registered(self):
+            self.scheduler.unregister(self)
+            await self.end_game()
         
     async def end_game(self):
-        self._loop_task = None
         winner = self.check_winner()
         if winner:
             arena_result = {
@@ -109,39 +320,73 @@ class Arena:
                 "right_player": self.right_player.user_id,
                 }
             await broadcast_event(self.group_name, 'arena.end', arena_result)
+            if self.recorder:
+                self.recorder.close(self, winner)
+            self.spectator_feed.forward('arena.end', arena_result)
+            self.spectator_feed.publish()
+        self.release()
+        
+    def abort(self):
+        """스텝 중 오류가 난 경기를 정리. 스케줄러와 매니저에서 빼고 리플레이 기록을 닫음"""
+        self.scheduler.unregister(self)
+        self.release()
+        
+    async def expire(self):
+        await broadcast_event(self.group_name, 'arena.expired', 'Arena expired while waiting for players.')
+        
+    def get_state(self, positions=None):
+        # 매 틱 dict를 새로 만들지 않고 같은 버퍼를 갱신
+        state = self._state
+        state["tick"] = self.current_tick
+        ball, left, right = state["ball"], state["left_player_bar"], state["right_player_bar"]
+        ball["x"], ball["y"], left["x"], left["y"], right["x"], right["y"] = positions or self.get_positions()
+        return state
+    
+    def get_positions(self):
+        left, right = self.left_player.bar, self.right_player.bar
+        return self.ball.x, self.ball.y, left.x, left.y, right.x, right.y
+    
+    def watch(self):
+        feed = self.spectator_feed
+        started = feed.watch()
+        if self.scheduler.engine:
+            self.scheduler.engine.update_spectating(self)
+        if started and self.left_player and self.right_player:
+            feed.update(self.get_state())
+            feed.publish()
+            
+    def unwatch(self):
+        self.spectator_feed.unwatch()
+        if self.scheduler.engine:
+            self.scheduler.engine.update_spectating(self)
         
-    def get_state(self):
+    def get_checkpoint(self):
         return {
-            "ball": 
-            {
-                "x": self.ball.x, 
-                "y": self.ball.y
-            },
-            "left_player_bar": 
-            {
-                "x": self.left_player.bar.x, 
-                "y": self.left_player.bar.y
-            },
-            "right_player_bar": 
-            {
-                "x": self.right_player.bar.x,
-                "y": self.right_player.bar.y
-            },
+            "tick": self.current_tick,
+            "round": self.current_round,
+            "ball": [self.ball.x, self.ball.y, self.ball.vx, self.ball.vy],
+            "left": [self.left_player.user_id, self.left_player.score, self.left_player.bar.y],
+            "right": [self.right_player.user_id, self.right_player.score, self.right_player.bar.y],
         }
+        
+    def restore(self, checkpoint):
+        # 선수들이 다시 접속해 둘 다 들어오면 resume()에서 나머지 상태를 적용
+        self.current_tick = checkpoint["tick"]
+        self.current_round = checkpoint["round"]
+        self._resume = checkpoint
     
     async def forfeit(self, exit_user_id):
-        if self._loop_task:
-            self._loop_task.cancel()
-            try:
-                await self._loop_task
-            except asyncio.CancelledError:
-                if exit_user_id == self.left_player.user_id:
-                    self.left_player.score = 0
-                    self.right_player.score = self.max_score
-                elif exit_user_id == self.right_player.user_id:
-                    self.right_player.score = 0
-                    self.left_player.score = self.max_score
-                await self.end_game()
+        if self.is_finished or not self.scheduler.is_registered(self):
+            return
+        self.scheduler.unregister(self)
+        self._outbox.clear()
+        if exit_user_id == self.left_player.user_id:
+            self.left_player.score = 0
+            self.right_player.score = self.max_score
+        elif exit_user_id == self.right_player.user_id:
+            self.right_player.score = 0
+            self.left_player.score = self.max_score
+        await self.end_game()
         
     def get_oppenent(self, user_id):
         if user_id == self.left_player.user_id:
@@ -161,13 +406,15 @@ class Arena:
         self.ball.reset()
         self.left_player.bar.reset()
         self.right_player.bar.reset()
+        if self.trajectory_encoder:
+            self.trajectory_encoder.reset()
         
     def check_winner(self):
         if self.left_player.score >= self.max_score:
-            self.is_finished = True
+            self.phase = ArenaPhase.FINISHED
             return self.left_player
         if self.right_player.score >= self.max_score:
-            self.is_finished = True
+            self.phase = ArenaPhase.FINISHED
             return self.right_player
         return None
 
@@ -1,16 +1,344 @@
+import asyncio
+import logging
+import time
+from functools import partial
+from channels.consumer import get_handler_name
+from channels.layers import get_channel_layer
 from .arena import Arena
+from .player import Player
+from .tick_scheduler import TickScheduler
+from arena.enums import Direction, InputCommand
+from arena.models import BaseMatch
 from arena.services import ArenaService
+from config.metrics import CallbackCounter, CallbackGauge, Gauge
+from config.redis_services import ArenaOwnershipRedisService, ArenaCheckpointRedisService, ArenaRedisService, ReceptionRedisService
+from reception.services import ReceptionService
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
 
 class ArenaManager:
     _arenas = {}
-    
+    _scheduler = None
+    _channel_name = None
+    _channel_lock = asyncio.Lock()
+    _leases = set()
+    _checkpoints = set()
+    _forfeit_timers = {}
+    _released = 0
+    _reaped = 0
+
+    @classmethod
+    def get_scheduler(cls):
+        if cls._scheduler is None:
+            engine = None
+            if settings.ARENA_PHYSICS_ENGINE == 'batch':
+                from .batch_engine import BatchPhysicsEngine
+                engine = BatchPhysicsEngine()
+            cls._scheduler = TickScheduler(engine=engine)
+        return cls._scheduler
+
     @classmethod
     def get_arena(cls, arena_id):
         if arena_id not in cls._arenas:
-            cls._arenas[arena_id] = Arena(arena_id=arena_id)
+            cls._arenas[arena_id] = Arena(
+                arena_id=arena_id,
+                scheduler=cls.get_scheduler(),
+                release_func=cls.release_arena
+            )
+        return cls._arenas[arena_id]
+
+    @classmethod
+    async def get_or_restore_arena(cls, arena_id):
+        if arena_id not in cls._arenas:
+            checkpoint = await ArenaCheckpointRedisService.get(arena_id)
+            # 조회하는 동안 다른 컨슈머가 먼저 만들었을 수 있음
+            if arena_id not in cls._arenas:
+                arena = cls.get_arena(arena_id)
+                if checkpoint:
+                    arena.restore(checkpoint)
         return cls._arenas[arena_id]
-    
+
+    @classmethod
+    def remove_arena(cls, arena_id, reaped=False):
+        arena = cls._arenas.pop(arena_id, None)
+        if arena:
+            arena.scheduler.unregister(arena)
+            # 정리된 대기방은 reaped로만 세서 released와 겹치지 않게 함
+            if reaped:
+                cls._reaped += 1
+            else:
+                cls._released += 1
+            for key in [key for key in cls._forfeit_timers if key[0] == arena_id]:
+                cls._forfeit_timers.pop(key).cancel()
+
+    @classmethod
+    def release_arena(cls, arena):
+        # 같은 id로 새로 만들어진 경기장은 건드리지 않음
+        if cls._arenas.get(arena.arena_id) is arena:
+            cls.remove_arena(arena.arena_id)
+
+    @classmethod
+    def reap_arenas(cls, now=None):
+        # 두 번째 선수가 끝내 오지 않은 대기방을 정리
+        now = now or time.monotonic()
+        expired = [
+            arena for arena in cls._arenas.values()
+            if not arena.is_started() and now - arena.created_at >= settings.ARENA_WAITING_TTL
+        ]
+        for arena in expired:
+            cls.remove_arena(arena.arena_id, reaped=True)
+        return expired
+
+    @classmethod
+    def get_stats(cls):
+        waiting = sum(1 for arena in cls._arenas.values() if not arena.is_started())
+        return {
+            "live": len(cls._arenas),
+            "waiting": waiting,
+            "released": cls._released,
+            "reaped": cls._reaped,
+        }
+
+    @classmethod
+    async def get_channel_name(cls):
+        # 다른 워커가 이 프로세스의 경기장으로 명령을 보낼 때 쓰는 채널
+        async with cls._channel_lock:
+            if cls._channel_name is None:
+                cls._channel_name = await get_channel_layer().new_channel()
+                asyncio.create_task(cls._receive_loop(cls._channel_name))
+                asyncio.create_task(cls._renew_loop())
+                asyncio.create_task(cls._reap_loop())
+                if settings.ARENA_CHECKPOINT_INTERVAL > 0:
+                    asyncio.create_task(cls._checkpoint_loop())
+        return cls._channel_name
+
+    @classmethod
+    def is_overloaded(cls):
+        return cls._scheduler is not None and cls._scheduler.overload.is_overloaded
+
+    @classmethod
+    async def claim(cls, arena_id):
+        """경기장 소유 채널을 반환. 과부하 중인 워커는 새 경기장을 맡지 않고 None을 반환"""
+        channel_name = await cls.get_channel_name()
+        if cls.is_overloaded() and arena_id not in cls._arenas:
+            return await ArenaOwnershipRedisService.get_owner(arena_id)
+        owner = await ArenaOwnershipRedisService.claim(arena_id, channel_name, settings.ARENA_LEASE_TTL)
+        if owner == channel_name:
+            cls._leases.add(arena_id)
+        return owner
+
+    @classmethod
+    def is_local(cls, owner):
+        return owner == cls._channel_name
+
+    @classmethod
+    async def _receive_loop(cls, channel_name):
+        channel_layer = get_channel_layer()
+        while True:
+            event = await channel_layer.receive(channel_name)
+            try:
+                await getattr(cls, get_handler_name(event))(event)
+            except Exception:
+                logger.exception("arena event %s failed", event.get('type'))
+
+    @classmethod
+    async def _renew_loop(cls):
+        while True:
+            await asyncio.sleep(settings.ARENA_LEASE_TTL / 3)
+            try:
+                await cls.renew_leases()
+            except Exception:
+                logger.exception("arena lease renewal failed")
+
+    @classmethod
+    async def renew_leases(cls):
+        for arena_id in list(cls._leases):
+            if arena_id not in cls._arenas:
+                cls._leases.discard(arena_id)
+                await ArenaOwnershipRedisService.release(arena_id, cls._channel_name)
+            elif not await ArenaOwnershipRedisService.renew(arena_id, cls._channel_name, settings.ARENA_LEASE_TTL):
+                cls._leases.discard(arena_id)
+                logger.warning("lease on arena %s was lost", arena_id)
+
+    @classmethod
+    async def _reap_loop(cls):
+        while True:
+            await asyncio.sleep(settings.ARENA_REAP_INTERVAL)
+            for arena in cls.reap_arenas():
+                try:
+                    await arena.expire()
+                except Exception:
+                    logger.exception("arena %s expire failed", arena.arena_id)
+
+    @classmethod
+    async def _checkpoint_loop(cls):
+        while True:
+            await asyncio.sleep(settings.ARENA_CHECKPOINT_INTERVAL)
+            try:
+                await cls.save_checkpoints()
+            except Exception:
+                logger.exception("arena checkpoint failed")
+
+    @classmethod
+    async def save_checkpoints(cls):
+        # 소유한 경기장들의 체크포인트를 한 번의 파이프라인으로 기록
+        checkpoints = {}
+        finished = []
+        for arena_id in list(cls._checkpoints):
+            arena = cls._arenas.get(arena_id)
+            if arena is None or arena.is_finished:
+                cls._checkpoints.discard(arena_id)
+                finished.append(arena_id)
+        for arena_id in list(cls._leases):
+            arena = cls._arenas.get(arena_id)
+            if arena and arena.is_started() and not arena.is_finished:
+                checkpoints[arena_id] = arena.get_checkpoint()
+
+        if checkpoints:
+            await ArenaCheckpointRedisService.save_many(checkpoints, settings.ARENA_CHECKPOINT_TTL)
+            cls._checkpoints.update(checkpoints)
+        if finished:
+            await ArenaCheckpointRedisService.delete_many(finished)
+
+    @classmethod
+    def get_player(cls, event):
+        arena = cls._arenas.get(event['arena_id'])
+        if arena is None:
+            return None, None
+        return arena, arena.get_player(event['user_id'])
+
+    @classmethod
+    async def arena_join(cls, event):
+        arena = await cls.get_or_restore_arena(event['arena_id'])
+        group_name = event['group_name']
+        arena.set_messenger(group_name, partial(ArenaService.broadcast, group_name))
+
+        player = cls.rejoin(arena, event['user_id'])
+        if player:
+            team = player.team
+        else:
+            team = BaseMatch.Team(event['team']) if event['team'] else arena.get_remaining_team(event['user_id'])
+            team = await arena.add_player(Player(event['user_id'], arena, team))
+        if team:
+            arena.request_keyframe()
+        await get_channel_layer().send(event['reply_channel'], {
+            'type': 'arena.joined',
+            'team': team.value if team else None
+        })
+
+    @classmethod
+    async def watch(cls, arena_id):
+        # 관전자가 생긴 경기장만 관전자 전송을 켬
+        owner = await ArenaOwnershipRedisService.get_owner(arena_id)
+        if owner is None:
+            return False
+        if cls.is_local(owner):
+            await cls.arena_watch({'arena_id': arena_id})
+        else:
+            await get_channel_layer().send(owner, {'type': 'arena.watch', 'arena_id': arena_id})
+        return True
+
+    @classmethod
+    async def arena_watch(cls, event):
+        arena = cls._arenas.get(event['arena_id'])
+        if arena:
+            arena.watch()
+
+    @classmethod
+    async def unwatch(cls, arena_id):
+        owner = await ArenaOwnershipRedisService.get_owner(arena_id)
+        if owner is None:
+            return
+        if cls.is_local(owner):
+            await cls.arena_unwatch({'arena_id': arena_id})
+        else:
+            await get_channel_layer().send(owner, {'type': 'arena.unwatch', 'arena_id': arena_id})
+
     @classmethod
-    def remove_arena(cls, arena_id):
-        if arena_id in cls._arenas:
-            del cls._arenas[arena_id]
\ No newline at end of file
+    async def arena_unwatch(cls, event):
+        arena = cls._arenas.get(event['arena_id'])
+        if arena:
+            arena.unwatch()
+
+    @classmethod
+    async def arena_input(cls, event):
+        arena, player = cls.get_player(event)
+        if player:
+            direction = Direction(event['direction']) if event['direction'] else None
+            arena.handle_input(player, InputCommand(event['command']), direction)
+
+    @classmethod
+    async def arena_forfeit(cls, event):
+        arena, player = cls.get_player(event)
+        if player:
+            await arena.forfeit(player.user_id)
+
+    @classmethod
+    async def arena_leave(cls, event):
+        arena, player = cls.get_player(event)
+        if not player:
+            return
+        if not arena.is_started() or arena.is_finished:
+            await arena.remove_player(player)
+            return
+        # 경기 중 끊긴 선수는 유예 시간 동안 자리를 지키고, 그 안에 돌아오지 않으면 기권 처리
+        player.release()
+        key = (arena.arena_id, player.user_id)
+        if key not in cls._forfeit_timers:
+            cls._forfeit_timers[key] = asyncio.create_task(cls.forfeit_after_grace(arena, event))
+
+    @classmethod
+    def rejoin(cls, arena, user_id):
+        """유예 시간 안에 다시 접속한 선수의 기권 타이머를 취소하고 기존 자리를 반환"""
+        timer = cls._forfeit_timers.pop((arena.arena_id, user_id), None)
+        if timer is None:
+            return None
+        timer.cancel()
+        return arena.get_player(user_id)
+
+    @classmethod
+    async def forfeit_after_grace(cls, arena, event):
+        await asyncio.sleep(settings.ARENA_FORFEIT_GRACE)
+        user_id = event['user_id']
+        cls._forfeit_timers.pop((arena.arena_id, user_id), None)
+        try:
+            await ArenaService.broadcast(arena.group_name, 'exit', f"{event.get('user_name')} is exit arena.")
+            await arena.forfeit(user_id)
+            await ArenaRedisService.remove_allowed_user(arena.arena_id, user_id)
+            reception_id = event.get('reception_id')
+            if reception_id is not None:
+                await ReceptionRedisService.remove_allowed_user(reception_id, user_id)
+                if await ReceptionRedisService.remove_user(reception_id, user_id) < 1:
+                    await ReceptionService.remove(reception_id)
+        except Exception:
+            logger.exception("arena %s forfeit of %s failed", arena.arena_id, user_id)
+
+
+def get_scheduler_telemetry(name):
+    scheduler = ArenaManager._scheduler
+    return getattr(scheduler.telemetry, name) if scheduler else 0
+
+
+def get_arena_counts():
+    stats = ArenaManager.get_stats()
+    return {("waiting",): stats["waiting"], ("playing",): stats["live"] - stats["waiting"]}
+
+
+ARENAS = CallbackGauge("arena_arenas", "Arenas held by this worker.", ("state",), func=get_arena_counts)
+ARENA_LEASES = Gauge("arena_leases", "Arena ownership leases held by this worker.")
+ARENA_LEASES.set_function(lambda: len(ArenaManager._leases))
+ARENAS_RELEASED = CallbackCounter("arena_released", "Arenas released by this worker.", func=lambda: ArenaManager._released)
+ARENAS_REAPED = CallbackCounter("arena_reaped", "Waiting arenas reaped by this worker.", func=lambda: ArenaManager._reaped)
+OVERLOAD_LEVEL = Gauge("arena_overload_level", "Current degradation level of the tick scheduler.")
+OVERLOAD_LEVEL.set_function(lambda: ArenaManager._scheduler.overload.level if ArenaManager._scheduler else 0)
+TICKS = CallbackCounter("arena_ticks", "Scheduler ticks run.", func=lambda: get_scheduler_telemetry("ticks"))
+TICK_OVERRUNS = CallbackCounter(
+    "arena_tick_overruns", "Ticks that started more than one period late.",
+    func=lambda: get_scheduler_telemetry("overruns")
+)
+DROPPED_TICKS = CallbackCounter(
+    "arena_dropped_ticks", "Ticks skipped after exceeding the catch-up limit.",
+    func=lambda: get_scheduler_telemetry("dropped_ticks")
+)
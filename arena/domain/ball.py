@@ -7,37 +7,42 @@ if TYPE_CHECKING:
 from arena.models import BaseMatch
 
 class Ball:
+    __slots__ = ("arena", "speed", "radius", "playing", "x", "y", "vx", "vy")
+    
     def __init__(self, arena: "Arena"):
         self.arena = arena
-        self.speed = 3
+        self.speed = 15  # 초당 이동 거리
         self.radius = 1
+        self.playing = False
         self.reset()
         
     def update_position(self):
-        self.x += self.velocity["x"]
-        self.y += self.velocity["y"]
+        self.x += self.vx
+        self.y += self.vy
 
     def reset(self):
         self.x = self.arena.width // 2  # 경기장 중앙
         self.y = self.arena.height // 2  # 경기장 중앙
         direction = 1 if self.arena.current_round % 2 == 1 else -1
-        self.velocity = {"x": self.speed * direction, "y": self.speed * direction}
+        step = self.speed / self.arena.scheduler.tick_rate
+        self.vx = step * direction
+        self.vy = step * direction
     
     def handle_collision(self, lbar: "Bar", rbar: "Bar"):
         if self.y - self.radius <= 0 or self.y + self.radius >= self.arena.height:
-            self.velocity["y"] *= -1  # 위/아래 벽 충돌
+            self.vy = -self.vy  # 위/아래 벽 충돌
 
-        if self.check_bar_collision(lbar) or self.check_bar_collision(rbar):
-            self.velocity["x"] *= -1
+        # 바 쪽으로 움직일 때만 튕겨서 바와 겹친 채로 매 틱 방향이 바뀌지 않게 함
+        if (self.vx < 0 and self.check_bar_collision(lbar)) or (self.vx > 0 and self.check_bar_collision(rbar)):
+            self.vx = -self.vx
             
     def check_bar_collision(self, bar: "Bar") -> bool:
-        bounds = bar.get_collision_bounds()
-        
+        x, y, radius = self.x, self.y, self.radius
         return (
-            bounds["y1"] <= self.y <= bounds["y2"] and
+            bar.y - bar.y_radius <= y <= bar.y + bar.y_radius and
             (
-                bounds["x1"] <= self.x + self.radius or
-                self.x - self.radius <= bounds["x2"]
+                bar.x - bar.x_radius <= x + radius and
+                x - radius <= bar.x + bar.x_radius
             )
         )
 
@@ -1,8 +1,13 @@
-from .arena import Arena
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from .arena import Arena
 from arena.models import BaseMatch
 from arena.enums import Direction
 
 class Bar:
+    __slots__ = ("arena", "team", "width", "height", "x_radius", "y_radius", "speed", "step", "margin", "x", "y",
+                 "direction", "pending_direction")
+    
     def __init__(self, arena:"Arena", team:BaseMatch.Team):
         self.arena = arena
         self.team = team
@@ -10,27 +15,40 @@ class Bar:
         self.height = 10
         self.x_radius = self.width / 2
         self.y_radius = self.height / 2
-        self.speed = 1
+        self.speed = 30  # 초당 이동 거리
+        self.step = self.speed / arena.scheduler.tick_rate
         self.margin = 3
+        self.direction = None
+        self.pending_direction = None
         self.reset()
         
     def move(self, direction: Direction):
         if direction == Direction.UP:
-            self.y = max(self.y - self.speed, 0 + self.y_radius)
+            self.y = max(self.y - self.step, 0 + self.y_radius)
         elif direction == Direction.DOWN:
-            self.y = min(self.y + self.speed, self.arena.height - self.y_radius)
+            self.y = min(self.y + self.step, self.arena.height - self.y_radius)
+
+    def press(self, direction: Direction):
+        self.direction = direction
+        self.pending_direction = direction
+        
+    def release(self, direction: Direction = None):
+        if direction is None or direction == self.direction:
+            self.direction = None
+            
+    def tap(self, direction: Direction):
+        self.pending_direction = direction
+        
+    def apply_input(self):
+        # 틱 사이에 눌렀다 뗀 입력도 한 번은 반영
+        direction = self.direction or self.pending_direction
+        self.pending_direction = None
+        if direction:
+            self.move(direction)
 
     def reset(self):
         self.y = self.arena.height // 2
         if self.team == BaseMatch.Team.LEFT:
             self.x = 0 + self.x_radius + self.margin
         else:
-            self.x = self.arena.width - self.x_radius - self.margin    
-    
-    def get_collision_bounds(self):
-        return {
-            "x1": self.x - self.x_radius,
-            "x2": self.x + self.x_radius,
-            "y1": self.y - self.y_radius,
-            "y2": self.y + self.y_radius,
-        }
\ No newline at end of file
+            self.x = self.arena.width - self.x_radius - self.margin
\ No newline at end of file
@@ -0,0 +1,353 @@
+from typing import TYPE_CHECKING
+import numpy as np
+from arena.enums import ArenaPhase, Direction
+from .ball import Ball
+from .bar import Bar
+
+if TYPE_CHECKING:
+    from .arena import Arena
+
+# 엔진이 직접 진행하는 단계. 나머지(WAITING, FINISHED)는 틱만 셈
+IDLE = 0
+COUNTDOWN = 1
+PLAYING = 2
+PHASE_CODES = {ArenaPhase.COUNTDOWN: COUNTDOWN, ArenaPhase.PLAYING: PLAYING}
+
+DIRECTION_CODES = {None: 0, Direction.UP: -1, Direction.DOWN: 1}
+DIRECTIONS = {code: direction for direction, code in DIRECTION_CODES.items()}
+
+# step()이 경기마다 남기는 이벤트. 하나라도 있는 경기만 파이썬 코드를 거침
+COUNTDOWN_SECOND = 1
+PLAY_STARTED = 2
+ROUND_OVER = 4
+SNAPSHOT_DUE = 8
+SPECTATOR_DUE = 16
+KEYFRAME_DUE = 32
+ATTACHED = 64
+FRAME_EVENTS = ROUND_OVER | SNAPSHOT_DUE | SPECTATOR_DUE
+# 경기 객체의 countdown_ticks를 읽거나 바꾸는 이벤트. 그 밖의 틱에는 배열 값만 진행
+COUNTDOWN_EVENTS = COUNTDOWN_SECOND | ROUND_OVER | KEYFRAME_DUE
+
+
+def engine_field(base, name, column, encode=None, decode=None):
+    """엔진에 붙어 있으면 배열 칸을, 떨어져 있으면 원래 슬롯을 읽고 씀"""
+    member = base.__dict__[name]
+
+    def fget(view):
+        if view._engine is None:
+            return member.__get__(view)
+        value = getattr(view._engine, column)[view.index].item()
+        return decode[value] if decode else value
+
+    def fset(view, value):
+        if view._engine is None:
+            member.__set__(view, value)
+        else:
+            getattr(view._engine, column)[view.index] = encode[value] if encode else value
+
+    return property(fget, fset)
+
+
+class EngineView:
+    """엔진 배열 한 칸을 가리키는 공/바. 매 틱 계산은 배열에서 하고 이 뷰는 리셋, 상태 전송 같은 드문 경로에서만 쓰임"""
+    __slots__ = ()
+    fields = ()
+
+    def bind(self, engine: "BatchPhysicsEngine", slot):
+        values = [(name, getattr(self, name)) for name in self.fields]
+        self._engine = engine
+        self._slot = slot
+        for name, value in values:
+            setattr(self, name, value)
+
+    def unbind(self):
+        values = [(name, getattr(self, name)) for name in self.fields]
+        self._engine = None
+        self._slot = None
+        for name, value in values:
+            setattr(self, name, value)
+
+    @property
+    def is_bound(self):
+        return self._engine is not None
+
+
+class BatchBall(EngineView, Ball):
+    __slots__ = ("_engine", "_slot")
+    fields = ("x", "y", "vx", "vy")
+    x = engine_field(Ball, "x", "ball_x")
+    y = engine_field(Ball, "y", "ball_y")
+    vx = engine_field(Ball, "vx", "ball_vx")
+    vy = engine_field(Ball, "vy", "ball_vy")
+
+    def __init__(self, arena: "Arena"):
+        self._engine = None
+        self._slot = None
+        super().__init__(arena)
+
+    @property
+    def index(self):
+        return self._slot
+
+    @property
+    def playing(self):
+        if self._engine is None:
+            return Ball.playing.__get__(self)
+        return self._engine.phase.item(self._slot) == PLAYING
+
+    @playing.setter
+    def playing(self, playing):
+        Ball.playing.__set__(self, playing)
+        if self._engine is not None:
+            self._engine.phase[self._slot] = PHASE_CODES.get(self.arena.phase, IDLE)
+
+
+class BatchBar(EngineView, Bar):
+    __slots__ = ("_engine", "_slot", "_row")
+    fields = ("x", "y", "direction", "pending_direction")
+    x = engine_field(Bar, "x", "bar_x")
+    y = engine_field(Bar, "y", "bar_y")
+    direction = engine_field(Bar, "direction", "direction", DIRECTION_CODES, DIRECTIONS)
+    pending_direction = engine_field(Bar, "pending_direction", "pending_direction", DIRECTION_CODES, DIRECTIONS)
+
+    def __init__(self, arena: "Arena", team):
+        self._engine = None
+        self._slot = None
+        self._row = 0
+        super().__init__(arena, team)
+
+    @property
+    def index(self):
+        return self._row, self._slot
+
+    def bind(self, engine: "BatchPhysicsEngine", slot, row=0):
+        self._row = row
+        super().bind(engine, slot)
+
+
+class BatchPhysicsEngine:
+    """모든 경기의 물리, 입력, 카운트다운, 득점 판정을 배열 연산 한 번으로 진행.
+    메시지를 만들어야 하는 경기만 step()이 돌려주고 나머지 경기는 그 틱에 파이썬 코드를 거치지 않음"""
+    ball_class = BatchBall
+    bar_class = BatchBar
+    # 이름: (dtype, 행 수, 빈 칸 값). 바는 0행이 왼쪽, 1행이 오른쪽
+    columns = {
+        "ball_x": (np.float64, 1, 0), "ball_y": (np.float64, 1, 0),
+        "ball_vx": (np.float64, 1, 0), "ball_vy": (np.float64, 1, 0),
+        "ball_radius": (np.float64, 1, 0), "width": (np.float64, 1, 0), "height": (np.float64, 1, 0),
+        "bar_x": (np.float64, 2, 0), "bar_y": (np.float64, 2, 0), "bar_step": (np.float64, 2, 0),
+        "bar_x_radius": (np.float64, 2, 0), "bar_y_radius": (np.float64, 2, 0),
+        "direction": (np.int8, 2, 0), "pending_direction": (np.int8, 2, 0),
+        "phase": (np.int8, 1, IDLE), "events": (np.int8, 1, 0), "notice": (np.int8, 1, 0),
+        "countdown": (np.int32, 1, 0), "tick_rate": (np.int32, 1, 1), "tick_offset": (np.int64, 1, 0),
+        # 주기는 0으로 나누지 않도록 빈 칸도 1로 두고, 꺼짐은 bool 열로 따로 표시
+        "snapshot_interval": (np.int32, 1, 1), "trajectory": (np.bool_, 1, False),
+        "spectator_interval": (np.int32, 1, 1), "spectating": (np.bool_, 1, False),
+        "keyframe_interval": (np.int32, 1, 1), "recording": (np.bool_, 1, False),
+        "recorded_from": (np.int64, 1, 0), "overruns": (np.int32, 1, 0), "max_lag": (np.float64, 1, 0),
+    }
+
+    def __init__(self, capacity=256):
+        self.capacity = 0
+        self.size = 0
+        # 붙어 있는 모든 경기가 함께 진행하는 틱 수. 경기의 current_tick은 여기서 경기별 오프셋을 뺀 값
+        self.ticks = 0
+        self.records = 0
+        self.last_lag = 0.0
+        self._free_slots = []
+        self._arenas: list["Arena"] = []
+        # step()이 돌려준 경기의 (이벤트, 위치). 위치는 공 x, y와 왼쪽/오른쪽 바 x, y를 한 번에 꺼낸 값
+        self._frames = []
+        self._grow(capacity)
+
+    def _grow(self, capacity):
+        for name, (dtype, rows, empty) in self.columns.items():
+            shape = capacity if rows == 1 else (rows, capacity)
+            column = np.full(shape, empty, dtype=dtype)
+            if self.capacity:
+                column[..., :self.capacity] = getattr(self, name)
+            setattr(self, name, column)
+        self._arenas.extend([None] * (capacity - self.capacity))
+        self._frames.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def attach(self, arena: "Arena"):
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow(self.capacity * 2)
+            slot = self.size
+            self.size += 1
+
+        self._arenas[slot] = arena
+        self.width[slot] = arena.width
+        self.height[slot] = arena.height
+        self.ball_radius[slot] = arena.ball.radius
+        self.tick_rate[slot] = arena.scheduler.tick_rate
+        self.countdown[slot] = arena.countdown_ticks
+        self.snapshot_interval[slot] = arena.snapshot_interval
+        self.trajectory[slot] = arena.trajectory_encoder is not None
+        self.spectator_interval[slot] = arena.spectator_feed.interval
+        self.spectating[slot] = arena.spectator_feed.active
+        self.recording[slot] = arena.recorder is not None
+        self.keyframe_interval[slot] = arena.recorder.keyframe_interval if arena.recorder else 1
+        self.recorded_from[slot] = self.records
+        self.overruns[slot] = 0
+        self.max_lag[slot] = 0.0
+        # 붙기 전에 쌓인 start 같은 메시지도 다음 틱에 내보내도록 표시
+        self.notice[slot] = ATTACHED
+        self.tick_offset[slot] = arena.attach_clock(self)
+
+        arena.ball.bind(self, slot)
+        for row, player in enumerate((arena.left_player, arena.right_player)):
+            bar = player.bar
+            self.bar_x_radius[row, slot] = bar.x_radius
+            self.bar_y_radius[row, slot] = bar.y_radius
+            self.bar_step[row, slot] = bar.step
+            bar.bind(self, slot, row)
+        self.phase[slot] = PHASE_CODES.get(arena.phase, IDLE)
+        return slot
+
+    def detach(self, arena: "Arena"):
+        slot = arena.ball._slot
+        if slot is None or self._arenas[slot] is not arena:
+            return
+        arena.countdown_ticks = int(self.countdown[slot])
+        self.merge_telemetry(arena, slot)
+        arena.detach_clock()
+        arena.ball.unbind()
+        for player in (arena.left_player, arena.right_player):
+            if player and player.bar.is_bound:
+                player.bar.unbind()
+
+        self.phase[slot] = IDLE
+        self.recording[slot] = False
+        self.spectating[slot] = False
+        self.notice[slot] = 0
+        self._arenas[slot] = None
+        self._frames[slot] = None
+        self._free_slots.append(slot)
+
+    def set_tick(self, arena: "Arena", tick):
+        offset = self.ticks - tick
+        self.tick_offset[arena.ball._slot] = offset
+        return offset
+
+    def update_spectating(self, arena: "Arena"):
+        slot = arena.ball._slot
+        if slot is not None and self._arenas[slot] is arena:
+            self.spectating[slot] = arena.spectator_feed.active
+
+    def record(self, lag, period):
+        # 붙어 있는 경기는 모두 같은 지연을 겪으므로 경기별 텔레메트리도 배열로 한 번에 누적
+        n = self.size
+        self.records += 1
+        self.last_lag = lag
+        if lag > period:
+            self.overruns[:n] += 1
+        np.maximum(self.max_lag[:n], lag, out=self.max_lag[:n])
+
+    def merge_telemetry(self, arena: "Arena", slot):
+        ticks = self.records - int(self.recorded_from[slot])
+        if not ticks:
+            return
+        telemetry = arena.telemetry
+        telemetry.ticks += ticks
+        telemetry.overruns += int(self.overruns[slot])
+        telemetry.last_lag = self.last_lag
+        telemetry.max_lag = max(telemetry.max_lag, float(self.max_lag[slot]))
+
+    def step(self, scale=1):
+        """모든 경기를 한 틱 진행하고 이번 틱에 메시지를 만들어야 하는 경기 목록을 돌려줌"""
+        n = self.size
+        self.ticks += 1
+        tick = self.ticks - self.tick_offset[:n]
+        phase = self.phase[:n]
+        playing = phase == PLAYING
+        counting = phase == COUNTDOWN
+        events = self.events[:n]
+        events[:] = self.notice[:n]
+        self.notice[:n] = 0
+
+        # Arena.step_countdown과 같은 순서: 초가 바뀌는 틱에 알리고, 줄인 뒤 0이면 시작
+        countdown = self.countdown[:n]
+        np.bitwise_or(events, COUNTDOWN_SECOND, out=events, where=counting & (countdown % self.tick_rate[:n] == 0))
+        np.subtract(countdown, 1, out=countdown, where=counting)
+        started = counting & (countdown <= 0)
+        phase[started] = PLAYING
+        np.bitwise_or(events, PLAY_STARTED, out=events, where=started)
+
+        scored = self.step_ball(n, playing)
+        np.bitwise_or(events, ROUND_OVER, out=events, where=scored)
+        self.apply_input(n, playing & ~scored)
+
+        # 라운드가 끝난 틱은 파이썬 쪽에서 바로 상태를 보내므로 주기만 표시
+        snapshot = playing & (self.trajectory[:n] | (tick % (self.snapshot_interval[:n] * scale) == 0))
+        np.bitwise_or(events, SNAPSHOT_DUE, out=events, where=snapshot)
+        spectator = playing & self.spectating[:n] & (tick % (self.spectator_interval[:n] * scale) == 0)
+        np.bitwise_or(events, SPECTATOR_DUE, out=events, where=spectator)
+        keyframe = self.recording[:n] & (tick % self.keyframe_interval[:n] == 0)
+        np.bitwise_or(events, KEYFRAME_DUE, out=events, where=keyframe)
+
+        # 메시지를 만들 경기의 위치는 뷰를 하나씩 읽지 않고 열마다 한 번에 꺼내 둠
+        slots = np.flatnonzero(events)
+        columns = (self.ball_x, self.ball_y, self.bar_x[0], self.bar_y[0], self.bar_x[1], self.bar_y[1])
+        positions = zip(*(column[slots].tolist() for column in columns))
+        arenas, frames = self._arenas, self._frames
+        stepped = []
+        for slot, event, position in zip(slots.tolist(), events[slots].tolist(), positions):
+            frames[slot] = (event, position)
+            stepped.append(arenas[slot])
+        return stepped
+
+    def step_ball(self, n, playing):
+        # Ball.update_position, handle_collision, check_boundary_collision을 배열로 옮긴 것
+        x, y = self.ball_x[:n], self.ball_y[:n]
+        vx, vy = self.ball_vx[:n], self.ball_vy[:n]
+        radius, width = self.ball_radius[:n], self.width[:n]
+        np.add(x, vx, out=x, where=playing)
+        np.add(y, vy, out=y, where=playing)
+
+        wall = playing & ((y - radius <= 0) | (y + radius >= self.height[:n]))
+        np.negative(vy, out=vy, where=wall)
+
+        bar_x, bar_y = self.bar_x[:, :n], self.bar_y[:, :n]
+        x_radius, y_radius = self.bar_x_radius[:, :n], self.bar_y_radius[:, :n]
+        touching = (
+            (bar_y - y_radius <= y) & (y <= bar_y + y_radius) &
+            (bar_x - x_radius <= x + radius) & (x - radius <= bar_x + x_radius)
+        )
+        hit = playing & (((vx < 0) & touching[0]) | ((vx > 0) & touching[1]))
+        np.negative(vx, out=vx, where=hit)
+
+        return playing & ((x - radius <= 0) | (x + radius >= width))
+
+    def apply_input(self, n, moving):
+        # Bar.apply_input: 누르고 있는 방향, 없으면 틱 사이에 눌렀다 뗀 방향으로 한 칸
+        held, pending = self.direction[:, :n], self.pending_direction[:, :n]
+        move = np.where(moving, np.where(held != 0, held, pending), 0)
+        np.copyto(pending, 0, where=moving)
+
+        y, step = self.bar_y[:, :n], self.bar_step[:, :n]
+        y_radius = self.bar_y_radius[:, :n]
+        np.copyto(y, np.maximum(y - step, y_radius), where=move < 0)
+        np.copyto(y, np.minimum(y + step, self.height[:n] - y_radius), where=move > 0)
+
+    def step_arena(self, arena: "Arena"):
+        """step()이 돌려준 경기의 메시지 처리. 카운트다운 값은 이 때만 경기 객체와 맞춤"""
+        slot = arena.ball._slot
+        events, positions = self._frames[slot]
+        if events & COUNTDOWN_EVENTS:
+            arena.countdown_ticks = int(self.countdown[slot])
+        if events & COUNTDOWN_SECOND:
+            arena.emit('countdown', (arena.countdown_ticks + 1) // arena.scheduler.tick_rate)
+        if events & PLAY_STARTED:
+            arena.phase = ArenaPhase.PLAYING
+        if events & FRAME_EVENTS:
+            round_result = arena.check_round_end() if events & ROUND_OVER else None
+            arena.emit_frame(round_result, events & SNAPSHOT_DUE, events & SPECTATOR_DUE, positions)
+        if events & KEYFRAME_DUE and arena.recorder.is_keyframe_due(arena.current_tick):
+            arena.recorder.record_keyframe(arena)
+        if events & ROUND_OVER:
+            self.countdown[slot] = arena.countdown_ticks
@@ -0,0 +1,56 @@
+from django.conf import settings
+
+
+class OverloadController:
+    """스케줄러 지연(lag)을 지수 평균으로 보고 단계적으로 전송량을 줄임. 지연이 충분히 오래 낮으면 한 단계씩 복구"""
+    __slots__ = (
+        "threshold", "max_level", "escalate_ticks", "recover_ticks", "smoothing",
+        "level", "lag", "_hot_ticks", "_calm_ticks",
+    )
+
+    def __init__(self, tick_rate, threshold=None, max_level=None, recover_seconds=None, smoothing=0.1):
+        self.threshold = threshold if threshold is not None else settings.ARENA_OVERLOAD_LAG
+        self.max_level = max_level if max_level is not None else settings.ARENA_OVERLOAD_MAX_LEVEL
+        recover_seconds = recover_seconds if recover_seconds is not None else settings.ARENA_OVERLOAD_RECOVER_SECONDS
+        # 단계를 올릴 때는 1초, 내릴 때는 recover_seconds 동안 상태가 유지되어야 함
+        self.escalate_ticks = tick_rate
+        self.recover_ticks = max(1, round(recover_seconds * tick_rate))
+        self.smoothing = smoothing
+        self.reset()
+
+    def reset(self):
+        self.level = 0
+        self.lag = 0.0
+        self._hot_ticks = 0
+        self._calm_ticks = 0
+
+    @property
+    def is_overloaded(self):
+        return self.level > 0
+
+    @property
+    def snapshot_scale(self):
+        # 단계마다 스냅샷/관전 전송 주기를 두 배로
+        return 1 << self.level
+
+    def record(self, lag):
+        """틱마다 호출. 단계가 바뀌었으면 True"""
+        self.lag += (lag - self.lag) * self.smoothing
+        if self.lag > self.threshold:
+            self._calm_ticks = 0
+            self._hot_ticks += 1
+            if self.level < self.max_level and (self.level == 0 or self._hot_ticks >= self.escalate_ticks):
+                self.level += 1
+                self._hot_ticks = 0
+                return True
+        elif self.lag < self.threshold / 2:
+            self._hot_ticks = 0
+            self._calm_ticks += 1
+            if self.level > 0 and self._calm_ticks >= self.recover_ticks:
+                self.level -= 1
+                self._calm_ticks = 0
+                return True
+        return False
+
+    def to_dict(self):
+        return {"level": self.level, "lag": self.lag}
@@ -6,10 +6,12 @@ from .bar import Bar
 from arena.enums import Direction
 
 class Player:
+    __slots__ = ("team", "score", "bar", "user_id")
+    
     def __init__(self, user_id, arena: "Arena", team:BaseMatch.Team):
         self.team:BaseMatch.Team = team
         self.score = 0
-        self.bar:Bar = Bar(arena, team)
+        self.bar:Bar = arena.bar_class(arena, team)
         self.user_id = user_id
         
     def increment_score(self):
@@ -20,4 +22,33 @@ class Player:
         self.bar.team = team
         
     def move(self, direction:Direction):
-        self.bar.move(direction)
\ No newline at end of file
+        self.bar.move(direction)
+        
+    # 입력 상태는 바가 들고 있어서 배치 엔진이 배열에서 바로 반영할 수 있음
+    @property
+    def direction(self):
+        return self.bar.direction
+    
+    @direction.setter
+    def direction(self, direction:Direction):
+        self.bar.direction = direction
+        
+    @property
+    def pending_direction(self):
+        return self.bar.pending_direction
+    
+    @pending_direction.setter
+    def pending_direction(self, direction:Direction):
+        self.bar.pending_direction = direction
+        
+    def press(self, direction:Direction):
+        self.bar.press(direction)
+        
+    def release(self, direction:Direction=None):
+        self.bar.release(direction)
+            
+    def tap(self, direction:Direction):
+        self.bar.tap(direction)
+        
+    def apply_input(self):
+        self.bar.apply_input()
@@ -0,0 +1,55 @@
+from channels.layers import get_channel_layer
+from arena.enums import ArenaPhase, InputCommand
+
+
+class RemoteArena:
+    """다른 워커가 소유한 경기장. 명령은 소유 워커의 채널로 전달하고 진행 상태는 브로드캐스트로 추적"""
+    
+    def __init__(self, arena_id, owner_channel):
+        self.arena_id = arena_id
+        self.owner_channel = owner_channel
+        self.phase = ArenaPhase.WAITING
+        
+    @property
+    def is_finished(self):
+        return self.phase == ArenaPhase.FINISHED
+    
+    def is_started(self):
+        return self.phase != ArenaPhase.WAITING
+    
+    def observe(self, event):
+        message_type = event.get('message_type', event['type'])
+        if message_type == 'start':
+            self.phase = ArenaPhase.COUNTDOWN
+        elif message_type == 'arena.end':
+            self.phase = ArenaPhase.FINISHED
+            
+    async def send(self, event_type, **fields):
+        await get_channel_layer().send(self.owner_channel, {
+            'type': event_type,
+            'arena_id': self.arena_id,
+            **fields
+        })
+        
+    async def join(self, group_name, user_id, team, reply_channel):
+        await self.send(
+            'arena.join',
+            group_name=group_name,
+            user_id=user_id,
+            team=team.value if team else None,
+            reply_channel=reply_channel
+        )
+        
+    async def handle_input(self, user_id, command: InputCommand, direction=None):
+        await self.send(
+            'arena.input',
+            user_id=user_id,
+            command=command.value,
+            direction=direction.value if direction else None
+        )
+        
+    async def forfeit(self, user_id):
+        await self.send('arena.forfeit', user_id=user_id)
+        
+    async def leave(self, user_id, user_name=None, reception_id=None):
+        await self.send('arena.leave', user_id=user_id, user_name=user_name, reception_id=reception_id)
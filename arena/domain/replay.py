@@ -0,0 +1,187 @@
+import asyncio
+import bisect
+import logging
+import struct
+from typing import TYPE_CHECKING
+from asgiref.sync import sync_to_async
+from arena.enums import ArenaPhase, InputCommand
+from arena.models import BaseMatch
+from arena.protocol import INPUT_DIRECTIONS
+from arena.services import ArenaService
+from config.redis_services import ArenaReplayRedisService
+
+if TYPE_CHECKING:
+    from .arena import Arena
+    from .player import Player
+
+logger = logging.getLogger(__name__)
+
+REPLAY_MAGIC = b"PRPL"
+REPLAY_VERSION = 1
+
+# magic, version, tick_rate, width, height, left user, right user
+HEADER = struct.Struct("<4sBHHHqq")
+# record type, tick
+RECORD = struct.Struct("<BI")
+# team, command, direction
+INPUT_RECORD = struct.Struct("<BBB")
+# phase, round, 점수 2개, countdown, 입력 상태 4개, 공 x/y/vx/vy, 바 y 2개
+KEYFRAME_RECORD = struct.Struct("<BHBBHBBBB6d")
+# winner team, 점수 2개
+END_RECORD = struct.Struct("<BBB")
+
+INPUT = 0x01
+KEYFRAME = 0x02
+END = 0x03
+
+TEAMS = (BaseMatch.Team.LEFT, BaseMatch.Team.RIGHT)
+PHASES = tuple(ArenaPhase)
+COMMANDS = tuple(InputCommand)
+DIRECTION_CODES = {direction: code for code, direction in INPUT_DIRECTIONS.items()}
+
+
+def encode_direction(direction):
+    return DIRECTION_CODES.get(direction, 0)
+
+
+def decode_direction(code):
+    return INPUT_DIRECTIONS.get(code)
+
+
+class ReplayRecorder:
+    """경기를 재시뮬레이션할 수 있도록 초기 상태, 틱별 입력, 주기적 키프레임을 append-only로 기록.
+    틱에서는 메모리 버퍼에만 쓰고 키프레임마다 모인 바이트를 별도 태스크가 Redis에 붙여 씀.
+    경기가 끝나면 Redis 기록 전체를 MatchReplay 행으로 옮겨 TTL과 관계없이 어느 워커에서든 재생 가능"""
+    __slots__ = ("arena_id", "keyframe_interval", "ttl", "_header", "_buffer", "_writer", "_recording")
+
+    def __init__(self, arena_id, keyframe_interval, ttl):
+        self.arena_id = arena_id
+        self.keyframe_interval = keyframe_interval
+        self.ttl = ttl
+        self._header = None
+        self._buffer = bytearray()
+        self._writer = None
+        self._recording = False
+
+    def start(self, arena: "Arena"):
+        # 체크포인트에서 복구된 경기는 헤더가 이미 있으므로 기존 기록 뒤에 이어서 씀
+        self._header = HEADER.pack(
+            REPLAY_MAGIC, REPLAY_VERSION, arena.scheduler.tick_rate, arena.width, arena.height,
+            arena.left_player.user_id, arena.right_player.user_id,
+        )
+        self._recording = True
+        self.record_keyframe(arena)
+
+    def is_keyframe_due(self, tick):
+        return self._recording and tick % self.keyframe_interval == 0
+
+    def record_input(self, tick, team, command: InputCommand, direction=None):
+        if not self._recording:
+            return
+        self._buffer += RECORD.pack(INPUT, tick)
+        self._buffer += INPUT_RECORD.pack(TEAMS.index(team), COMMANDS.index(command), encode_direction(direction))
+
+    def record_keyframe(self, arena: "Arena"):
+        left, right, ball = arena.left_player, arena.right_player, arena.ball
+        self._buffer += RECORD.pack(KEYFRAME, arena.current_tick)
+        self._buffer += KEYFRAME_RECORD.pack(
+            PHASES.index(arena.phase), arena.current_round, left.score, right.score, arena.countdown_ticks,
+            encode_direction(left.direction), encode_direction(left.pending_direction),
+            encode_direction(right.direction), encode_direction(right.pending_direction),
+            ball.x, ball.y, ball.vx, ball.vy, left.bar.y, right.bar.y,
+        )
+        # 키프레임마다 내보내서 프로세스가 죽어도 마지막 키프레임까지는 남김
+        self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        data, self._buffer = bytes(self._buffer), bytearray()
+        self._writer = asyncio.create_task(self.write(self._writer, data))
+
+    async def write(self, previous, data):
+        # 앞선 쓰기가 끝난 뒤에 붙여야 기록 순서가 유지됨
+        if previous:
+            await previous
+        try:
+            await ArenaReplayRedisService.append(self.arena_id, self._header, data, self.ttl)
+        except Exception:
+            logger.exception("replay write for arena %s failed", self.arena_id)
+
+    async def drain(self):
+        if self._writer:
+            await self._writer
+
+    def close(self, arena: "Arena", winner: "Player" = None):
+        # 승자 없이 닫으면(오류로 중단되거나 해제된 경기) END 없이 마지막 기록까지만 남김
+        if not self._recording:
+            return
+        if winner:
+            self._buffer += RECORD.pack(END, arena.current_tick)
+            self._buffer += END_RECORD.pack(TEAMS.index(winner.team), arena.left_player.score, arena.right_player.score)
+        self.flush()
+        self._recording = False
+        if winner:
+            self._writer = asyncio.create_task(self.persist(self._writer))
+            
+    async def persist(self, previous):
+        # 체크포인트로 이어받은 경기는 앞부분이 다른 워커에서 쓰였으므로 메모리가 아닌 Redis 기록 전체를 옮김
+        if previous:
+            await previous
+        try:
+            data = await ArenaReplayRedisService.get(self.arena_id)
+            if data:
+                await sync_to_async(ArenaService.save_replay)(self.arena_id, data)
+                await ArenaReplayRedisService.delete(self.arena_id)
+        except Exception:
+            logger.exception("replay save for arena %s failed", self.arena_id)
+
+
+class Replay:
+    def __init__(self, header, inputs, keyframes, end):
+        self.tick_rate, self.width, self.height, self.left_user_id, self.right_user_id = header
+        self.inputs = inputs
+        self.input_ticks = [tick for tick, _ in inputs]
+        self.keyframes = keyframes
+        self.keyframe_ticks = [tick for tick, _ in keyframes]
+        self.end = end
+
+    @property
+    def last_tick(self):
+        if self.end:
+            return self.end[0]
+        return self.keyframe_ticks[-1]
+
+    @classmethod
+    def parse(cls, data):
+        if len(data) < HEADER.size:
+            raise ValueError("not a replay file")
+        magic, version, *header = HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError("not a replay file")
+
+        inputs, keyframes, end = [], [], None
+        offset = HEADER.size
+        payloads = {INPUT: INPUT_RECORD, KEYFRAME: KEYFRAME_RECORD, END: END_RECORD}
+        while offset + RECORD.size <= len(data):
+            record_type, tick = RECORD.unpack_from(data, offset)
+            payload = payloads.get(record_type)
+            if payload is None or offset + RECORD.size + payload.size > len(data):
+                break  # 기록 중 종료된 파일의 잘린 꼬리
+            values = payload.unpack_from(data, offset + RECORD.size)
+            offset += RECORD.size + payload.size
+
+            if record_type == INPUT:
+                inputs.append((tick, values))
+            elif record_type == KEYFRAME:
+                keyframes.append((tick, values))
+            else:
+                end = (tick, values)
+
+        if not keyframes:
+            raise ValueError("replay has no keyframe")
+        return cls(header, inputs, keyframes, end)
+
+    def keyframe_before(self, tick):
+        index = max(bisect.bisect_right(self.keyframe_ticks, tick) - 1, 0)
+        return self.keyframes[index]
@@ -0,0 +1,90 @@
+import bisect
+from arena.models import BaseMatch
+from .arena import Arena
+from .player import Player
+from .replay import Replay, PHASES, TEAMS, COMMANDS, decode_direction
+from .tick_scheduler import TickScheduler
+
+
+class ReplayPlayer:
+    """기록된 키프레임에서 경기장을 복원하고 입력을 다시 적용해 재생"""
+
+    def __init__(self, replay: Replay):
+        self.replay = replay
+        self.scheduler = TickScheduler(tick_rate=replay.tick_rate)
+        self.arena = None
+        self._input_index = 0
+        self.seek(0)
+
+    @property
+    def tick(self):
+        return self.arena.current_tick
+
+    @property
+    def is_finished(self):
+        return self.tick >= self.replay.last_tick or self.arena.is_finished
+
+    def seek(self, tick):
+        tick = min(max(tick, 0), self.replay.last_tick)
+        keyframe_tick, values = self.replay.keyframe_before(tick)
+        self.arena = self.restore(keyframe_tick, values)
+        self._input_index = bisect.bisect_left(self.replay.input_ticks, keyframe_tick)
+        self.apply_inputs()
+        while self.tick < tick:
+            self.step()
+        self.arena._outbox.clear()
+        self.arena.request_keyframe()
+
+    def restore(self, tick, values):
+        (phase, current_round, left_score, right_score, countdown_ticks,
+         left_direction, left_pending, right_direction, right_pending,
+         ball_x, ball_y, ball_vx, ball_vy, left_y, right_y) = values
+
+        arena = Arena(f"replay_{tick}", self.scheduler)
+        arena.width, arena.height = self.replay.width, self.replay.height
+        arena.left_player = Player(self.replay.left_user_id, arena, BaseMatch.Team.LEFT)
+        arena.right_player = Player(self.replay.right_user_id, arena, BaseMatch.Team.RIGHT)
+        arena.phase = PHASES[phase]
+        arena.current_tick = tick
+        arena.current_round = current_round
+        arena.countdown_ticks = countdown_ticks
+        arena.ball.x, arena.ball.y, arena.ball.vx, arena.ball.vy = ball_x, ball_y, ball_vx, ball_vy
+        for player, score, bar_y, direction, pending in (
+            (arena.left_player, left_score, left_y, left_direction, left_pending),
+            (arena.right_player, right_score, right_y, right_direction, right_pending),
+        ):
+            player.score = score
+            player.bar.y = bar_y
+            player.direction = decode_direction(direction)
+            player.pending_direction = decode_direction(pending)
+        return arena
+
+    def apply_inputs(self):
+        inputs = self.replay.inputs
+        while self._input_index < len(inputs) and inputs[self._input_index][0] <= self.tick:
+            _, (team, command, direction) = inputs[self._input_index]
+            player = self.arena.left_player if TEAMS[team] == BaseMatch.Team.LEFT else self.arena.right_player
+            self.arena.handle_input(player, COMMANDS[command], decode_direction(direction))
+            self._input_index += 1
+
+    def step(self):
+        self.arena.step()
+        self.apply_inputs()
+
+    def advance(self, ticks):
+        for _ in range(ticks):
+            if self.is_finished:
+                break
+            self.step()
+        outbox, self.arena._outbox = self.arena._outbox, []
+        return outbox
+
+    def get_result(self):
+        if not self.replay.end:
+            return None
+        _, (winner, left_score, right_score) = self.replay.end
+        return {
+            "winner": (self.replay.left_user_id, self.replay.right_user_id)[winner],
+            "left_player_score": left_score,
+            "right_player_score": right_score,
+        }
@@ -0,0 +1,127 @@
+import random
+import time
+from arena.enums import Direction
+from arena.models import BaseMatch
+from .arena import Arena
+from .player import Player
+from .tick_scheduler import TickScheduler
+
+
+class IdleBot:
+    def __call__(self, arena: Arena, player: Player, tick):
+        return None
+
+
+class ScriptedBot:
+    def __init__(self, script):
+        self.script = script
+        
+    def __call__(self, arena: Arena, player: Player, tick):
+        return self.script.get(tick)
+
+
+class RandomBot:
+    def __init__(self, seed=None):
+        self.random = random.Random(seed)
+        
+    def __call__(self, arena: Arena, player: Player, tick):
+        return self.random.choice((Direction.UP, Direction.DOWN, None))
+
+
+class TrackingBot:
+    def __init__(self, dead_zone=1):
+        self.dead_zone = dead_zone
+        
+    def __call__(self, arena: Arena, player: Player, tick):
+        offset = arena.ball.y - player.bar.y
+        if offset > self.dead_zone:
+            return Direction.DOWN
+        if offset < -self.dead_zone:
+            return Direction.UP
+        return None
+
+
+class HeadlessSimulation:
+    def __init__(self, left_bot=None, right_bot=None, matches=1, tick_rate=None, engine=None, max_ticks=100000):
+        self.left_bot = left_bot or IdleBot()
+        self.right_bot = right_bot or IdleBot()
+        self.max_ticks = max_ticks
+        self.scheduler = TickScheduler(tick_rate=tick_rate, engine=engine)
+        self.arenas = [self.create_arena(f"headless_{i}") for i in range(matches)]
+        self.messages = 0
+        
+    def create_arena(self, arena_id):
+        arena = Arena(arena_id, self.scheduler)
+        arena.left_player = Player(1, arena, BaseMatch.Team.LEFT)
+        arena.right_player = Player(2, arena, BaseMatch.Team.RIGHT)
+        return arena
+        
+    def run(self):
+        engine = self.scheduler.engine
+        for arena in self.arenas:
+            arena.begin()
+            if engine:
+                engine.attach(arena)
+        
+        running = list(self.arenas)
+        ticks = 0
+        started = time.perf_counter()
+        while running and ticks < self.max_ticks:
+            ticks += 1
+            for arena in running:
+                self.apply_inputs(arena)
+            # 엔진은 메시지를 만들 경기만 돌려주므로 나머지 경기는 파이썬 스텝을 건너뜀
+            stepped = engine.step() if engine else running
+            finished = False
+            for arena in stepped:
+                if engine:
+                    engine.step_arena(arena)
+                else:
+                    arena.step()
+                self.messages += len(arena._outbox)
+                arena._outbox.clear()
+                finished = finished or arena.is_finished
+            if finished:
+                running = [arena for arena in running if self.is_running(arena)]
+        elapsed = time.perf_counter() - started
+        
+        return self.report(ticks, elapsed)
+    
+    def is_running(self, arena: Arena):
+        if not arena.is_finished:
+            return True
+        # 끝난 경기는 엔진에서 떼어 틱이 더 늘지 않게 함
+        if self.scheduler.engine:
+            self.scheduler.engine.detach(arena)
+        return False
+        
+    def apply_inputs(self, arena: Arena):
+        for player, bot in ((arena.left_player, self.left_bot), (arena.right_player, self.right_bot)):
+            direction = bot(arena, player, arena.current_tick + 1)
+            if direction:
+                player.press(direction)
+            else:
+                player.release()
+                
+    def report(self, ticks, elapsed):
+        arena_steps = sum(arena.current_tick for arena in self.arenas)
+        return {
+            "matches": len(self.arenas),
+            "finished": sum(arena.is_finished for arena in self.arenas),
+            "ticks": ticks,
+            "arena_steps": arena_steps,
+            "messages": self.messages,
+            "elapsed": elapsed,
+            "ticks_per_second": ticks / elapsed if elapsed else 0,
+            "arena_steps_per_second": arena_steps / elapsed if elapsed else 0,
+            "results": [
+                {
+                    "arena_id": arena.arena_id,
+                    "rounds": arena.current_round - 1,
+                    "left_player_score": arena.left_player.score,
+                    "right_player_score": arena.right_player.score,
+                    "ticks": arena.current_tick,
+                }
+                for arena in self.arenas
+            ],
+        }
\ No newline at end of file
@@ -0,0 +1,82 @@
+class SnapshotEncoder:
+    __slots__ = ("keyframe_interval", "_last_state", "_last_tick", "_since_keyframe", "_keyframe_requested")
+    
+    def __init__(self, keyframe_interval):
+        self.keyframe_interval = keyframe_interval
+        self._last_state = None
+        self._last_tick = None
+        self._since_keyframe = 0
+        self._keyframe_requested = True
+        
+    def request_keyframe(self):
+        self._keyframe_requested = True
+        
+    def is_keyframe_due(self):
+        return (
+            self._keyframe_requested or
+            self._last_state is None or
+            self._since_keyframe >= self.keyframe_interval
+        )
+        
+    def encode(self, state):
+        tick = state["tick"]
+        if self.is_keyframe_due():
+            message = {"tick": tick, "keyframe": True}
+            self._last_state = {}
+            for key, value in state.items():
+                if key != "tick":
+                    message[key] = dict(value)
+                    self._last_state[key] = dict(value)
+            self._keyframe_requested = False
+            self._since_keyframe = 0
+        else:
+            message = {"tick": tick, "keyframe": False, "base": self._last_tick}
+            for key, value in state.items():
+                if key == "tick":
+                    continue
+                # 이전 상태는 복사하지 않고 바뀐 필드만 제자리에서 갱신
+                previous = self._last_state[key]
+                changed = None
+                for field, field_value in value.items():
+                    if previous[field] != field_value:
+                        previous[field] = field_value
+                        if changed is None:
+                            changed = message[key] = {}
+                        changed[field] = field_value
+        
+        self._since_keyframe += 1
+        self._last_tick = tick
+        return message
+
+
+def merge_snapshots(merged, message):
+    if merged is None:
+        return {k: dict(v) if isinstance(v, dict) else v for k, v in message.items()}
+    
+    for key, value in message.items():
+        if isinstance(value, dict):
+            merged.setdefault(key, {}).update(value)
+    merged["tick"] = message["tick"]
+    if message["keyframe"]:
+        merged["keyframe"] = True
+        merged.pop("base", None)
+    return merged
+
+
+class SnapshotThrottle:
+    __slots__ = ("every", "_pending", "_count")
+    
+    def __init__(self, every):
+        self.every = every
+        self._pending = None
+        self._count = 0
+        
+    def push(self, message):
+        # 건너뛴 delta는 합쳐서 다음 전송에 포함
+        self._pending = merge_snapshots(self._pending, message)
+        self._count += 1
+        if self._count < self.every:
+            return None
+        
+        pending, self._pending, self._count = self._pending, None, 0
+        return pending
\ No newline at end of file
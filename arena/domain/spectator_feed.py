@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from collections import deque
+from django.conf import settings
+from arena.services import ArenaService
+from config.redis_services import ArenaSpectatorRedisService
+
+logger = logging.getLogger(__name__)
+
+# 위치 상태는 spectator 주기마다 전체를 보내므로 프레임 단위 메시지는 전달하지 않음
+FRAME_MESSAGE_TYPES = {'state', 'trajectory'}
+# 전송이 밀리는 동안 쌓아 둘 이벤트 수. 넘치면 오래된 것부터 버림(arena.end 같은 최신 이벤트는 유지)
+MAX_PENDING_EVENTS = 32
+
+
+class SpectatorFeed:
+    """관전자 그룹으로 보내는 저빈도 전송. 관전 요청이 있을 때만 켜지고 틱 루프와 분리된 태스크에서 전송"""
+    __slots__ = ("arena_id", "group_name", "interval", "spectators", "_latest", "_events", "_task")
+    
+    def __init__(self, arena_id, tick_rate):
+        self.arena_id = arena_id
+        self.group_name = ArenaService.get_spectator_group_name(arena_id)
+        self.interval = max(1, round(tick_rate / settings.ARENA_SPECTATOR_RATE))
+        self.spectators = 0
+        self._latest = None
+        self._events = deque(maxlen=MAX_PENDING_EVENTS)
+        self._task = None
+        
+    @property
+    def active(self):
+        return self.spectators > 0
+    
+    def watch(self):
+        """관전자 수를 늘림. 처음 켜졌으면 True"""
+        self.spectators += 1
+        return self.spectators == 1
+    
+    def unwatch(self):
+        self.spectators = max(0, self.spectators - 1)
+        if not self.spectators:
+            # 마지막 관전자가 나가면 쌓인 상태와 이벤트를 버리고 전송을 끔
+            self._latest = None
+            self._events.clear()
+        
+    def is_due(self, tick, scale=1):
+        return self.active and tick % (self.interval * scale) == 0
+        
+    def update(self, state):
+        # Arena.get_state()는 재사용 버퍼이므로 복사해서 보관
+        latest = {"keyframe": True}
+        for key, value in state.items():
+            latest[key] = dict(value) if isinstance(value, dict) else value
+        self._latest = latest
+        
+    def forward(self, message_type, message):
+        if self.active and message_type not in FRAME_MESSAGE_TYPES:
+            self._events.append((message_type, message))
+            
+    def publish(self):
+        # 이전 전송이 아직 진행 중이면 다음 publish 때 최신 상태로 합쳐서 보냄
+        if not self.active or (self._task and not self._task.done()):
+            return
+        if self._latest is None and not self._events:
+            return
+        latest, self._latest = self._latest, None
+        events, self._events = self._events, deque(maxlen=MAX_PENDING_EVENTS)
+        self._task = asyncio.create_task(self.send(latest, events))
+        
+    async def send(self, latest, events):
+        try:
+            for message_type, message in events:
+                await ArenaService.broadcast(self.group_name, message_type, message)
+            if latest:
+                await ArenaSpectatorRedisService.set_latest(self.arena_id, latest, settings.ARENA_SPECTATOR_CACHE_TTL)
+                await ArenaService.broadcast(self.group_name, 'state', latest)
+        except Exception:
+            logger.exception("spectator feed for arena %s failed", self.arena_id)
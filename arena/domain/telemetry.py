@@ -0,0 +1,29 @@
+class TickTelemetry:
+    __slots__ = ("ticks", "overruns", "dropped_ticks", "last_lag", "max_lag")
+    
+    def __init__(self):
+        self.ticks = 0
+        self.overruns = 0
+        self.dropped_ticks = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        
+    def record(self, lag, period):
+        self.ticks += 1
+        self.last_lag = lag
+        if lag > self.max_lag:
+            self.max_lag = lag
+        if lag > period:
+            self.overruns += 1
+            
+    def record_dropped(self, count):
+        self.dropped_ticks += count
+        
+    def to_dict(self):
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "dropped_ticks": self.dropped_ticks,
+            "last_lag": self.last_lag,
+            "max_lag": self.max_lag,
+        }
\ No newline at end of file
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING
+from django.conf import settings
+from config.metrics import DEFAULT_BUCKETS, Histogram
+from .overload import OverloadController
+from .telemetry import TickTelemetry
+
+if TYPE_CHECKING:
+    from .arena import Arena
+
+logger = logging.getLogger(__name__)
+
+TICK_SECONDS = Histogram(
+    "arena_tick_duration_seconds", "Time spent stepping and flushing every arena for one tick.", buckets=DEFAULT_BUCKETS
+)
+TICK_LAG_SECONDS = Histogram(
+    "arena_tick_lag_seconds", "How late each tick started against its deadline.", buckets=DEFAULT_BUCKETS
+)
+
+
+class TickScheduler:
+    def __init__(self, tick_rate=None, engine=None, max_catchup_ticks=None):
+        self.tick_rate = tick_rate or settings.ARENA_TICK_RATE
+        self.max_catchup_ticks = max_catchup_ticks or settings.ARENA_MAX_CATCHUP_TICKS
+        self.engine = engine
+        self.telemetry = TickTelemetry()
+        self.overload = OverloadController(self.tick_rate)
+        self._arenas: dict[str, "Arena"] = {}
+        self._task = None
+
+    @property
+    def period(self):
+        return 1 / self.tick_rate
+
+    def register(self, arena: "Arena"):
+        self._arenas[arena.arena_id] = arena
+        if self.engine:
+            self.engine.attach(arena)
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def unregister(self, arena: "Arena"):
+        if self._arenas.get(arena.arena_id) is arena:
+            del self._arenas[arena.arena_id]
+            if self.engine:
+                self.engine.detach(arena)
+
+    def abort(self, arena: "Arena"):
+        try:
+            arena.abort()
+        except Exception:
+            logger.exception("arena %s cleanup failed", arena.arena_id)
+            self.unregister(arena)
+
+    def is_registered(self, arena: "Arena"):
+        return self._arenas.get(arena.arena_id) is arena
+
+    def __len__(self):
+        return len(self._arenas)
+
+    async def _run(self):
+        deadline = time.monotonic()
+        try:
+            while self._arenas:
+                steps = 0
+                while steps < self.max_catchup_ticks and time.monotonic() >= deadline:
+                    await self.tick(lag=time.monotonic() - deadline)
+                    deadline += self.period
+                    steps += 1
+                
+                behind = time.monotonic() - deadline
+                if behind >= 0:
+                    # 따라잡기 한도를 넘긴 틱은 버리고 현재 시각 기준으로 다시 맞춤
+                    dropped = int(behind // self.period) + 1
+                    self.record_dropped(dropped)
+                    deadline += dropped * self.period
+                
+                await asyncio.sleep(deadline - time.monotonic())
+        finally:
+            # 돌릴 경기가 없으면 부하도 없으므로 다음 시작은 정상 단계에서
+            self.overload.reset()
+            self._task = None
+            
+    def record_dropped(self, count):
+        self.telemetry.record_dropped(count)
+        for arena in self._arenas.values():
+            arena.telemetry.record_dropped(count)
+
+    async def tick(self, lag=0.0):
+        started = time.perf_counter()
+        self.telemetry.record(lag, self.period)
+        TICK_LAG_SECONDS.observe(lag)
+        if self.overload.record(lag):
+            logger.warning("overload level %d (smoothed lag %.1fms)", self.overload.level, self.overload.lag * 1000)
+        if self.engine:
+            # 물리, 입력, 카운트다운은 엔진 배열에서 한 번에 진행하고 메시지를 만들 경기만 돌려받음
+            self.engine.record(lag, self.period)
+            arenas = self.engine.step(self.overload.snapshot_scale)
+        else:
+            arenas = list(self._arenas.values())
+        for arena in arenas:
+            try:
+                if self.engine:
+                    self.engine.step_arena(arena)
+                else:
+                    arena.telemetry.record(lag, self.period)
+                    arena.step()
+            except Exception:
+                # 한 경기의 오류가 다른 경기 진행을 막지 않도록 분리
+                logger.exception("arena %s step failed", arena.arena_id)
+                self.abort(arena)
+
+        pending = [arena for arena in arenas if arena.has_outbox()]
+        results = await asyncio.gather(
+            *(arena.flush() for arena in pending),
+            return_exceptions=True
+        )
+        for arena, result in zip(pending, results):
+            if isinstance(result, Exception):
+                logger.error("arena %s flush failed", arena.arena_id, exc_info=result)
+                if arena.is_finished:
+                    # end_game 도중 실패한 경기도 매니저와 리플레이 기록이 남지 않도록 정리
+                    self.abort(arena)
+        TICK_SECONDS.observe(time.perf_counter() - started)
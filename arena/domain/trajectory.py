@@ -0,0 +1,44 @@
+# 바의 이동량은 float 차이로 계산하므로 오차 범위 안의 변화는 같은 속도로 봄
+VELOCITY_TOLERANCE = 1e-6
+
+
+class TrajectoryEncoder:
+    __slots__ = ("_ball_velocity", "_bars", "_keyframe_requested")
+    
+    def __init__(self):
+        self._ball_velocity = None
+        self._bars = {}
+        self._keyframe_requested = True
+        
+    def request_keyframe(self):
+        self._keyframe_requested = True
+        
+    def reset(self):
+        # 라운드 리셋처럼 위치가 순간 이동한 경우 이전 위치로 속도를 계산하지 않음
+        self._bars.clear()
+        self._keyframe_requested = True
+        
+    def encode(self, tick, ball, bars):
+        keyframe = self._keyframe_requested
+        self._keyframe_requested = False
+        message = None
+        
+        velocity = (ball.vx, ball.vy) if ball.playing else (0, 0)
+        if keyframe or velocity != self._ball_velocity:
+            self._ball_velocity = velocity
+            message = {"tick": tick, "keyframe": keyframe}
+            message["ball"] = {"x": ball.x, "y": ball.y, "vx": velocity[0], "vy": velocity[1]}
+            
+        for key, bar in bars:
+            y = bar.y
+            last_y, last_vy = self._bars.get(key, (y, 0))
+            vy = y - last_y
+            changed = abs(vy - last_vy) > VELOCITY_TOLERANCE
+            if not changed:
+                vy = last_vy
+            if keyframe or changed:
+                if message is None:
+                    message = {"tick": tick, "keyframe": keyframe}
+                message[key] = {"x": bar.x, "y": y, "vy": vy}
+            self._bars[key] = (y, vy)
+        return message
@@ -4,16 +4,34 @@ from asgiref.sync import async_to_sync
 from datetime import datetime
 
 class BaseMatchDTO:
-    def __init__(self, match: BaseMatch, token):
+    def __init__(self, match: BaseMatch, token, users=None):
+        if users is None:
+            users = self.get_users([match], token)
         self.id = getattr(match, 'id', None)
         self.reception_id = match.reception_id
-        self.left_player = self._get_user(match.left_player, token)
-        self.right_player = self._get_user(match.right_player, token)
+        self.left_player = users.get(match.left_player)
+        self.right_player = users.get(match.right_player)
         self.left_player_score = match.left_player_score
         self.right_player_score = match.right_player_score
-        self.winner = self._get_user(match.winner, token)
+        self.winner = users.get(match.winner)
         self.created_at = self._format_datetime(match.created_at)
         
+    @classmethod
+    def from_matches(cls, matches, token):
+        # 목록 전체의 유저를 한 번에 조회해서 DTO마다 나눠 씀
+        matches = list(matches)
+        users = cls.get_users(matches, token)
+        return [cls(match, token, users) for match in matches]
+    
+    @staticmethod
+    def get_user_ids(match):
+        return (match.left_player, match.right_player, match.winner)
+    
+    @classmethod
+    def get_users(cls, matches, token):
+        user_ids = [user_id for match in matches for user_id in cls.get_user_ids(match)]
+        return async_to_sync(UserRedisService.get_many_exclude_email)(user_ids, token)
+        
     def to_dict(self):
         return {
             "id": self.id,
@@ -26,10 +44,6 @@ class BaseMatchDTO:
             "created_at": self.created_at,
         }
         
-    def _get_user(self, user_id, token):
-        user = async_to_sync(UserRedisService.get_or_fetch_user_exclude_email)(user_id, token)
-        return user
-    
     def _format_datetime(self, dt):
         if isinstance(dt, datetime):
             return dt.strftime('%Y-%m-%d %H:%M:%S')
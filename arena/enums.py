@@ -10,4 +10,16 @@ class Direction(Enum):
     
 class ArenaType(Enum):
     NORMAL = "normal"
-    TOURNAMENT = "tournament"
\ No newline at end of file
+    TOURNAMENT = "tournament"
+    
+class ArenaPhase(Enum):
+    WAITING = "waiting"
+    COUNTDOWN = "countdown"
+    PLAYING = "playing"
+    FINISHED = "finished"
+    
+class InputCommand(Enum):
+    PRESS = "press"
+    RELEASE = "release"
+    TAP = "tap"
+    KEYFRAME = "keyframe"
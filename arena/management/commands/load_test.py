@@ -0,0 +1,336 @@
+import asyncio
+import json
+import random
+import time
+from unittest.mock import patch
+import jwt
+from channels.testing import WebsocketCommunicator
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from arena.domain.arena_manager import ArenaManager
+from arena.models import NormalMatch, MatchReplay
+from arena.services import ArenaService
+from config.redis_services import (
+    redis_client, ReceptionRedisService, UserRedisService, ArenaRedisService, FanoutRedisService,
+    ArenaOwnershipRedisService, ArenaCheckpointRedisService, ArenaSpectatorRedisService, ArenaReplayRedisService,
+)
+from config.services import UserService
+from reception.models import Reception
+from reception.services import ReceptionService
+
+IN_MEMORY_CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        'CONFIG': {'capacity': 1000},
+    },
+}
+
+
+async def stub_get_user(user_id, token):
+    return {
+        "id": user_id,
+        "nickname": f"load_{user_id}",
+        "avatar": None,
+        "email": f"load_{user_id}@example.com",
+    }
+
+
+def percentile(values, ratio):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * ratio), len(ordered) - 1)]
+
+
+class LoadClient:
+    def __init__(self, load_test: "LoadTest", user_id, tracking):
+        self.load_test = load_test
+        self.user_id = user_id
+        self.token = jwt.encode({"user_id": user_id}, "load-test", algorithm="HS256")
+        self.tracking = tracking
+        self.communicator = None
+        self.team = None
+        self.direction = None
+        self.ball_x = None
+        self.ball_y = None
+        self.bar_y = None
+        self.approaching = False
+        self.missing = False
+        # 실행마다 같은 결과가 나오도록 유저별 시드 사용
+        self.random = random.Random(user_id)
+
+    async def connect(self, path):
+        self.communicator = WebsocketCommunicator(self.load_test.application, f"{path}?token={self.token}")
+        connected, _ = await self.communicator.connect(timeout=self.load_test.timeout)
+        if not connected:
+            raise ConnectionError(f"{path} rejected user {self.user_id}")
+
+    async def disconnect(self):
+        await self.communicator.disconnect(timeout=self.load_test.timeout)
+
+    async def send_json(self, message):
+        await self.communicator.send_to(text_data=json.dumps(message))
+
+    async def receive(self):
+        message = json.loads(await self.communicator.receive_from(timeout=self.load_test.timeout))
+        self.load_test.messages += 1
+        return message
+
+    async def wait_for(self, message_type):
+        while True:
+            message = await self.receive()
+            if message.get('type') == message_type:
+                return message
+
+    async def play(self, arena_id):
+        while True:
+            message = await self.receive()
+            message_type = message.get('type')
+            if message_type == 'arena.end':
+                return message['result']
+            if message_type == 'team':
+                self.team = message['message']
+            elif message_type == 'state':
+                self.load_test.record_latency(arena_id, message['message'])
+                await self.track(message['message'])
+
+    async def track(self, state):
+        ball = state.get("ball")
+        bar = state.get(f"{self.team}_player_bar")
+        if ball and "x" in ball:
+            self.update_approach(ball["x"])
+        if ball and "y" in ball:
+            self.ball_y = ball["y"]
+        if bar and "y" in bar:
+            self.bar_y = bar["y"]
+        if not self.tracking or self.ball_y is None or self.bar_y is None:
+            return
+
+        offset = self.ball_y - self.bar_y
+        direction = "down" if offset > 1 else "up" if offset < -1 else None
+        if self.missing:
+            direction = None
+        if direction != self.direction:
+            self.direction = direction
+            if direction:
+                await self.send_json({"type": "press", "direction": direction})
+            else:
+                await self.send_json({"type": "release"})
+
+
+    def update_approach(self, ball_x):
+        # 공이 내 쪽으로 오기 시작할 때마다 miss_rate 확률로 이번 랠리를 놓침. 안 그러면 두 봇이 끝없이 받아냄
+        if self.ball_x is not None and ball_x != self.ball_x:
+            approaching = (ball_x < self.ball_x) == (self.team == "left")
+            if approaching and not self.approaching:
+                self.missing = self.random.random() < self.load_test.miss_rate
+            self.approaching = approaching
+        self.ball_x = ball_x
+
+
+class LoadTest:
+    """reception 생성 → ready → arena → 경기 종료까지 실제 ASGI 앱을 통해 구동"""
+
+    def __init__(
+        self, application, matches, concurrency, timeout, tracking, user_id_base, miss_rate=0.5, match_seconds=300.0
+    ):
+        self.application = application
+        self.matches = matches
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.tracking = tracking
+        self.miss_rate = miss_rate
+        self.match_seconds = match_seconds
+        self.user_id_base = user_id_base
+        self.messages = 0
+        self.finished = 0
+        self.failures = []
+        self.tick_intervals = []
+        self.latencies = []
+        self._tick_started = {}
+        self._last_tick = None
+        # 끝나고 지울 수 있도록 만든 데이터를 기록
+        self.reception_ids = []
+        self.arena_users = {}
+        self.user_ids = []
+
+    def instrument(self, scheduler):
+        tick = scheduler.tick
+        history = scheduler.tick_rate * 2
+
+        async def timed_tick(lag=0.0):
+            started = time.monotonic()
+            if self._last_tick is not None:
+                self.tick_intervals.append(started - self._last_tick)
+            self._last_tick = started
+            # step()이 틱 번호를 올리기 전에 기록해야 클라이언트가 먼저 받아도 조회 가능
+            for arena in list(scheduler._arenas.values()):
+                stamps = self._tick_started.setdefault(arena.arena_id, {})
+                stamps[arena.current_tick + 1] = started
+                stamps.pop(arena.current_tick + 1 - history, None)
+            await tick(lag)
+
+        scheduler.tick = timed_tick
+
+    def record_latency(self, arena_id, state):
+        started = self._tick_started.get(arena_id, {}).get(state["tick"])
+        if started is not None:
+            self.latencies.append(time.monotonic() - started)
+
+    async def run_match(self, index):
+        user_ids = (self.user_id_base + index * 2, self.user_id_base + index * 2 + 1)
+        self.user_ids.extend(user_ids)
+        reception = await Reception.objects.acreate(creator=user_ids[0], name=f"load_{index}")
+        self.reception_ids.append(reception.id)
+        for user_id in user_ids:
+            await ReceptionRedisService.add_allowed_user(reception.id, user_id)
+
+        clients = [LoadClient(self, user_id, self.tracking) for user_id in user_ids]
+        await asyncio.gather(*(c.connect(f"/ws/game/reception/{reception.id}/") for c in clients))
+        for client in clients:
+            await client.send_json({"type": "ready"})
+        moves = await asyncio.gather(*(c.wait_for('move.arena') for c in clients))
+        await asyncio.gather(*(c.disconnect() for c in clients))
+
+        arena_id = moves[0]['arena_id']
+        self.arena_users[arena_id] = user_ids
+        await asyncio.gather(*(c.connect(f"/ws/game/arena/{arena_id}/") for c in clients))
+        try:
+            # state가 계속 오면 --timeout은 걸리지 않으므로 경기 전체 시간에도 상한을 둠
+            await asyncio.wait_for(asyncio.gather(*(c.play(arena_id) for c in clients)), self.match_seconds)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"arena {arena_id} did not finish within {self.match_seconds:.0f}s") from None
+        finally:
+            await asyncio.gather(*(c.disconnect() for c in clients))
+            self._tick_started.pop(arena_id, None)
+
+    async def run_limited(self, semaphore, index):
+        async with semaphore:
+            try:
+                await self.run_match(index)
+                self.finished += 1
+            except Exception as e:
+                self.failures.append(f"match {index}: {e!r}")
+
+    async def run(self):
+        self.instrument(ArenaManager.get_scheduler())
+        semaphore = asyncio.Semaphore(self.concurrency)
+        started = time.monotonic()
+        try:
+            await asyncio.gather(*(self.run_limited(semaphore, i) for i in range(self.matches)))
+        finally:
+            await self.cleanup()
+        elapsed = time.monotonic() - started
+
+        telemetry = ArenaManager.get_scheduler().telemetry
+        return {
+            "matches": self.matches,
+            "finished": self.finished,
+            "failures": self.failures,
+            "clients": self.matches * 2,
+            "elapsed": elapsed,
+            "tick_interval_p50": percentile(self.tick_intervals, 0.5),
+            "tick_interval_p99": percentile(self.tick_intervals, 0.99),
+            "broadcast_latency_p50": percentile(self.latencies, 0.5),
+            "broadcast_latency_p99": percentile(self.latencies, 0.99),
+            "messages": self.messages,
+            "messages_per_second": self.messages / elapsed if elapsed else 0.0,
+            "scheduler": telemetry.to_dict(),
+        }
+
+    def get_created_keys(self):
+        keys = []
+        for reception_id in self.reception_ids:
+            keys += [
+                ReceptionRedisService.get_roster_key(reception_id),
+                ReceptionRedisService.get_ready_key(reception_id),
+                ReceptionRedisService.get_profiles_key(reception_id),
+                ReceptionRedisService.get_allowed_users_key(reception_id),
+                FanoutRedisService.get_members_key(ReceptionService.get_group_name(reception_id)),
+            ]
+        for user_id in self.user_ids:
+            keys += [
+                ReceptionRedisService.get_user_reception_key(user_id),
+                UserRedisService.get_user_detail_key(user_id),
+            ]
+        for arena_id, user_ids in self.arena_users.items():
+            keys += [ArenaRedisService.get_arena_participants_key(arena_id, user_id) for user_id in user_ids]
+            keys += [
+                FanoutRedisService.get_members_key(ArenaService.get_group_name(arena_id)),
+                FanoutRedisService.get_members_key(ArenaService.get_spectator_group_name(arena_id)),
+                ArenaOwnershipRedisService.get_owner_key(arena_id),
+                ArenaCheckpointRedisService.get_checkpoint_key(arena_id),
+                ArenaSpectatorRedisService.get_latest_key(arena_id),
+                ArenaReplayRedisService.get_replay_key(arena_id),
+            ]
+        return keys
+
+    async def cleanup(self):
+        """부하 테스트가 만든 Reception/NormalMatch/MatchReplay 행과 Redis 키를 삭제"""
+        await MatchReplay.objects.filter(arena_id__in=list(self.arena_users)).adelete()
+        await NormalMatch.objects.filter(reception_id__in=self.reception_ids).adelete()
+        await Reception.objects.filter(id__in=self.reception_ids).adelete()
+        keys = self.get_created_keys()
+        for start in range(0, len(keys), 500):
+            await redis_client.delete(*keys[start:start + 500])
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive config.routing.application with simulated clients through "
+        "reception → ready → arena → match end and report tick and broadcast latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--matches", type=int, default=100)
+        parser.add_argument("--concurrency", type=int, default=None, help="matches running at once (default: all)")
+        parser.add_argument("--timeout", type=float, default=120.0, help="seconds to wait for any single message")
+        parser.add_argument("--bot", choices=("idle", "tracking"), default="idle")
+        parser.add_argument(
+            "--miss-rate", type=float, default=0.5, help="chance a tracking bot gives up on an incoming rally"
+        )
+        parser.add_argument("--match-seconds", type=float, default=300.0, help="upper bound on one match")
+        parser.add_argument("--user-id-base", type=int, default=900000)
+        parser.add_argument(
+            "--allow-writes", action="store_true",
+            help="required: creates Reception/NormalMatch/MatchReplay rows and Redis keys in the configured stores (deleted afterwards)"
+        )
+
+    def handle(self, *args, **options):
+        if not options["allow_writes"]:
+            raise CommandError(
+                "load_test writes to the configured database and Redis. "
+                "Point settings at disposable stores and pass --allow-writes."
+            )
+        # 같은 프로세스 안에서만 돌리므로 channel layer는 메모리로, 유저 서비스는 스텁으로 대체
+        with override_settings(CHANNEL_LAYERS=IN_MEMORY_CHANNEL_LAYERS), \
+                patch.object(UserService, "get_user", stub_get_user):
+            from config.routing import application
+            load_test = LoadTest(
+                application=application,
+                matches=options["matches"],
+                concurrency=options["concurrency"] or options["matches"],
+                timeout=options["timeout"],
+                tracking=options["bot"] == "tracking",
+                user_id_base=options["user_id_base"],
+                miss_rate=options["miss_rate"],
+                match_seconds=options["match_seconds"],
+            )
+            report = asyncio.run(load_test.run())
+
+        self.stdout.write(
+            f"{report['finished']}/{report['matches']} matches, {report['clients']} clients "
+            f"in {report['elapsed']:.1f}s"
+        )
+        self.stdout.write(
+            f"tick interval p50 {report['tick_interval_p50'] * 1000:.2f}ms, "
+            f"p99 {report['tick_interval_p99'] * 1000:.2f}ms"
+        )
+        self.stdout.write(
+            f"broadcast latency p50 {report['broadcast_latency_p50'] * 1000:.2f}ms, "
+            f"p99 {report['broadcast_latency_p99'] * 1000:.2f}ms"
+        )
+        self.stdout.write(f"{report['messages']} messages, {report['messages_per_second']:.0f} msg/s")
+        self.stdout.write(f"scheduler: {report['scheduler']}")
+        for failure in report["failures"]:
+            self.stderr.write(failure)
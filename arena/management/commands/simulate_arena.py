@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+from arena.domain.simulation import HeadlessSimulation, IdleBot, RandomBot, TrackingBot
+
+BOTS = {
+    "idle": lambda seed: IdleBot(),
+    "random": lambda seed: RandomBot(seed),
+    "tracking": lambda seed: TrackingBot(),
+}
+
+
+class Command(BaseCommand):
+    help = "Run arena matches headless, as fast as the CPU allows, and report throughput and scores."
+    
+    def add_arguments(self, parser):
+        parser.add_argument("--matches", type=int, default=1)
+        parser.add_argument("--max-ticks", type=int, default=100000)
+        parser.add_argument("--left", choices=BOTS.keys(), default="random")
+        parser.add_argument("--right", choices=BOTS.keys(), default="random")
+        parser.add_argument("--seed", type=int, default=None)
+        parser.add_argument("--engine", choices=("python", "batch"), default="python")
+        parser.add_argument("--tick-rate", type=int, default=None)
+        parser.add_argument("--show-results", action="store_true")
+        
+    def handle(self, *args, **options):
+        engine = None
+        if options["engine"] == "batch":
+            try:
+                from arena.domain.batch_engine import BatchPhysicsEngine
+            except ImportError:
+                raise CommandError("batch engine requires numpy.")
+            engine = BatchPhysicsEngine()
+        
+        seed = options["seed"]
+        simulation = HeadlessSimulation(
+            left_bot=BOTS[options["left"]](seed),
+            right_bot=BOTS[options["right"]](None if seed is None else seed + 1),
+            matches=options["matches"],
+            tick_rate=options["tick_rate"],
+            engine=engine,
+            max_ticks=options["max_ticks"],
+        )
+        report = simulation.run()
+        
+        self.stdout.write(
+            f"{report['finished']}/{report['matches']} matches finished in {report['ticks']} ticks "
+            f"({report['elapsed']:.3f}s)"
+        )
+        self.stdout.write(
+            f"{report['ticks_per_second']:.0f} ticks/s, "
+            f"{report['arena_steps_per_second']:.0f} arena steps/s, "
+            f"{report['messages']} messages"
+        )
+        if options["show_results"]:
+            for result in report["results"]:
+                self.stdout.write(
+                    f"{result['arena_id']}: {result['left_player_score']}-{result['right_player_score']} "
+                    f"after {result['rounds']} rounds, {result['ticks']} ticks"
+                )
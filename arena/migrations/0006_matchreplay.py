@@ -0,0 +1,24 @@
+# Generated by Django 5.1.4 on 2026-10-19 03:45
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('arena', '0005_normalmatch_reception_id'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MatchReplay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('arena_id', models.CharField(max_length=50, unique=True)),
+                ('data', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('match', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='replay', to='arena.normalmatch')),
+            ],
+        ),
+    ]
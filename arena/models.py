@@ -25,4 +25,11 @@ class BaseMatch(models.Model):
         
         
 class NormalMatch(BaseMatch):
-    pass
\ No newline at end of file
+    pass
+
+class MatchReplay(models.Model):
+    # 끝난 경기의 리플레이 바이트. 토너먼트 경기는 NormalMatch가 없어 match가 비어 있음
+    arena_id = models.CharField(max_length=50, unique=True)
+    match = models.OneToOneField(NormalMatch, null=True, blank=True, on_delete=models.CASCADE, related_name='replay')
+    data = models.BinaryField()
+    created_at = models.DateTimeField(auto_now_add=True)
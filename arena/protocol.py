@@ -0,0 +1,64 @@
+import struct
+from .enums import Direction
+
+BINARY_SUBPROTOCOL = "pong.binary.v1"
+
+STATE_FRAME = 0x01
+KEYFRAME_FLAG = 0x01
+
+# type, flags, field mask, tick, base tick 다음에 mask 순서대로 float32 값
+STATE_HEADER = struct.Struct("<BBBII")
+STATE_FIELDS = (
+    ("ball", "x"),
+    ("ball", "y"),
+    ("left_player_bar", "x"),
+    ("left_player_bar", "y"),
+    ("right_player_bar", "x"),
+    ("right_player_bar", "y"),
+)
+_value_structs = [struct.Struct(f"<{count}f") for count in range(len(STATE_FIELDS) + 1)]
+
+INPUT_RELEASE = 0x00
+INPUT_UP = 0x01
+INPUT_DOWN = 0x02
+INPUT_KEYFRAME = 0x10
+INPUT_DIRECTIONS = {
+    INPUT_UP: Direction.UP,
+    INPUT_DOWN: Direction.DOWN,
+}
+
+
+def encode_state_frame(message):
+    mask = 0
+    values = []
+    for i, (group, key) in enumerate(STATE_FIELDS):
+        fields = message.get(group)
+        if fields and key in fields:
+            mask |= 1 << i
+            values.append(fields[key])
+    
+    flags = KEYFRAME_FLAG if message.get("keyframe") else 0
+    header = STATE_HEADER.pack(STATE_FRAME, flags, mask, message["tick"], message.get("base") or 0)
+    return header + _value_structs[len(values)].pack(*values)
+
+
+def decode_state_frame(frame):
+    frame_type, flags, mask, tick, base = STATE_HEADER.unpack_from(frame)
+    if frame_type != STATE_FRAME:
+        raise ValueError("not a state frame")
+    
+    present = [field for i, field in enumerate(STATE_FIELDS) if mask & (1 << i)]
+    values = _value_structs[len(present)].unpack_from(frame, STATE_HEADER.size)
+    
+    message = {"tick": tick, "keyframe": bool(flags & KEYFRAME_FLAG)}
+    if not message["keyframe"]:
+        message["base"] = base
+    for (group, key), value in zip(present, values):
+        message.setdefault(group, {})[key] = value
+    return message
+
+
+def decode_input_frame(frame):
+    if len(frame) != 1:
+        raise ValueError("input frame must be one byte")
+    return frame[0]
\ No newline at end of file
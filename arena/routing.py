@@ -1,7 +1,9 @@
 from django.urls import path
-from .consumers import ArenaConsumer
+from .consumers import ArenaConsumer, SpectatorConsumer, ReplayConsumer
 
 websocket_urlpatterns = [
     path("ws/game/arena/<str:arena_id>/", ArenaConsumer.as_asgi(), name="websocket_arena"),
+    path("ws/game/arena/<str:arena_id>/spectate/", SpectatorConsumer.as_asgi(), name="websocket_arena_spectate"),
+    path("ws/game/arena/<str:arena_id>/replay/", ReplayConsumer.as_asgi(), name="websocket_arena_replay"),
     path("ws/game/tournament/<int:tournament_id>/match/<int:match_number>/", ArenaConsumer.as_asgi(), name="websocket_tournament_match"),
 ]
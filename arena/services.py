@@ -1,4 +1,7 @@
-from .models import NormalMatch
+from .models import NormalMatch, MatchReplay
+from .protocol import encode_state_frame
+from config.consumer_utils import build_client_event
+from config.local_fanout import LocalFanout
 from django.db.models import Q
 from django.db import IntegrityError, transaction
 from datetime import datetime
@@ -9,6 +12,21 @@ class ArenaService:
     def get_group_name(arena_id):
         return f"arena_group_{arena_id}"
 
+    @staticmethod
+    def get_spectator_group_name(arena_id):
+        return f"arena_spectators_{arena_id}"
+
+    @staticmethod
+    async def broadcast(group_name, message_type, message):
+        event = build_client_event(message_type, message)
+        remote_event = None
+        if message_type == 'state':
+            # 다른 워커에는 message만 보내고 text/bytes는 받는 쪽 연결이 필요한 형식만 만듦
+            remote_event = {'type': 'send_to_client', 'message_type': message_type, 'message': message}
+            event['message'] = message
+            event['bytes'] = encode_state_frame(message)
+        await LocalFanout.group_send(group_name, event, remote_event)
+
     @staticmethod
     def arena_websocket_url(arena_id):
         return f"/ws/arena/{arena_id}/"
@@ -41,6 +59,21 @@ class ArenaService:
         match.state=NormalMatch.State.FINISHED
         match.save()
         
+    @staticmethod
+    def save_replay(arena_id, data):
+        MatchReplay.objects.update_or_create(
+            arena_id=arena_id,
+            defaults={
+                'match': NormalMatch.objects.filter(unique_id=arena_id).first(),
+                'data': data,
+            }
+        )
+        
+    @staticmethod
+    async def get_replay(arena_id):
+        replay = await MatchReplay.objects.filter(arena_id=arena_id).only('data').afirst()
+        return bytes(replay.data) if replay else None
+        
     @staticmethod
     async def get_match(unique_id):
         return await NormalMatch.objects.aget(unique_id=unique_id)
@@ -0,0 +1,76 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch, AsyncMock
+from arena.domain.arena import Arena
+from arena.domain.arena_manager import ArenaManager
+from arena.domain.player import Player
+from arena.domain.tick_scheduler import TickScheduler
+from arena.enums import ArenaPhase
+from arena.models import BaseMatch
+
+
+class TestArenaCheckpoint(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.scheduler = TickScheduler(tick_rate=5)
+        self.scheduler.register = lambda arena: None
+        self.messages = []
+        
+    async def record(self, message_type, message):
+        self.messages.append((message_type, message))
+        
+    async def create_arena(self, arena_id, checkpoint=None):
+        arena = Arena(arena_id, self.scheduler)
+        arena.set_messenger(f"group_{arena_id}", self.record)
+        if checkpoint:
+            arena.restore(checkpoint)
+        return arena
+    
+    async def join(self, arena, user_id):
+        team = arena.get_remaining_team(user_id)
+        return await arena.add_player(Player(user_id, arena, team))
+
+    async def test_restored_arena_resumes_with_original_sides(self):
+        arena = await self.create_arena("a")
+        await self.join(arena, 1)
+        await self.join(arena, 2)
+        arena.phase = ArenaPhase.PLAYING
+        for _ in range(7):
+            arena.step()
+        arena.left_player.score = 1
+        checkpoint = arena.get_checkpoint()
+        
+        restored = await self.create_arena("a", checkpoint)
+        self.assertIsNone(await self.join(restored, 3))
+        right_team = await self.join(restored, 2)
+        left_team = await self.join(restored, 1)
+        await restored.flush()
+        
+        self.assertEqual((left_team, right_team), (BaseMatch.Team.LEFT, BaseMatch.Team.RIGHT))
+        self.assertEqual(restored.phase, ArenaPhase.COUNTDOWN)
+        self.assertEqual(restored.current_tick, arena.current_tick)
+        self.assertEqual((restored.ball.x, restored.ball.y), (arena.ball.x, arena.ball.y))
+        self.assertEqual(restored.get_checkpoint(), checkpoint)
+        resume = [m for t, m in self.messages if t == 'resume']
+        self.assertEqual(resume, [{"left_player_score": 1, "right_player_score": 0, "round": 1}])
+
+    async def test_save_checkpoints_writes_live_and_clears_finished(self):
+        live = await self.create_arena("live")
+        finished = await self.create_arena("finished")
+        waiting = await self.create_arena("waiting")
+        for arena in (live, finished):
+            await self.join(arena, 1)
+            await self.join(arena, 2)
+        await self.join(waiting, 1)
+        
+        with patch("arena.domain.arena_manager.ArenaCheckpointRedisService") as redis, \
+                patch.multiple(ArenaManager, _leases={"live", "finished", "waiting"}, _checkpoints=set(),
+                               _arenas={"live": live, "finished": finished, "waiting": waiting}):
+            redis.save_many = AsyncMock()
+            redis.delete_many = AsyncMock()
+            await ArenaManager.save_checkpoints()
+            finished.phase = ArenaPhase.FINISHED
+            await ArenaManager.save_checkpoints()
+            
+        first, second = redis.save_many.await_args_list
+        self.assertEqual(set(first.args[0]), {"live", "finished"})
+        self.assertEqual(set(second.args[0]), {"live"})
+        redis.delete_many.assert_awaited_once_with(["finished"])
@@ -0,0 +1,82 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch, AsyncMock, MagicMock
+from arena.domain.arena_manager import ArenaManager
+from arena.domain.player import Player
+from arena.domain.tick_scheduler import TickScheduler
+from arena.enums import ArenaPhase
+
+
+class TestArenaLifecycle(IsolatedAsyncioTestCase):
+    def setUp(self):
+        scheduler = TickScheduler(tick_rate=5)
+        scheduler.register = lambda arena: scheduler._arenas.update({arena.arena_id: arena})
+        patcher = patch.multiple(ArenaManager, _arenas={}, _scheduler=scheduler, _released=0, _reaped=0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.end_event = patch("arena.domain.arena.broadcast_event", new_callable=AsyncMock).start()
+        patch("arena.domain.arena.settings.ARENA_REPLAY_ENABLED", False).start()
+        self.addCleanup(patch.stopall)
+        
+    async def create_arena(self, arena_id, players=2):
+        arena = ArenaManager.get_arena(arena_id)
+        arena.set_messenger(f"group_{arena_id}", AsyncMock())
+        for user_id in range(1, players + 1):
+            await arena.add_player(Player(user_id, arena, arena.get_remaining_team(user_id)))
+        return arena
+
+    async def test_forfeit_releases_arena(self):
+        arena = await self.create_arena("a")
+        
+        await arena.forfeit(1)
+        
+        self.assertNotIn("a", ArenaManager._arenas)
+        self.assertFalse(arena.scheduler.is_registered(arena))
+        self.assertEqual(ArenaManager.get_stats()["released"], 1)
+
+    async def test_last_player_leaving_waiting_arena_releases_it(self):
+        arena = await self.create_arena("a", players=1)
+        
+        await arena.remove_player(arena.left_player)
+        
+        self.assertNotIn("a", ArenaManager._arenas)
+
+    async def test_arena_raising_in_step_is_released(self):
+        broken = await self.create_arena("broken")
+        healthy = await self.create_arena("healthy")
+        broken.recorder = MagicMock()
+        broken.phase = ArenaPhase.PLAYING
+        broken.ball = MagicMock()
+        broken.ball.update_position.side_effect = RuntimeError("boom")
+        scheduler = ArenaManager._scheduler
+        
+        with self.assertLogs("arena.domain.tick_scheduler", level="ERROR"):
+            await scheduler.tick()
+        
+        self.assertNotIn("broken", ArenaManager._arenas)
+        self.assertIs(ArenaManager._arenas["healthy"], healthy)
+        self.assertFalse(scheduler.is_registered(broken))
+        broken.recorder.close.assert_called_once_with(broken)
+
+    async def test_release_ignores_replaced_arena(self):
+        stale = await self.create_arena("a", players=1)
+        ArenaManager.remove_arena("a")
+        current = await self.create_arena("a", players=1)
+        
+        stale.release()
+        
+        self.assertIs(ArenaManager._arenas["a"], current)
+
+    async def test_reaps_only_expired_waiting_arenas(self):
+        waiting = await self.create_arena("waiting", players=1)
+        playing = await self.create_arena("playing")
+        fresh = await self.create_arena("fresh", players=1)
+        waiting.created_at = playing.created_at = fresh.created_at - 301
+        
+        with self.settings_ttl(300):
+            reaped = ArenaManager.reap_arenas(now=fresh.created_at)
+        
+        self.assertEqual(reaped, [waiting])
+        self.assertEqual(ArenaManager.get_stats(), {"live": 2, "waiting": 1, "released": 0, "reaped": 1})
+        
+    def settings_ttl(self, ttl):
+        return patch("arena.domain.arena_manager.settings.ARENA_WAITING_TTL", ttl)
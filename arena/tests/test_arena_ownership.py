@@ -0,0 +1,159 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch, AsyncMock
+from channels.consumer import get_handler_name
+from channels.layers import InMemoryChannelLayer
+from django.test import override_settings
+from arena.domain.arena_manager import ArenaManager
+from arena.domain.remote_arena import RemoteArena
+from arena.domain.tick_scheduler import TickScheduler
+from arena.enums import ArenaPhase, Direction, InputCommand
+from arena.models import BaseMatch
+
+
+class TestArenaOwnership(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.channel_layer = InMemoryChannelLayer()
+        patch("arena.domain.arena_manager.get_channel_layer", return_value=self.channel_layer).start()
+        patch("arena.domain.remote_arena.get_channel_layer", return_value=self.channel_layer).start()
+        patch("arena.domain.arena_manager.ArenaService.broadcast", new_callable=AsyncMock).start()
+        self.redis = patch("arena.domain.arena_manager.ArenaOwnershipRedisService").start()
+        self.redis.release = AsyncMock()
+        checkpoints = patch("arena.domain.arena_manager.ArenaCheckpointRedisService").start()
+        checkpoints.get = AsyncMock(return_value=None)
+        patch("arena.domain.arena.settings.ARENA_REPLAY_ENABLED", False).start()
+        self.addCleanup(patch.stopall)
+        
+        scheduler = TickScheduler(tick_rate=5)
+        scheduler.register = lambda arena: None
+        ArenaManager._arenas = {}
+        ArenaManager._leases = set()
+        ArenaManager._forfeit_timers = {}
+        ArenaManager._scheduler = scheduler
+        ArenaManager._channel_name = "owner"
+        self.addCleanup(setattr, ArenaManager, "_channel_name", None)
+        
+    async def deliver(self):
+        # 소유 워커의 수신 루프가 하는 일을 한 번씩 수행
+        event = await self.channel_layer.receive("owner")
+        await getattr(ArenaManager, get_handler_name(event))(event)
+        
+    async def join(self, user_id, reply_channel):
+        remote = RemoteArena("a", "owner")
+        await remote.join("arena_group_a", user_id, None, reply_channel)
+        await self.deliver()
+        reply = await self.channel_layer.receive(reply_channel)
+        return remote, reply
+
+    async def test_claim_keeps_lease_only_when_owner(self):
+        self.redis.claim = AsyncMock(return_value="owner")
+        owner = await ArenaManager.claim("a")
+        self.redis.claim = AsyncMock(return_value="other")
+        other = await ArenaManager.claim("b")
+        
+        self.assertTrue(ArenaManager.is_local(owner))
+        self.assertFalse(ArenaManager.is_local(other))
+        self.assertEqual(ArenaManager._leases, {"a"})
+
+    async def test_remote_players_drive_owner_arena(self):
+        left, left_reply = await self.join(1, "reply.1")
+        right, right_reply = await self.join(2, "reply.2")
+        _, full_reply = await self.join(3, "reply.3")
+        
+        await right.handle_input(2, InputCommand.PRESS, Direction.UP)
+        await self.deliver()
+        
+        arena = ArenaManager._arenas["a"]
+        self.assertEqual(left_reply, {"type": "arena.joined", "team": BaseMatch.Team.LEFT.value})
+        self.assertEqual(right_reply["team"], BaseMatch.Team.RIGHT.value)
+        self.assertIsNone(full_reply["team"])
+        self.assertEqual(arena.phase, ArenaPhase.COUNTDOWN)
+        self.assertEqual(arena.right_player.direction, Direction.UP)
+
+    async def test_remote_forfeit_ends_and_releases_arena(self):
+        left, _ = await self.join(1, "reply.1")
+        await self.join(2, "reply.2")
+        arena = ArenaManager._arenas["a"]
+        arena.scheduler._arenas[arena.arena_id] = arena
+        
+        with patch("arena.domain.arena.broadcast_event", new_callable=AsyncMock) as end_event:
+            await left.forfeit(1)
+            await self.deliver()
+        await left.leave(1)
+        await self.deliver()
+        
+        self.assertEqual(end_event.await_args.args[2]["winner"], 2)
+        self.assertNotIn("a", ArenaManager._arenas)
+
+    async def test_remote_leave_removes_player(self):
+        left, _ = await self.join(1, "reply.1")
+        arena = ArenaManager._arenas["a"]
+        
+        await left.leave(1)
+        await self.deliver()
+        
+        self.assertIsNone(arena.left_player)
+
+    async def start_match(self):
+        left, _ = await self.join(1, "reply.1")
+        await self.join(2, "reply.2")
+        arena = ArenaManager._arenas["a"]
+        arena.scheduler._arenas[arena.arena_id] = arena
+        return left, arena
+
+    @override_settings(ARENA_FORFEIT_GRACE=60)
+    async def test_rejoin_within_grace_keeps_seat(self):
+        left, arena = await self.start_match()
+        player = arena.left_player
+        
+        await left.leave(1, "left", 7)
+        await self.deliver()
+        timer = ArenaManager._forfeit_timers[("a", 1)]
+        _, reply = await self.join(1, "reply.4")
+        await asyncio.sleep(0)
+        
+        self.assertEqual(reply["team"], BaseMatch.Team.LEFT.value)
+        self.assertIs(arena.left_player, player)
+        self.assertTrue(timer.cancelled())
+        self.assertFalse(arena.is_finished)
+
+    @override_settings(ARENA_FORFEIT_GRACE=0)
+    async def test_forfeit_after_grace_cleans_up(self):
+        left, arena = await self.start_match()
+        allowed = patch("arena.domain.arena_manager.ArenaRedisService").start()
+        allowed.remove_allowed_user = AsyncMock()
+        reception = patch("arena.domain.arena_manager.ReceptionRedisService").start()
+        reception.remove_allowed_user = AsyncMock()
+        reception.remove_user = AsyncMock(return_value=0)
+        remove = patch("arena.domain.arena_manager.ReceptionService.remove", new_callable=AsyncMock).start()
+        
+        with patch("arena.domain.arena.broadcast_event", new_callable=AsyncMock) as end_event:
+            await left.leave(1, "left", 7)
+            await self.deliver()
+            await ArenaManager._forfeit_timers[("a", 1)]
+        
+        self.assertEqual(end_event.await_args.args[2]["winner"], 2)
+        self.assertNotIn("a", ArenaManager._arenas)
+        allowed.remove_allowed_user.assert_awaited_once_with("a", 1)
+        reception.remove_user.assert_awaited_once_with(7, 1)
+        remove.assert_awaited_once_with(7)
+
+    async def test_renew_releases_removed_arenas(self):
+        ArenaManager._arenas = {"a": object()}
+        ArenaManager._leases = {"a", "b"}
+        self.redis.renew = AsyncMock(return_value=False)
+        
+        await ArenaManager.renew_leases()
+        
+        self.redis.release.assert_awaited_once_with("b", "owner")
+        self.assertEqual(ArenaManager._leases, set())
+
+    def test_remote_arena_tracks_phase_from_broadcasts(self):
+        remote = RemoteArena("a", "owner")
+        
+        remote.observe({'type': 'send_to_client', 'message_type': 'start'})
+        started = remote.is_started()
+        remote.observe({'type': 'arena.end', 'message': {}})
+        
+        self.assertTrue(started)
+        self.assertTrue(remote.is_finished)
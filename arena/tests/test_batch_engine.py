@@ -0,0 +1,101 @@
+import importlib.util
+from unittest import IsolatedAsyncioTestCase, skipUnless
+from unittest.mock import patch, AsyncMock
+from arena.domain.arena import Arena
+from arena.domain.player import Player
+from arena.domain.tick_scheduler import TickScheduler
+from arena.enums import ArenaPhase, Direction
+from arena.models import BaseMatch
+
+
+@skipUnless(importlib.util.find_spec("numpy"), "numpy is not installed")
+class TestBatchPhysicsEngine(IsolatedAsyncioTestCase):
+    def setUp(self):
+        patch("arena.domain.arena.settings.ARENA_REPLAY_ENABLED", False).start()
+        self.addCleanup(patch.stopall)
+        
+    async def noop(self, message_type, message):
+        pass
+        
+    async def create_arenas(self, scheduler, count):
+        arenas = []
+        with patch("arena.domain.tick_scheduler.asyncio.create_task", side_effect=lambda coro: coro.close()):
+            for i in range(count):
+                arena = Arena(str(i), scheduler)
+                arena.set_messenger(f"group_{i}", self.noop)
+                await arena.add_player(Player(1, arena, BaseMatch.Team.LEFT))
+                await arena.add_player(Player(2, arena, BaseMatch.Team.RIGHT))
+                arenas.append(arena)
+        return arenas
+    
+    def snapshot(self, arena):
+        return (
+            arena.phase, arena.current_round,
+            arena.left_player.score, arena.right_player.score,
+            arena.ball.x, arena.ball.y,
+            arena.left_player.bar.y, arena.right_player.bar.y,
+        )
+
+    async def test_matches_python_engine(self):
+        from arena.domain.batch_engine import BatchPhysicsEngine
+        
+        python_scheduler = TickScheduler(tick_rate=5)
+        batch_scheduler = TickScheduler(tick_rate=5, engine=BatchPhysicsEngine(capacity=2))
+        python_arenas = await self.create_arenas(python_scheduler, 5)
+        batch_arenas = await self.create_arenas(batch_scheduler, 5)
+        self.assertEqual(batch_scheduler.engine.capacity, 8)
+        
+        finished = patch("arena.domain.arena.broadcast_event", new_callable=AsyncMock)
+        self.addCleanup(finished.stop)
+        end_event = finished.start()
+        
+        for tick in range(400):
+            for i, (python_arena, batch_arena) in enumerate(zip(python_arenas, batch_arenas)):
+                direction = Direction.UP if (tick // (i + 3)) % 2 else Direction.DOWN
+                python_arena.left_player.move(direction)
+                batch_arena.left_player.move(direction)
+            await python_scheduler.tick()
+            await batch_scheduler.tick()
+            
+            for python_arena, batch_arena in zip(python_arenas, batch_arenas):
+                self.assertEqual(self.snapshot(python_arena), self.snapshot(batch_arena))
+        self.assertEqual(end_event.await_count, 10)
+
+    async def test_quiet_arenas_skip_python_step(self):
+        from arena.domain.batch_engine import BatchPhysicsEngine
+        
+        engine = BatchPhysicsEngine()
+        scheduler = TickScheduler(tick_rate=60, engine=engine)
+        arenas = await self.create_arenas(scheduler, 3)
+        
+        # 붙은 직후 틱은 start 메시지와 첫 카운트다운 때문에 모두 돌려받음
+        self.assertEqual(engine.step(), arenas)
+        for arena in arenas:
+            engine.step_arena(arena)
+        self.assertEqual(engine.step(), [])
+        
+        self.assertEqual(arenas[0].current_tick, 2)
+        self.assertEqual(int(engine.countdown[0]), 3 * 60 - 2)
+        arenas[0].left_player.press(Direction.UP)
+        self.assertEqual(arenas[0].left_player.direction, Direction.UP)
+        self.assertEqual(int(engine.direction[0, 0]), -1)
+
+    async def test_detach_keeps_last_state_and_frees_slot(self):
+        from arena.domain.batch_engine import BatchPhysicsEngine
+        
+        scheduler = TickScheduler(tick_rate=5, engine=BatchPhysicsEngine())
+        first, second = await self.create_arenas(scheduler, 2)
+        first.phase = ArenaPhase.PLAYING
+        scheduler.engine.record(0.5, scheduler.period)
+        scheduler.engine.step()
+        x = first.ball.x
+        
+        scheduler.unregister(first)
+        third, = await self.create_arenas(scheduler, 1)
+        
+        self.assertFalse(first.ball.is_bound)
+        self.assertEqual(first.ball.x, x)
+        self.assertEqual(first.current_tick, 1)
+        self.assertEqual(first.telemetry.overruns, 1)
+        self.assertEqual(third.ball._slot, 0)
+        self.assertEqual(scheduler.engine.size, 2)
@@ -0,0 +1,19 @@
+from types import SimpleNamespace
+from unittest import TestCase
+from unittest.mock import patch, AsyncMock
+from arena.dto import BaseMatchDTO
+
+
+class TestMatchDTOBatching(TestCase):
+    def test_from_matches_resolves_users_once(self):
+        matches = [
+            SimpleNamespace(id=i, reception_id=1, left_player=1, right_player=2, winner=1,
+                            left_player_score=2, right_player_score=0, created_at=None)
+            for i in range(3)
+        ]
+        users = {1: {"id": 1}, 2: {"id": 2}}
+        with patch("arena.dto.UserRedisService.get_many_exclude_email", new=AsyncMock(return_value=users)) as get_many:
+            dtos = BaseMatchDTO.from_matches(matches, "token")
+
+        get_many.assert_awaited_once()
+        self.assertEqual([dto.to_dict()["winner"] for dto in dtos], [{"id": 1}] * 3)
@@ -0,0 +1,84 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch, MagicMock
+from arena.consumers import ArenaConsumer
+from django.test import SimpleTestCase
+from arena.domain.arena import Arena
+from arena.domain.player import Player
+from arena.domain.tick_scheduler import TickScheduler
+from arena.enums import ArenaPhase, Direction, InputCommand
+from arena.models import BaseMatch
+from config.rate_limit import TokenBucket
+
+
+class TestHeldKeyInput(SimpleTestCase):
+    def setUp(self):
+        self.arena = Arena("a", TickScheduler(tick_rate=5))
+        self.arena.left_player = Player(1, self.arena, BaseMatch.Team.LEFT)
+        self.arena.right_player = Player(2, self.arena, BaseMatch.Team.RIGHT)
+        self.arena.phase = ArenaPhase.PLAYING
+        self.player = self.arena.left_player
+        self.start_y = self.player.bar.y
+        
+    def test_held_direction_moves_once_per_tick(self):
+        self.player.press(Direction.DOWN)
+        for _ in range(3):
+            self.arena.step()
+        
+        self.player.release(Direction.DOWN)
+        self.arena.step()
+        
+        self.assertEqual(self.player.bar.y, self.start_y + 3 * self.player.bar.step)
+
+    def test_inputs_between_ticks_are_coalesced(self):
+        for _ in range(10):
+            self.player.tap(Direction.UP)
+        self.player.press(Direction.UP)
+        self.player.release(Direction.UP)
+        
+        self.arena.step()
+        self.arena.step()
+        
+        self.assertEqual(self.player.bar.y, self.start_y - self.player.bar.step)
+        
+    def test_release_of_other_direction_keeps_held_key(self):
+        self.player.press(Direction.UP)
+        self.player.release(Direction.DOWN)
+        
+        self.assertEqual(self.player.direction, Direction.UP)
+
+
+class TestTokenBucket(SimpleTestCase):
+    def test_limits_burst_and_refills(self):
+        clock = [100.0]
+        with patch("config.rate_limit.time.monotonic", side_effect=lambda: clock[0]):
+            bucket = TokenBucket(rate=10, capacity=3)
+            self.assertEqual([bucket.consume() for _ in range(4)], [True, True, True, False])
+            
+            clock[0] += 0.25
+            self.assertEqual([bucket.consume() for _ in range(3)], [True, True, False])
+
+
+
+class TestInputLimiter(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.consumer = ArenaConsumer()
+        self.consumer.arena = MagicMock()
+        self.consumer.player = MagicMock()
+        self.consumer.input_limiter = TokenBucket(rate=0, capacity=1)
+        self.consumer.keyframe_limiter = TokenBucket(rate=0, capacity=1)
+        
+    async def test_release_bypasses_exhausted_bucket(self):
+        await self.consumer.apply_input(InputCommand.PRESS, Direction.UP)
+        await self.consumer.apply_input(InputCommand.PRESS, Direction.UP)
+        await self.consumer.apply_input(InputCommand.RELEASE)
+        
+        commands = [call.args[1] for call in self.consumer.arena.handle_input.call_args_list]
+        self.assertEqual(commands, [InputCommand.PRESS, InputCommand.RELEASE])
+        
+    async def test_keyframe_requests_are_coalesced_separately(self):
+        await self.consumer.apply_input(InputCommand.PRESS, Direction.UP)
+        await self.consumer.apply_input(InputCommand.KEYFRAME)
+        await self.consumer.apply_input(InputCommand.KEYFRAME)
+        
+        commands = [call.args[1] for call in self.consumer.arena.handle_input.call_args_list]
+        self.assertEqual(commands, [InputCommand.PRESS, InputCommand.KEYFRAME])
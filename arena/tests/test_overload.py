@@ -0,0 +1,105 @@
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch, AsyncMock
+from arena.domain.arena_manager import ArenaManager
+from arena.domain.overload import OverloadController
+from arena.domain.player import Player
+from arena.domain.tick_scheduler import TickScheduler
+from arena.models import BaseMatch
+
+
+class TestOverloadController(TestCase):
+    def setUp(self):
+        self.controller = OverloadController(tick_rate=10, threshold=0.02, max_level=2, recover_seconds=1, smoothing=1.0)
+
+    def test_enters_first_level_immediately(self):
+        self.assertTrue(self.controller.record(0.05))
+        self.assertTrue(self.controller.is_overloaded)
+        self.assertEqual(self.controller.snapshot_scale, 2)
+
+    def test_escalates_only_after_lag_persists(self):
+        self.controller.record(0.05)
+        for _ in range(9):
+            self.controller.record(0.05)
+        self.assertEqual(self.controller.level, 1)
+
+        self.controller.record(0.05)
+        self.assertEqual(self.controller.level, 2)
+        for _ in range(30):
+            self.controller.record(0.05)
+        self.assertEqual(self.controller.level, 2)
+
+    def test_recovers_one_level_at_a_time(self):
+        for _ in range(11):
+            self.controller.record(0.05)
+        for _ in range(10):
+            self.controller.record(0.0)
+        self.assertEqual(self.controller.level, 1)
+        for _ in range(10):
+            self.controller.record(0.0)
+        self.assertEqual(self.controller.level, 0)
+
+    def test_lag_between_thresholds_holds_level(self):
+        self.controller.record(0.05)
+        for _ in range(50):
+            self.controller.record(0.015)
+        self.assertEqual(self.controller.level, 1)
+
+
+class TestOverloadedArena(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.scheduler = TickScheduler(tick_rate=60)
+        self.scheduler.register = lambda arena: self.scheduler._arenas.update({arena.arena_id: arena})
+        patcher = patch.multiple(ArenaManager, _arenas={}, _leases=set(), _scheduler=self.scheduler, _channel_name="owner")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.redis = patch("arena.domain.arena_manager.ArenaOwnershipRedisService").start()
+        self.addCleanup(patch.stopall)
+        self.scheduler.overload.level = 1
+
+    async def test_waiting_notice_is_skipped(self):
+        arena = ArenaManager.get_arena("a")
+        broadcast = AsyncMock()
+        arena.set_messenger("group_a", broadcast)
+
+        await arena.add_player(Player(1, arena, BaseMatch.Team.LEFT))
+
+        broadcast.assert_not_called()
+
+    async def test_snapshot_interval_is_scaled(self):
+        arena = ArenaManager.get_arena("a")
+        arena.set_messenger("group_a", AsyncMock())
+        await arena.add_player(Player(1, arena, BaseMatch.Team.LEFT))
+        await arena.add_player(Player(2, arena, BaseMatch.Team.RIGHT))
+        arena.countdown_ticks = 1
+        arena.step()
+        arena._outbox.clear()
+
+        for _ in range(arena.snapshot_interval * 4):
+            arena.step()
+
+        states = [message for message_type, message in arena._outbox if message_type == 'state']
+        self.assertEqual(len(states), 2)
+
+    async def test_new_arena_is_refused(self):
+        self.redis.get_owner = AsyncMock(return_value=None)
+        self.redis.claim = AsyncMock(return_value="owner")
+
+        owner = await ArenaManager.claim("new")
+
+        self.assertIsNone(owner)
+        self.redis.claim.assert_not_called()
+
+    async def test_existing_arena_keeps_its_owner(self):
+        ArenaManager.get_arena("a")
+        self.redis.claim = AsyncMock(return_value="owner")
+
+        owner = await ArenaManager.claim("a")
+
+        self.assertEqual(owner, "owner")
+
+    async def test_scheduler_resets_when_it_stops(self):
+        self.scheduler._arenas.clear()
+
+        await self.scheduler._run()
+
+        self.assertFalse(self.scheduler.overload.is_overloaded)
@@ -0,0 +1,66 @@
+import json
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch, AsyncMock
+from django.test import SimpleTestCase
+from arena.consumers import SpectatorConsumer
+from arena.services import ArenaService
+from arena.enums import Direction
+from arena.protocol import (
+    encode_state_frame, decode_state_frame, decode_input_frame,
+    STATE_HEADER, INPUT_DIRECTIONS, INPUT_UP,
+)
+
+
+class TestBinaryProtocol(SimpleTestCase):
+    def test_keyframe_round_trip(self):
+        message = {
+            "tick": 42,
+            "keyframe": True,
+            "ball": {"x": 69.0, "y": 38.5},
+            "left_player_bar": {"x": 4.0, "y": 38.0},
+            "right_player_bar": {"x": 134.0, "y": 30.0},
+        }
+        
+        frame = encode_state_frame(message)
+        
+        self.assertEqual(len(frame), STATE_HEADER.size + 6 * 4)
+        self.assertEqual(decode_state_frame(frame), message)
+
+    def test_delta_only_packs_present_fields(self):
+        message = {"tick": 43, "keyframe": False, "base": 42, "ball": {"x": 72.0}}
+        
+        frame = encode_state_frame(message)
+        
+        self.assertEqual(len(frame), STATE_HEADER.size + 4)
+        self.assertEqual(decode_state_frame(frame), message)
+
+    def test_input_frame_is_one_byte(self):
+        self.assertEqual(INPUT_DIRECTIONS[decode_input_frame(bytes([INPUT_UP]))], Direction.UP)
+        with self.assertRaises(ValueError):
+            decode_input_frame(b"\x01\x02")
+
+
+class TestStateBroadcast(IsolatedAsyncioTestCase):
+    message = {"tick": 3, "ball": {"x": 1.0, "y": 2.0}}
+    
+    async def test_remote_event_carries_only_message(self):
+        with patch("arena.services.LocalFanout.group_send", new_callable=AsyncMock) as group_send:
+            await ArenaService.broadcast("arena_group_a", "state", self.message)
+        
+        _, event, remote_event = group_send.await_args.args
+        self.assertEqual(event['bytes'], encode_state_frame(self.message))
+        self.assertEqual(remote_event, {'type': 'send_to_client', 'message_type': 'state', 'message': self.message})
+        
+    async def test_remote_state_is_encoded_on_receipt(self):
+        event = {'type': 'send_to_client', 'message_type': 'state', 'message': self.message}
+        consumer = SpectatorConsumer()
+        consumer.send = AsyncMock()
+        
+        consumer.binary = True
+        await consumer.send_to_client(event)
+        consumer.binary = False
+        await consumer.send_to_client(event)
+        
+        first, second = consumer.send.await_args_list
+        self.assertEqual(first.kwargs, {'bytes_data': encode_state_frame(self.message)})
+        self.assertEqual(json.loads(second.kwargs['text_data']), {'type': 'state', 'message': self.message})
@@ -0,0 +1,132 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch, AsyncMock
+from arena.domain.arena import Arena
+from arena.domain.player import Player
+from arena.domain.replay import Replay
+from arena.domain.replay_player import ReplayPlayer
+from arena.domain.tick_scheduler import TickScheduler
+from arena.enums import Direction, InputCommand
+from arena.models import BaseMatch
+
+
+def positions(arena):
+    return (
+        arena.ball.x, arena.ball.y, arena.ball.vx, arena.ball.vy,
+        arena.left_player.bar.y, arena.right_player.bar.y,
+        arena.left_player.score, arena.right_player.score,
+    )
+
+
+class TestReplay(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.stored = bytearray()
+        storage = patch("arena.domain.replay.ArenaReplayRedisService").start()
+        storage.append = AsyncMock(side_effect=self.append)
+        storage.get = AsyncMock(side_effect=lambda arena_id: bytes(self.stored))
+        storage.delete = AsyncMock()
+        self.storage = storage
+        self.save_replay = patch("arena.domain.replay.ArenaService.save_replay").start()
+        patch("arena.domain.arena.broadcast_event", new_callable=AsyncMock).start()
+        self.addCleanup(patch.stopall)
+        
+        scheduler = TickScheduler(tick_rate=30)
+        scheduler.register = lambda arena: None
+        with patch("arena.domain.arena.settings.ARENA_REPLAY_ENABLED", True), \
+                patch("arena.domain.arena.settings.ARENA_REPLAY_KEYFRAME_INTERVAL", 30):
+            self.arena = Arena("a", scheduler)
+        self.arena.set_messenger("group_a", AsyncMock())
+        await self.arena.add_player(Player(1, self.arena, BaseMatch.Team.LEFT))
+        await self.arena.add_player(Player(2, self.arena, BaseMatch.Team.RIGHT))
+        
+    async def append(self, arena_id, header, data, ttl):
+        # Redis의 SET NX + APPEND와 같은 동작
+        if not self.stored:
+            self.stored += header
+        self.stored += data
+        
+    async def load(self):
+        await self.arena.recorder.drain()
+        return Replay.parse(bytes(self.stored))
+        
+    async def play_match(self):
+        # 왼쪽은 공을 따라가고 오른쪽은 가끔 탭 입력
+        history = {}
+        left, right = self.arena.left_player, self.arena.right_player
+        while not self.arena.is_finished and self.arena.current_tick < 20000:
+            self.arena.step()
+            history[self.arena.current_tick] = positions(self.arena)
+            offset = self.arena.ball.y - left.bar.y
+            direction = Direction.DOWN if offset > 1 else Direction.UP if offset < -1 else None
+            if direction != left.direction:
+                command = InputCommand.PRESS if direction else InputCommand.RELEASE
+                self.arena.handle_input(left, command, direction)
+            if self.arena.current_tick % 45 == 0:
+                self.arena.handle_input(right, InputCommand.TAP, Direction.UP)
+            self.arena._outbox.clear()
+        await self.arena.end_game()
+        return history
+
+    async def test_replay_reproduces_match(self):
+        history = await self.play_match()
+        
+        replay = await self.load()
+        player = ReplayPlayer(replay)
+        replayed = {}
+        while not player.is_finished:
+            player.advance(1)
+            replayed[player.tick] = positions(player.arena)
+        
+        self.assertTrue(self.arena.is_finished)
+        self.assertEqual(replayed, {t: p for t, p in history.items() if t > 0})
+        self.assertEqual(player.get_result()["winner"], self.arena.check_winner().user_id)
+
+    async def test_seek_matches_recorded_state(self):
+        history = await self.play_match()
+        player = ReplayPlayer(await self.load())
+        
+        for tick in (1, 29, 30, 31, 100, max(history) - 1):
+            player.seek(tick)
+            self.assertEqual(positions(player.arena), history[tick], tick)
+
+    async def test_finished_match_is_saved_to_the_database(self):
+        await self.play_match()
+        await self.arena.recorder.drain()
+        
+        self.save_replay.assert_called_once_with("a", bytes(self.stored))
+        self.storage.delete.assert_awaited_once_with("a")
+        
+    async def test_truncated_file_keeps_complete_records(self):
+        await self.play_match()
+        await self.arena.recorder.drain()
+        
+        replay = Replay.parse(bytes(self.stored[:-5]))
+        
+        self.assertIsNone(replay.end)
+        self.assertGreater(len(replay.keyframes), 1)
+
+        
+    async def test_ticks_only_buffer_until_keyframe(self):
+        left = self.arena.left_player
+        await self.arena.recorder.drain()
+        writes = len(self.stored)
+        
+        for tick in range(29):
+            self.arena.step()
+            self.arena.handle_input(left, InputCommand.TAP, Direction.UP)
+        await self.arena.recorder.drain()
+        self.assertEqual(len(self.stored), writes)
+        
+        self.arena.step()
+        await self.arena.recorder.drain()
+        self.assertGreater(len(self.stored), writes)
+
+    async def test_release_closes_unfinished_recording(self):
+        for _ in range(10):
+            self.arena.step()
+        
+        self.arena.release()
+        replay = await self.load()
+        
+        self.assertIsNone(replay.end)
+        self.assertFalse(self.arena.recorder.is_keyframe_due(30))
+        self.save_replay.assert_not_called()
@@ -0,0 +1,47 @@
+import importlib.util
+from django.test import SimpleTestCase
+from arena.domain.simulation import HeadlessSimulation, RandomBot, ScriptedBot
+from arena.enums import Direction
+
+
+class TestHeadlessSimulation(SimpleTestCase):
+    def test_idle_match_runs_to_the_end(self):
+        report = HeadlessSimulation(tick_rate=5).run()
+        
+        self.assertEqual(report["finished"], 1)
+        result = report["results"][0]
+        self.assertEqual(max(result["left_player_score"], result["right_player_score"]), 2)
+        self.assertEqual(result["ticks"], report["ticks"])
+        self.assertGreater(report["messages"], 0)
+
+    def test_same_seed_gives_same_scores(self):
+        def run():
+            return HeadlessSimulation(RandomBot(7), RandomBot(8), matches=3, tick_rate=5).run()["results"]
+        
+        self.assertEqual(run(), run())
+
+    def test_scripted_inputs_are_applied_on_their_tick(self):
+        arena_start = 3 * 5 + 1
+        simulation = HeadlessSimulation(
+            ScriptedBot({1: Direction.UP, arena_start: Direction.UP, arena_start + 1: Direction.UP}),
+            tick_rate=5,
+            max_ticks=arena_start + 2,
+        )
+        arena = simulation.arenas[0]
+        start_y = arena.left_player.bar.y
+        
+        simulation.run()
+        
+        self.assertEqual(arena.left_player.bar.y, start_y - 2 * arena.left_player.bar.step)
+        
+    def test_batch_engine_matches_python_engine(self):
+        if not importlib.util.find_spec("numpy"):
+            self.skipTest("numpy is not installed")
+        from arena.domain.batch_engine import BatchPhysicsEngine
+        
+        python_report = HeadlessSimulation(RandomBot(1), RandomBot(2), matches=4, tick_rate=5).run()
+        batch_report = HeadlessSimulation(
+            RandomBot(1), RandomBot(2), matches=4, tick_rate=5, engine=BatchPhysicsEngine()
+        ).run()
+        
+        self.assertEqual(python_report["results"], batch_report["results"])
@@ -0,0 +1,77 @@
+from django.test import SimpleTestCase
+from arena.domain.snapshot import SnapshotEncoder, SnapshotThrottle
+
+
+def make_state(tick, ball_x, left_y=38):
+    return {
+        "tick": tick,
+        "ball": {"x": ball_x, "y": 38},
+        "left_player_bar": {"x": 4, "y": left_y},
+        "right_player_bar": {"x": 134, "y": 38},
+    }
+
+
+class TestSnapshotEncoder(SimpleTestCase):
+    def setUp(self):
+        self.encoder = SnapshotEncoder(keyframe_interval=3)
+
+    def test_first_snapshot_is_keyframe(self):
+        message = self.encoder.encode(make_state(1, 69))
+        
+        self.assertTrue(message["keyframe"])
+        self.assertEqual(message["right_player_bar"], {"x": 134, "y": 38})
+
+    def test_delta_contains_only_changed_fields(self):
+        self.encoder.encode(make_state(1, 69))
+        
+        message = self.encoder.encode(make_state(2, 72, left_y=37))
+        
+        self.assertEqual(message, {
+            "tick": 2,
+            "keyframe": False,
+            "base": 1,
+            "ball": {"x": 72},
+            "left_player_bar": {"y": 37},
+        })
+
+    def test_keyframe_every_interval_and_on_request(self):
+        keyframes = []
+        for tick in range(1, 8):
+            if tick == 5:
+                self.encoder.request_keyframe()
+            keyframes.append(self.encoder.encode(make_state(tick, 69 + tick))["keyframe"])
+        
+        self.assertEqual(keyframes, [True, False, False, True, True, False, False])
+
+
+
+class TestSnapshotThrottle(SimpleTestCase):
+    def setUp(self):
+        self.encoder = SnapshotEncoder(keyframe_interval=10)
+        self.throttle = SnapshotThrottle(every=2)
+
+    def test_skipped_deltas_are_merged(self):
+        self.encoder.encode(make_state(1, 69))
+        
+        skipped = self.throttle.push(self.encoder.encode(make_state(2, 72, left_y=37)))
+        message = self.throttle.push(self.encoder.encode(make_state(3, 75, left_y=37)))
+        
+        self.assertIsNone(skipped)
+        self.assertEqual(message, {
+            "tick": 3,
+            "keyframe": False,
+            "base": 1,
+            "ball": {"x": 75},
+            "left_player_bar": {"y": 37},
+        })
+
+    def test_merge_with_keyframe_becomes_keyframe(self):
+        self.encoder.encode(make_state(1, 69))
+        self.throttle.push(self.encoder.encode(make_state(2, 72)))
+        self.encoder.request_keyframe()
+        
+        message = self.throttle.push(self.encoder.encode(make_state(3, 75)))
+        
+        self.assertTrue(message["keyframe"])
+        self.assertNotIn("base", message)
+        self.assertEqual(message["right_player_bar"], {"x": 134, "y": 38})
@@ -0,0 +1,107 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch, AsyncMock
+from arena.domain.arena import Arena
+from arena.domain.player import Player
+from arena.domain.spectator_feed import MAX_PENDING_EVENTS
+from arena.domain.tick_scheduler import TickScheduler
+from arena.enums import ArenaPhase
+from arena.models import BaseMatch
+
+
+class TestSpectatorFeed(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.broadcast = patch("arena.domain.spectator_feed.ArenaService.broadcast", new_callable=AsyncMock).start()
+        self.cache = patch("arena.domain.spectator_feed.ArenaSpectatorRedisService").start()
+        self.cache.set_latest = AsyncMock()
+        patch("arena.domain.arena.settings.ARENA_REPLAY_ENABLED", False).start()
+        self.addCleanup(patch.stopall)
+        
+        scheduler = TickScheduler(tick_rate=60)
+        with patch.object(scheduler, "register"), \
+                patch("arena.domain.spectator_feed.settings.ARENA_SPECTATOR_RATE", 5):
+            self.arena = Arena("a", scheduler)
+            self.arena.set_messenger("group_a", AsyncMock())
+            await self.arena.add_player(Player(1, self.arena, BaseMatch.Team.LEFT))
+            await self.arena.add_player(Player(2, self.arena, BaseMatch.Team.RIGHT))
+        
+    async def run_ticks(self, count):
+        for _ in range(count):
+            self.arena.step()
+            await self.arena.flush()
+            await asyncio.sleep(0)
+            
+    def spectator_messages(self, message_type):
+        return [c.args[2] for c in self.broadcast.await_args_list if c.args[1] == message_type]
+
+    async def test_unwatched_arena_sends_nothing(self):
+        await self.run_ticks(10)
+        
+        self.broadcast.assert_not_awaited()
+        self.cache.set_latest.assert_not_awaited()
+
+    async def test_watched_arena_sends_low_rate_keyframes_and_events(self):
+        self.arena.watch()
+        self.arena.phase = ArenaPhase.PLAYING
+        await self.run_ticks(60)
+        
+        states = self.spectator_messages('state')
+        self.assertEqual(len(states), 1 + 60 // self.arena.spectator_feed.interval)
+        self.assertTrue(all(state["keyframe"] for state in states))
+        self.assertEqual(states[-1]["ball"], {"x": self.arena.ball.x, "y": self.arena.ball.y})
+        self.assertEqual(self.spectator_messages('start'), ['Arena is starting!'])
+        self.assertEqual(self.cache.set_latest.await_args.args[1], states[-1])
+        self.assertEqual({c.args[0] for c in self.broadcast.await_args_list}, {"arena_spectators_a"})
+
+    async def test_slow_fanout_keeps_only_latest_state(self):
+        release = asyncio.Event()
+        
+        async def slow_set_latest(*args):
+            await release.wait()
+        self.cache.set_latest = AsyncMock(side_effect=slow_set_latest)
+        self.arena.watch()
+        self.arena.phase = ArenaPhase.PLAYING
+        
+        await self.run_ticks(36)
+        release.set()
+        await self.arena.spectator_feed._task
+        await self.run_ticks(1)
+        await self.arena.spectator_feed._task
+        
+        states = self.spectator_messages('state')
+        self.assertEqual(len(states), 2)
+        self.assertEqual(states[-1]["tick"], 36)
+
+
+    async def test_last_spectator_leaving_stops_feed(self):
+        self.arena.watch()
+        self.arena.watch()
+        self.arena.phase = ArenaPhase.PLAYING
+        await self.run_ticks(12)
+        self.arena.unwatch()
+        self.assertTrue(self.arena.spectator_feed.active)
+        
+        self.arena.unwatch()
+        sent = self.broadcast.await_count
+        await self.run_ticks(24)
+        
+        self.assertFalse(self.arena.spectator_feed.active)
+        self.assertEqual(self.broadcast.await_count, sent)
+
+    async def test_pending_events_are_capped_during_slow_send(self):
+        release = asyncio.Event()
+        
+        async def slow_set_latest(*args):
+            await release.wait()
+        self.cache.set_latest = AsyncMock(side_effect=slow_set_latest)
+        self.arena.watch()
+        await asyncio.sleep(0)
+        feed = self.arena.spectator_feed
+        
+        for round_number in range(100):
+            feed.forward('round.over', round_number)
+        feed.forward('arena.end', {})
+        
+        self.assertEqual(len(feed._events), MAX_PENDING_EVENTS)
+        self.assertEqual(feed._events[-1], ('arena.end', {}))
+        release.set()
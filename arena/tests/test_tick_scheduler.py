@@ -0,0 +1,135 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch, AsyncMock
+from arena.domain.arena import Arena
+from arena.domain.player import Player
+from arena.domain.tick_scheduler import TickScheduler
+from arena.enums import ArenaPhase
+from arena.models import BaseMatch
+
+
+class TestTickScheduler(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.scheduler = TickScheduler(tick_rate=5)
+        self.messages = []
+        patch("arena.domain.arena.settings.ARENA_REPLAY_ENABLED", False).start()
+        self.addCleanup(patch.stopall)
+        
+    async def record(self, message_type, message):
+        self.messages.append((message_type, message))
+        
+    async def create_arena(self, arena_id):
+        arena = Arena(arena_id, self.scheduler)
+        arena.set_messenger(f"group_{arena_id}", self.record)
+        await arena.add_player(Player(1, arena, BaseMatch.Team.LEFT))
+        await arena.add_player(Player(2, arena, BaseMatch.Team.RIGHT))
+        return arena
+
+    async def test_countdown_is_driven_by_ticks(self):
+        with patch.object(self.scheduler, "register"):
+            arena = await self.create_arena("a")
+        
+        for _ in range(arena.countdown_seconds * self.scheduler.tick_rate):
+            self.assertEqual(arena.phase, ArenaPhase.COUNTDOWN)
+            arena.step()
+        await arena.flush()
+        
+        self.assertEqual(arena.phase, ArenaPhase.PLAYING)
+        countdowns = [m for t, m in self.messages if t == 'countdown']
+        self.assertEqual(countdowns, [3, 2, 1])
+
+    async def test_single_pass_steps_every_arena(self):
+        with patch.object(self.scheduler, "register"):
+            arenas = [await self.create_arena(str(i)) for i in range(3)]
+        for arena in arenas:
+            self.scheduler._arenas[arena.arena_id] = arena
+            arena.phase = ArenaPhase.PLAYING
+        
+        await self.scheduler.tick()
+        
+        states = [t for t, _ in self.messages if t == 'state']
+        self.assertEqual(len(states), 3)
+        for arena in arenas:
+            self.assertNotEqual(arena.ball.x, arena.width // 2)
+
+    async def test_state_is_sent_every_snapshot_interval(self):
+        self.scheduler = TickScheduler(tick_rate=60)
+        with patch.object(self.scheduler, "register"), self.settings_snapshot_rate(20):
+            arena = await self.create_arena("a")
+        arena.phase = ArenaPhase.PLAYING
+        
+        for _ in range(6):
+            arena.step()
+        await arena.flush()
+        
+        self.assertEqual(arena.snapshot_interval, 3)
+        ticks = [m["tick"] for t, m in self.messages if t == 'state']
+        self.assertEqual(ticks, [3, 6])
+        
+    def settings_snapshot_rate(self, rate):
+        return patch("arena.domain.arena.settings.ARENA_SNAPSHOT_RATE", rate)
+
+    async def test_finished_arena_is_unregistered_once(self):
+        with patch.object(self.scheduler, "register"):
+            arena = await self.create_arena("a")
+        self.scheduler._arenas[arena.arena_id] = arena
+        arena.phase = ArenaPhase.PLAYING
+        arena.left_player.score = arena.max_score - 1
+        arena.ball.x = arena.width - arena.ball.radius
+        arena.ball.vx = arena.ball.vy = 0
+        
+        with patch("arena.domain.arena.broadcast_event", new_callable=AsyncMock) as end_event:
+            await self.scheduler.tick()
+            await arena.forfeit(2)
+        
+        self.assertTrue(arena.is_finished)
+        self.assertFalse(self.scheduler.is_registered(arena))
+        end_event.assert_awaited_once()
+        self.assertEqual(end_event.await_args.args[2]["winner"], 1)
+
+
+class TestFixedTimestep(IsolatedAsyncioTestCase):
+    async def test_catches_up_with_cap_and_drops_the_rest(self):
+        scheduler = TickScheduler(tick_rate=10, max_catchup_ticks=3)
+        arena = Arena("a", scheduler)
+        scheduler._arenas[arena.arena_id] = arena
+        clock = [0.0]
+        lags = []
+        
+        async def fake_tick(lag=0.0):
+            lags.append(lag)
+            scheduler.telemetry.record(lag, scheduler.period)
+            if len(lags) == 1:
+                clock[0] += 0.35
+            if len(lags) == 4:
+                scheduler._arenas.clear()
+                
+        async def fake_sleep(delay):
+            clock[0] += max(delay, 0)
+            
+        with patch("arena.domain.tick_scheduler.time.monotonic", side_effect=lambda: clock[0]), \
+             patch("arena.domain.tick_scheduler.asyncio.sleep", side_effect=fake_sleep), \
+             patch.object(scheduler, "tick", side_effect=fake_tick):
+            await scheduler._run()
+        
+        self.assertEqual(len(lags), 4)
+        self.assertAlmostEqual(lags[1], 0.25)
+        self.assertAlmostEqual(lags[2], 0.15)
+        self.assertAlmostEqual(lags[3], 0.0)
+        self.assertEqual(scheduler.telemetry.overruns, 2)
+        self.assertEqual(scheduler.telemetry.dropped_ticks, 1)
+        self.assertEqual(arena.telemetry.dropped_ticks, 1)
+        self.assertIsNone(scheduler._task)
+
+    async def test_state_is_tagged_with_tick(self):
+        scheduler = TickScheduler(tick_rate=5)
+        arena = Arena("a", scheduler)
+        arena.left_player = Player(1, arena, BaseMatch.Team.LEFT)
+        arena.right_player = Player(2, arena, BaseMatch.Team.RIGHT)
+        arena.phase = ArenaPhase.PLAYING
+        scheduler._arenas[arena.arena_id] = arena
+        
+        arena.step()
+        arena.step()
+        
+        self.assertEqual(arena.get_state()["tick"], 2)
+        self.assertEqual(arena._outbox[-1][1]["tick"], 2)
@@ -0,0 +1,70 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch
+from arena.domain.arena import Arena
+from arena.domain.player import Player
+from arena.domain.tick_scheduler import TickScheduler
+from arena.enums import ArenaPhase, Direction
+from arena.models import BaseMatch
+
+
+class TestTrajectoryBroadcast(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        scheduler = TickScheduler(tick_rate=60)
+        self.messages = []
+        with patch.object(scheduler, "register"), \
+                patch("arena.domain.arena.settings.ARENA_BROADCAST_MODE", "trajectory"), \
+                patch("arena.domain.arena.settings.ARENA_REPLAY_ENABLED", False):
+            self.arena = Arena("a", scheduler)
+            self.arena.set_messenger("group_a", self.record)
+            await self.arena.add_player(Player(1, self.arena, BaseMatch.Team.LEFT))
+            await self.arena.add_player(Player(2, self.arena, BaseMatch.Team.RIGHT))
+        self.arena.phase = ArenaPhase.PLAYING
+        self.arena._outbox.clear()
+        
+    async def record(self, message_type, message):
+        self.messages.append((message_type, message))
+        
+    async def run_ticks(self, count):
+        self.messages.clear()
+        for _ in range(count):
+            self.arena.step()
+        await self.arena.flush()
+        return [m for t, m in self.messages if t == 'trajectory']
+
+    async def test_straight_path_is_sent_once(self):
+        trajectories = await self.run_ticks(10)
+        
+        self.assertEqual(len(trajectories), 1)
+        self.assertTrue(trajectories[0]["keyframe"])
+        self.assertNotIn("state", [t for t, _ in self.messages])
+
+    async def test_wall_bounce_sends_new_segment_that_extrapolates(self):
+        ball = self.arena.ball
+        ball.y = ball.radius + abs(ball.vy) * 3
+        ball.vy = -abs(ball.vy)
+        
+        trajectories = await self.run_ticks(10)
+        
+        self.assertEqual(len(trajectories), 2)
+        segment = trajectories[-1]["ball"]
+        elapsed = self.arena.current_tick - trajectories[-1]["tick"]
+        self.assertGreater(segment["vy"], 0)
+        self.assertAlmostEqual(segment["x"] + segment["vx"] * elapsed, ball.x)
+        self.assertAlmostEqual(segment["y"] + segment["vy"] * elapsed, ball.y)
+
+    async def test_paddle_is_sent_only_when_input_changes(self):
+        await self.run_ticks(1)
+        player = self.arena.left_player
+        
+        player.press(Direction.UP)
+        pressed = await self.run_ticks(5)
+        player.release()
+        released = await self.run_ticks(5)
+        
+        pressed_bars = [m["left_player_bar"] for m in pressed if "left_player_bar" in m]
+        released_bars = [m["left_player_bar"] for m in released if "left_player_bar" in m]
+        self.assertEqual(len(pressed_bars), 1)
+        self.assertAlmostEqual(pressed_bars[0]["vy"], -player.bar.step)
+        self.assertEqual(len(released_bars), 1)
+        self.assertEqual(released_bars[0]["vy"], 0)
+        self.assertEqual(released_bars[0]["y"], player.bar.y)
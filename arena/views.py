@@ -15,6 +15,6 @@ class MatchHistoryView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
         matches = ArenaService.get_user_matches(user_id)
-        match_dtos = [BaseMatchDTO(match, request.token).to_dict() for match in matches]
+        match_dtos = [dto.to_dict() for dto in BaseMatchDTO.from_matches(matches, request.token)]
         serializer = NormalMatchSerializer(match_dtos, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
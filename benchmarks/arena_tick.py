@@ -0,0 +1,98 @@
+# 아레나 수에 따른 초당 틱 처리량과 아레나 1개당 메모리 측정
+# 사용법: python benchmarks/arena_tick.py [arena 수] [틱 수]
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for key, value in (
+    ("SECRET_KEY", "benchmark"),
+    ("USER_SERVICE_URL", "http://localhost/"),
+    ("REDIS_HOST", "localhost"),
+    ("REDIS_PORT", "6379"),
+    ("REDIS_DB", "0"),
+    ("REDIS_CAPACITY", "100"),
+):
+    os.environ.setdefault(key, value)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+django.setup()
+
+from arena.domain.arena import Arena
+from arena.domain.player import Player
+from arena.domain.tick_scheduler import TickScheduler
+from arena.enums import ArenaPhase
+from arena.models import BaseMatch
+
+
+async def discard(message_type, message):
+    pass
+
+
+def create_arenas(scheduler, count):
+    arenas = []
+    for i in range(count):
+        arena = Arena(f"bench{i}", scheduler)
+        arena.set_messenger(f"group_{i}", discard)
+        arena.left_player = Player(1, arena, BaseMatch.Team.LEFT)
+        arena.right_player = Player(2, arena, BaseMatch.Team.RIGHT)
+        arena.max_score = sys.maxsize
+        arenas.append(arena)
+    return arenas
+
+
+def start(scheduler, arenas):
+    for arena in arenas:
+        scheduler._arenas[arena.arena_id] = arena
+        if scheduler.engine:
+            scheduler.engine.attach(arena)
+        arena.phase = ArenaPhase.PLAYING
+
+
+def bytes_per_arena(engine_factory, count):
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    scheduler = TickScheduler(engine=engine_factory())
+    arenas = create_arenas(scheduler, count)
+    start(scheduler, arenas)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return allocated / count
+
+
+async def ticks_per_second(engine_factory, count, ticks):
+    scheduler = TickScheduler(engine=engine_factory())
+    start(scheduler, create_arenas(scheduler, count))
+    begin = time.perf_counter()
+    for _ in range(ticks):
+        await scheduler.tick()
+    elapsed = time.perf_counter() - begin
+    return ticks / elapsed, count * ticks / elapsed
+
+
+def engines():
+    yield "python", lambda: None
+    try:
+        from arena.domain.batch_engine import BatchPhysicsEngine
+    except ImportError:
+        return
+    yield "batch", BatchPhysicsEngine
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    ticks = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    print(f"{count} arenas, {ticks} ticks")
+    print(f"{'engine':>8} {'ticks/s':>10} {'arena steps/s':>15} {'bytes/arena':>12}")
+    for name, factory in engines():
+        tick_rate, step_rate = asyncio.run(ticks_per_second(factory, count, ticks))
+        size = bytes_per_arena(factory, count)
+        print(f"{name:>8} {tick_rate:>10.1f} {step_rate:>15.0f} {size:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# 그룹 크기별 브로드캐스트 1회당 직렬화 + 전송 경로 CPU 비용 비교
+# 사용법: python benchmarks/broadcast_encoding.py
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+for key, value in (
+    ("SECRET_KEY", "benchmark"),
+    ("USER_SERVICE_URL", "http://localhost/"),
+    ("REDIS_HOST", "localhost"),
+    ("REDIS_PORT", "6379"),
+    ("REDIS_DB", "0"),
+    ("REDIS_CAPACITY", "100"),
+):
+    os.environ.setdefault(key, value)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django
+django.setup()
+
+import arena.services
+from arena.consumers import SpectatorConsumer
+from arena.services import ArenaService
+
+GROUP_SIZES = (2, 10, 50, 200, 1000)
+ROUNDS = 2000
+
+STATE = {
+    "tick": 1200,
+    "keyframe": True,
+    "ball": {"x": 69.0, "y": 38.0},
+    "left_player_bar": {"x": 4.0, "y": 38.0},
+    "right_player_bar": {"x": 134.0, "y": 38.0},
+}
+
+
+async def discard(text_data=None, bytes_data=None):
+    pass
+
+
+class DirectFanout:
+    """LocalFanout 대신 큐 없이 바로 send_to_client를 호출해 직렬화/전송 비용만 남김"""
+    members = []
+
+    @classmethod
+    async def group_send(cls, group_name, event, remote_event=None):
+        for consumer in cls.members:
+            await consumer.send_to_client(event)
+
+
+def create_consumers(group_size):
+    consumers = []
+    for i in range(group_size):
+        consumer = SpectatorConsumer()
+        # 절반은 JSON, 절반은 바이너리 연결
+        consumer.binary = i % 2 == 1
+        consumer.send = discard
+        consumers.append(consumer)
+    return consumers
+
+
+async def per_recipient(consumers):
+    # 다른 워커에서 온 축약 이벤트처럼 message만 있으면 연결마다 직렬화
+    event = {'type': 'send_to_client', 'message_type': 'state', 'message': STATE}
+    for consumer in consumers:
+        await consumer.send_to_client(event)
+
+
+async def once_per_broadcast(consumers):
+    await ArenaService.broadcast("arena_group_bench", 'state', STATE)
+
+
+def measure(func, group_size):
+    consumers = create_consumers(group_size)
+    DirectFanout.members = consumers
+
+    async def run():
+        for _ in range(ROUNDS):
+            await func(consumers)
+
+    start = time.process_time()
+    asyncio.run(run())
+    return (time.process_time() - start) / ROUNDS * 1e6
+
+
+def main():
+    arena.services.LocalFanout = DirectFanout
+    print(f"{'group size':>10} {'per recipient (us)':>20} {'once (us)':>12} {'speedup':>8}")
+    for group_size in GROUP_SIZES:
+        before = measure(per_recipient, group_size)
+        after = measure(once_per_broadcast, group_size)
+        print(f"{group_size:>10} {before:>20.2f} {after:>12.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,8 @@ class CloseCode(Enum):
     INVALID_USER = 4002
     INVALID_ACCESS = 4003
     ARENA_FULL = 4004
+    ARENA_EXPIRED = 4005
+    WORKER_OVERLOADED = 4006
     ARENA_STARTED = 5000
     
     def __int__(self):
@@ -1,11 +1,32 @@
-from channels.layers import get_channel_layer
+import json
+import time
+from .local_fanout import LocalFanout
+from .metrics import FANOUT_SECONDS
 
 async def broadcast_event(group_name, type, event=""):
-    channel_layer = get_channel_layer()
-    await channel_layer.group_send(
+    await LocalFanout.group_send(
         group_name,
         {
             'type': type,
             'message': event
         }
-    )
\ No newline at end of file
+    )
+
+def build_client_event(message_type, message):
+    # 그룹 멤버 수와 관계없이 한 번만 직렬화하고, 컨슈머는 text를 그대로 전송
+    return {
+        'type': 'send_to_client',
+        'message_type': message_type,
+        'text': json.dumps({
+            'type': message_type,
+            'message': message
+        })
+    }
+
+async def timed_group_send(channel_layer, group_name, event):
+    # LocalFanout을 거치지 않고 channel layer로 바로 보내는 그룹 이벤트도 같은 지표에 기록
+    started = time.perf_counter()
+    try:
+        await channel_layer.group_send(group_name, event)
+    finally:
+        FANOUT_SECONDS.labels('channel_layer').observe(time.perf_counter() - started)
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import time
+from channels.consumer import get_handler_name
+from channels.layers import get_channel_layer
+from django.conf import settings
+from .metrics import FANOUT_SECONDS
+from .redis_services import FanoutRedisService
+
+logger = logging.getLogger(__name__)
+
+
+class ConsumerDelivery:
+    """컨슈머마다 큐 하나와 전송 태스크 하나. 틱 경로에서는 큐에 넣기만 하고 핸들러는 이 태스크가 순서대로 실행"""
+    __slots__ = ("consumer", "queue", "task")
+    
+    def __init__(self, consumer):
+        self.consumer = consumer
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self.run())
+        
+    def put(self, event):
+        self.queue.put_nowait(event)
+        
+    def close(self):
+        # 이미 들어온 이벤트(arena.end 등)는 끝까지 처리한 뒤 종료
+        self.queue.put_nowait(None)
+        
+    async def run(self):
+        while True:
+            event = await self.queue.get()
+            try:
+                if event is None:
+                    return
+                await getattr(self.consumer, get_handler_name(event))(event)
+            except Exception:
+                # 한 컨슈머의 실패가 다른 멤버나 다음 이벤트 전달을 막지 않도록 기록만 함
+                logger.exception("local fanout delivery failed: %s", event.get('type'))
+            finally:
+                self.queue.task_done()
+
+
+class LocalFanout:
+    _groups = {}
+    _remote_checks = {}
+    _deliveries = {}
+    _memberships = {}
+    
+    @classmethod
+    async def join(cls, group_name, consumer):
+        members = cls._groups.setdefault(group_name, set())
+        if consumer not in members:
+            members.add(consumer)
+            cls._memberships[consumer] = cls._memberships.get(consumer, 0) + 1
+            if consumer not in cls._deliveries:
+                cls._deliveries[consumer] = ConsumerDelivery(consumer)
+        await FanoutRedisService.add_member(group_name, consumer.channel_name, settings.WORKER_ID)
+        
+    @classmethod
+    async def leave(cls, group_name, consumer):
+        members = cls._groups.get(group_name)
+        if members is not None and consumer in members:
+            members.discard(consumer)
+            if not members:
+                del cls._groups[group_name]
+                cls._remote_checks.pop(group_name, None)
+            cls._memberships[consumer] -= 1
+            if not cls._memberships[consumer]:
+                del cls._memberships[consumer]
+                cls._deliveries.pop(consumer).close()
+        await FanoutRedisService.remove_member(group_name, consumer.channel_name)
+        
+    @classmethod
+    def get_local_members(cls, group_name):
+        return cls._groups.get(group_name, ())
+    
+    @classmethod
+    async def has_remote_members(cls, group_name):
+        now = time.monotonic()
+        checked = cls._remote_checks.get(group_name)
+        if checked and checked[0] > now:
+            return checked[1]
+        
+        has_remote = await FanoutRedisService.has_remote_member(group_name, settings.WORKER_ID)
+        cls._remote_checks[group_name] = (now + settings.FANOUT_REMOTE_CHECK_INTERVAL, has_remote)
+        return has_remote
+    
+    @classmethod
+    async def group_send(cls, group_name, event, remote_event=None):
+        # 핸들러를 기다리지 않으므로 arena.end의 DB 저장 같은 느린 처리가 틱을 막지 않음
+        started = time.perf_counter()
+        for consumer in cls.get_local_members(group_name):
+            cls._deliveries[consumer].put(event)
+        FANOUT_SECONDS.labels('local').observe(time.perf_counter() - started)
+        
+        # 다른 프로세스에 멤버가 있을 때만 channel layer(Redis)를 거침. remote_event가 있으면 그 축약본을 보냄
+        if await cls.has_remote_members(group_name):
+            started = time.perf_counter()
+            await get_channel_layer().group_send(group_name, {**(remote_event or event), 'origin': settings.WORKER_ID})
+            FANOUT_SECONDS.labels('remote').observe(time.perf_counter() - started)
+    
+    @classmethod
+    async def drain(cls):
+        """큐에 쌓인 로컬 전송이 모두 끝날 때까지 대기"""
+        await asyncio.gather(*(delivery.queue.join() for delivery in list(cls._deliveries.values())))
@@ -0,0 +1,109 @@
+import time
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpResponse
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+
+# 틱, Redis 명령처럼 ms 단위로 끝나는 작업에 맞춘 기본 버킷 (prometheus_client 기본값은 5ms부터 시작)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class CallbackCollector:
+    """수집 시점에 값을 읽어오는 지표. func는 값 하나 또는 {라벨 튜플: 값}을 돌려줌"""
+    family = GaugeMetricFamily
+
+    def __init__(self, name, documentation, labelnames=(), func=None, registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.func = func
+        # 같은 이름이 이미 있으면 prometheus_client가 ValueError를 냄
+        registry.register(self)
+
+    def describe(self):
+        # 등록 시 이름 중복 검사에 쓰임. func는 호출하지 않음
+        return [self.family(self.name, self.documentation, labels=self.labelnames)]
+
+    def collect(self):
+        metric = self.family(self.name, self.documentation, labels=self.labelnames)
+        values = self.func()
+        if not isinstance(values, dict):
+            values = {(): values}
+        for labels, value in values.items():
+            metric.add_metric(labels, value)
+        yield metric
+
+
+class CallbackGauge(CallbackCollector):
+    family = GaugeMetricFamily
+
+
+class CallbackCounter(CallbackCollector):
+    family = CounterMetricFamily
+
+
+WEBSOCKET_CONNECTIONS = Gauge(
+    "websocket_connections", "Accepted WebSocket connections currently open.", ("consumer",)
+)
+WEBSOCKET_MESSAGES = Counter(
+    "websocket_messages_total", "WebSocket frames received from or sent to clients.", ("consumer", "direction")
+)
+FANOUT_SECONDS = Histogram(
+    "fanout_group_send_duration_seconds", "Time spent delivering one group event.", ("path",),
+    buckets=DEFAULT_BUCKETS
+)
+REDIS_COMMAND_SECONDS = Histogram(
+    "redis_command_duration_seconds", "Redis command round trip time.", ("command",),
+    buckets=DEFAULT_BUCKETS
+)
+
+DB_QUERY_SECONDS = Histogram(
+    "db_query_duration_seconds", "ORM query execution time.", ("alias",),
+    buckets=DEFAULT_BUCKETS
+)
+
+
+class ConsumerMetricsMixin:
+    """연결 수와 송수신 프레임 수를 컨슈머 종류별로 기록"""
+    metrics_label = None
+    _metrics_connected = False
+
+    async def accept(self, *args, **kwargs):
+        await super().accept(*args, **kwargs)
+        if not self._metrics_connected:
+            self._metrics_connected = True
+            WEBSOCKET_CONNECTIONS.labels(self.metrics_label).inc()
+
+    async def websocket_receive(self, message):
+        WEBSOCKET_MESSAGES.labels(self.metrics_label, "in").inc()
+        await super().websocket_receive(message)
+
+    async def send(self, *args, **kwargs):
+        WEBSOCKET_MESSAGES.labels(self.metrics_label, "out").inc()
+        await super().send(*args, **kwargs)
+
+    async def websocket_disconnect(self, message):
+        if self._metrics_connected:
+            self._metrics_connected = False
+            WEBSOCKET_CONNECTIONS.labels(self.metrics_label).dec()
+        await super().websocket_disconnect(message)
+
+
+def observe_query(execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        DB_QUERY_SECONDS.labels(context["connection"].alias).observe(time.perf_counter() - started)
+
+
+@receiver(connection_created)
+def instrument_connection(sender, connection, **kwargs):
+    # 스레드마다 새로 만들어지는 커넥션에도 빠짐없이 붙도록 생성 시점에 등록
+    if observe_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(observe_query)
+
+
+def metrics_view(request):
+    return HttpResponse(generate_latest(REGISTRY), content_type=CONTENT_TYPE_LATEST)
@@ -2,12 +2,17 @@ import jwt
 import json
 from django.utils.deprecation import MiddlewareMixin
 from channels.middleware import BaseMiddleware
+from django.conf import settings
 from django.http import JsonResponse
 from urllib.parse import parse_qs
+from .redis_services import UserRedisService
 
 
 class CustomHttpMiddleware(MiddlewareMixin):
     def process_request(self, request):
+        if request.path == settings.METRICS_PATH:
+            return None
+        
         token_line = request.headers.get("Authorization")
         if not token_line:
             return JsonResponse({"error": "Authentication token missing."}, status=401)
@@ -51,6 +56,14 @@ class CustomWsMiddleware(BaseMiddleware):
             "body": body,
         })
         
+
+class ServerLoopMiddleware(BaseMiddleware):
+    """서버 이벤트 루프에서 첫 연결이 들어올 때 프로세스 단위 백그라운드 작업을 한 번 시작"""
+    async def __call__(self, scope, receive, send):
+        UserRedisService.start_listener()
+        return await super().__call__(scope, receive, send)
+
+        
 def get_jwt(scope):
     query_string = scope.get('query_string', b'').decode()
     query_params = parse_qs(query_string)
@@ -0,0 +1,20 @@
+import time
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+    
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        
+    def consume(self, tokens=1):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens < tokens:
+            return False
+        self.tokens -= tokens
+        return True
\ No newline at end of file
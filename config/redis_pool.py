@@ -0,0 +1,148 @@
+import asyncio
+import time
+import redis.asyncio as redis
+from redis.commands.core import AsyncScript
+from .metrics import DEFAULT_BUCKETS, CallbackGauge, Gauge, Histogram, REDIS_COMMAND_SECONDS
+
+REDIS_POOL_WAIT_SECONDS = Histogram(
+    "redis_pool_wait_seconds", "Time spent waiting for a free pooled Redis connection.", buckets=DEFAULT_BUCKETS
+)
+
+
+class MeteredPipeline(redis.client.Pipeline):
+    async def execute(self, raise_on_error=True):
+        started = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            REDIS_COMMAND_SECONDS.labels("pipeline").observe(time.perf_counter() - started)
+
+
+class MeteredRedis(redis.Redis):
+    # Lua 스크립트(evalsha)를 포함한 모든 명령이 execute_command를 거침
+    async def execute_command(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            REDIS_COMMAND_SECONDS.labels(str(args[0]).lower()).observe(time.perf_counter() - started)
+
+    def pipeline(self, transaction=True, shard_hint=None):
+        return MeteredPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+class MeteredConnectionPool(redis.BlockingConnectionPool):
+    async def get_connection(self, command_name, *keys, **options):
+        started = time.perf_counter()
+        try:
+            return await super().get_connection(command_name, *keys, **options)
+        finally:
+            REDIS_POOL_WAIT_SECONDS.observe(time.perf_counter() - started)
+
+    @property
+    def in_use(self):
+        return len(self._in_use_connections)
+
+    @property
+    def idle(self):
+        return len(self._available_connections)
+
+
+async def close_with_loop(manager, loop, client):
+    # 루프를 닫기 전에 asyncio.run과 async_to_sync가 부르는 shutdown_asyncgens()가 이 제너레이터를 닫으면서 풀을 정리
+    try:
+        yield
+    finally:
+        if manager._clients.get(loop) is client:
+            del manager._clients[loop]
+        manager._shutdown_hooks.pop(loop, None)
+        await client.aclose(close_connection_pool=True)
+
+
+def start_shutdown_hook(hook):
+    # 첫 yield까지 동기로 진행시켜 현재 루프의 async generator 목록에 등록
+    try:
+        hook.asend(None).send(None)
+    except StopIteration:
+        pass
+    return hook
+
+
+class RedisPoolManager:
+    """이벤트 루프마다 별도 클라이언트와 커넥션 풀을 둬서 async_to_sync로 다른 루프에서 호출해도 커넥션을 공유하지 않음"""
+
+    def __init__(self, **pool_kwargs):
+        self.pool_kwargs = pool_kwargs
+        self._clients = {}
+        # 루프의 async generator 목록은 약한 참조라서 종료 훅을 여기서 붙잡아 둠
+        self._shutdown_hooks = {}
+        # 실행 중인 루프가 없을 때(모듈 임포트 시 스크립트 등록 등) 쓰는 클라이언트. 실제 I/O는 하지 않음
+        self._detached = None
+
+    def create_client(self):
+        return MeteredRedis(connection_pool=MeteredConnectionPool(**self.pool_kwargs))
+
+    def get_client(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            if self._detached is None:
+                self._detached = self.create_client()
+            return self._detached
+
+        client = self._clients.get(loop)
+        if client is None:
+            # 종료 훅 없이 닫힌 루프(직접 close한 경우)의 클라이언트는 새 루프가 생길 때 목록에서만 제거
+            for closed in [other for other in self._clients if other.is_closed()]:
+                del self._clients[closed]
+                self._shutdown_hooks.pop(closed, None)
+            client = self._clients[loop] = self.create_client()
+            self._shutdown_hooks[loop] = start_shutdown_hook(close_with_loop(self, loop, client))
+        return client
+
+    def get_pools(self):
+        return [client.connection_pool for client in list(self._clients.values())]
+
+    def register_script(self, script):
+        # 스크립트는 관리자에 묶어 두고 호출 시점 루프의 클라이언트로 evalsha
+        return AsyncScript(self, script)
+
+    def __getattr__(self, name):
+        return getattr(self.get_client(), name)
+
+
+def get_pool_connections(manager):
+    pools = manager.get_pools()
+    return {
+        ("in_use",): sum(pool.in_use for pool in pools),
+        ("idle",): sum(pool.idle for pool in pools),
+    }
+
+
+# 지표는 모듈에서 한 번만 등록하고 register_pool_metrics는 관리자 목록만 늘림
+METERED_MANAGERS = []
+
+
+def register_pool_metrics(manager):
+    if manager not in METERED_MANAGERS:
+        METERED_MANAGERS.append(manager)
+
+
+def get_all_pool_connections():
+    totals = {("in_use",): 0, ("idle",): 0}
+    for manager in METERED_MANAGERS:
+        for labels, value in get_pool_connections(manager).items():
+            totals[labels] += value
+    return totals
+
+
+REDIS_POOL_CONNECTIONS = CallbackGauge(
+    "redis_pool_connections", "Pooled Redis connections across event loops.", ("state",),
+    func=get_all_pool_connections
+)
+REDIS_POOLS = Gauge("redis_pools", "Event loops holding their own Redis pool.")
+REDIS_POOLS.set_function(lambda: sum(len(manager.get_pools()) for manager in METERED_MANAGERS))
+REDIS_POOL_MAX_CONNECTIONS = Gauge("redis_pool_max_connections", "Connection limit of each per-loop Redis pool.")
+REDIS_POOL_MAX_CONNECTIONS.set_function(
+    lambda: max((manager.pool_kwargs.get("max_connections", 0) for manager in METERED_MANAGERS), default=0)
+)
@@ -1,13 +1,95 @@
-import redis.asyncio as redis
+import asyncio
 import json
+import logging
 from django.conf import settings
+from .local_cache import LocalCache
+from .metrics import CallbackCounter, Counter, Gauge
+from .redis_pool import RedisPoolManager, register_pool_metrics
 
-redis_client = redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, db=settings.REDIS_DB)
+logger = logging.getLogger(__name__)
+
+redis_client = RedisPoolManager(
+    host=settings.REDIS_HOST,
+    port=settings.REDIS_PORT,
+    db=settings.REDIS_DB,
+    max_connections=settings.REDIS_MAX_CONNECTIONS,
+    timeout=settings.REDIS_POOL_TIMEOUT,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+    health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+)
+register_pool_metrics(redis_client)
 
 class ReceptionRedisService:
+    # 참가자 명단(set), 준비 완료(set), 프로필(hash)을 나눠 두고 인원 수는 SCARD로 O(1) 조회
+    # 상태 변경은 모두 서버 측 스크립트 한 번으로 처리해 동시 클릭에도 갱신이 유실되지 않음
+    # 이전 버전의 reception_{id}_participants 해시(user_id → is_ready 포함 JSON)가 남아 있으면 새 키로 옮기고 삭제
+    # KEYS: 1 roster, 2 ready, 3 profiles, 4 이전 participants 해시
+    drain_legacy = """
+        if redis.call('exists', KEYS[4]) == 1 then
+            local legacy = redis.call('hgetall', KEYS[4])
+            for i = 1, #legacy, 2 do
+                local detail = cjson.decode(legacy[i + 1])
+                redis.call('sadd', KEYS[1], legacy[i])
+                if detail['is_ready'] == 1 then
+                    redis.call('sadd', KEYS[2], legacy[i])
+                end
+                detail['is_ready'] = nil
+                redis.call('hset', KEYS[3], legacy[i], cjson.encode(detail))
+            end
+            redis.call('del', KEYS[4])
+        end
+    """
+    add_user_script = redis_client.register_script(drain_legacy + """
+        if redis.call('sadd', KEYS[1], ARGV[1]) == 0 then
+            return 0
+        end
+        redis.call('hset', KEYS[3], ARGV[1], ARGV[2])
+        redis.call('set', KEYS[5], ARGV[3])
+        return 1
+    """)
+    remove_user_script = redis_client.register_script(drain_legacy + """
+        redis.call('srem', KEYS[1], ARGV[1])
+        redis.call('srem', KEYS[2], ARGV[1])
+        redis.call('hdel', KEYS[3], ARGV[1])
+        redis.call('del', KEYS[5])
+        return redis.call('scard', KEYS[1])
+    """)
+    toggle_ready_script = redis_client.register_script(drain_legacy + """
+        if redis.call('sismember', KEYS[1], ARGV[1]) == 0 then
+            return -1
+        end
+        if redis.call('srem', KEYS[2], ARGV[1]) == 1 then
+            return 0
+        end
+        redis.call('sadd', KEYS[2], ARGV[1])
+        return 1
+    """)
+
+    @staticmethod
+    def get_roster_key(reception_id):
+        return f'reception_{reception_id}_roster'
+
+    @staticmethod
+    def get_ready_key(reception_id):
+        return f'reception_{reception_id}_ready'
+
+    @staticmethod
+    def get_profiles_key(reception_id):
+        return f'reception_{reception_id}_profiles'
+
     @staticmethod
-    def get_participants_key(reception_id):
+    def get_legacy_participants_key(reception_id):
         return f'reception_{reception_id}_participants'
+    
+    @staticmethod
+    def get_state_keys(reception_id):
+        return [
+            ReceptionRedisService.get_roster_key(reception_id),
+            ReceptionRedisService.get_ready_key(reception_id),
+            ReceptionRedisService.get_profiles_key(reception_id),
+            ReceptionRedisService.get_legacy_participants_key(reception_id),
+        ]
 
     @staticmethod
     def get_user_reception_key(user_id):
@@ -27,80 +109,90 @@ class ReceptionRedisService:
             "user_id": str(user_detail["id"]),
             "nickname": user_detail["nickname"],
             "avatar": user_detail["avatar"],
-            "is_ready": 0
         }
 
     @staticmethod
     async def add_user(reception_id, user_id, token):
-        participants_key = ReceptionRedisService.get_participants_key(reception_id)
-        user_reception_key = ReceptionRedisService.get_user_reception_key(user_id)
-        
-        if await redis_client.hexists(participants_key, user_id):
-            return False
-        
         user_detail = await UserRedisService.get_or_fetch_user(user_id, token)
         if not user_detail:
-            return False
+            return None
         
         partial_detail = ReceptionRedisService.get_partial_detail(user_detail)
         
-        await redis_client.hset(participants_key, user_id, json.dumps(partial_detail))
-        await redis_client.set(user_reception_key, reception_id)
-        return True
+        # 이미 참가 중이면 SADD가 실패하므로 기존 상태를 덮어쓰지 않음
+        added = await ReceptionRedisService.add_user_script(
+            keys=[
+                *ReceptionRedisService.get_state_keys(reception_id),
+                ReceptionRedisService.get_user_reception_key(user_id),
+            ],
+            args=[user_id, json.dumps(partial_detail), reception_id]
+        )
+        if added != 1:
+            return None
+        return {**partial_detail, "is_ready": 0}
 
     @staticmethod    
-    async def remove_user(reception_id, user_id):    
-        participants_key = ReceptionRedisService.get_participants_key(reception_id)
-        await redis_client.hdel(participants_key, user_id)
-        
-        user_reception_key = ReceptionRedisService.get_user_reception_key(user_id)
-        await redis_client.delete(user_reception_key)
+    async def remove_user(reception_id, user_id):
+        # 남은 참가자 수를 반환
+        return await ReceptionRedisService.remove_user_script(
+            keys=[
+                *ReceptionRedisService.get_state_keys(reception_id),
+                ReceptionRedisService.get_user_reception_key(user_id),
+            ],
+            args=[user_id]
+        )
         
     @staticmethod
     async def toggle_ready(reception_id, user_id):
-        participants_key = ReceptionRedisService.get_participants_key(reception_id)
-        raw_data = await redis_client.hget(participants_key, user_id)
-        if raw_data:
-            user_detail = json.loads(raw_data.decode())
-            current_ready_state = user_detail.get("is_ready", 0)
-            new_ready_state = 0 if current_ready_state == 1 else 1
-            user_detail["is_ready"] = new_ready_state
-            await redis_client.hset(participants_key, user_id, json.dumps(user_detail))
+        # 참가자가 아니면 None, 아니면 바뀐 준비 상태(0/1)
+        ready = await ReceptionRedisService.toggle_ready_script(
+            keys=ReceptionRedisService.get_state_keys(reception_id),
+            args=[user_id]
+        )
+        return None if ready == -1 else ready
             
     @staticmethod
     async def reset_ready_state(reception_id):
-        participants_key = ReceptionRedisService.get_participants_key(reception_id)
-        raw_map = await redis_client.hgetall(participants_key)
-        
-        for user_id, raw_data in raw_map.items():
-            user_detail = json.loads(raw_data.decode())
-            user_detail["is_ready"] = 0
-            await redis_client.hset(participants_key, user_id, json.dumps(user_detail))
+        await redis_client.delete(ReceptionRedisService.get_ready_key(reception_id))
+
+    @staticmethod
+    async def get_counts(reception_id):
+        # (참가자 수, 준비 완료 수)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.scard(ReceptionRedisService.get_roster_key(reception_id))
+            pipe.scard(ReceptionRedisService.get_ready_key(reception_id))
+            participants, ready = await pipe.execute()
+        return participants, ready
+
+    @staticmethod
+    async def get_participants_count(reception_id):
+        # 아직 옮겨지지 않은 이전 해시도 세어서 배포 직후에도 인원 수가 맞도록 함 (둘 중 하나는 0)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.scard(ReceptionRedisService.get_roster_key(reception_id))
+            pipe.hlen(ReceptionRedisService.get_legacy_participants_key(reception_id))
+            roster, legacy = await pipe.execute()
+        return roster + legacy
 
     @staticmethod    
     async def should_remove(reception_id):
-        participants = await ReceptionRedisService.get_participants(reception_id)
-
-        if len(participants) < 1:
-            return True
-        return False
+        return await ReceptionRedisService.get_participants_count(reception_id) < 1
 
     @staticmethod    
     async def should_start(reception_id):
-        participants = await ReceptionRedisService.get_participants(reception_id)
-
-        if len(participants) > 1:
-            return all(p["is_ready"] == 1 for p in participants)
-        return False
+        participants, ready = await ReceptionRedisService.get_counts(reception_id)
+        return participants > 1 and ready == participants
 
     @staticmethod
     async def get_participants(reception_id):
-        participants_key = ReceptionRedisService.get_participants_key(reception_id)
-        raw_map = await redis_client.hgetall(participants_key)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.hgetall(ReceptionRedisService.get_profiles_key(reception_id))
+            pipe.smembers(ReceptionRedisService.get_ready_key(reception_id))
+            raw_map, ready_users = await pipe.execute()
         
         participants = []
-        for _, v in raw_map.items():
+        for user_id, v in raw_map.items():
             user_detail = json.loads(v.decode())
+            user_detail["is_ready"] = 1 if user_id in ready_users else 0
             participants.append(user_detail)
         return participants
 
@@ -139,6 +231,12 @@ class ReceptionRedisService:
       
 
 class UserRedisService:
+    # Redis 앞단의 프로세스 캐시. 다른 프로세스가 다시 가져오거나 무효화하면 pub/sub으로 지움
+    local_cache = LocalCache(settings.USER_CACHE_LOCAL_SIZE, settings.USER_CACHE_LOCAL_TTL)
+    _listener = None
+    _listener_loop = None
+    _subscribed = False
+    
     @staticmethod
     def get_channel_name_key():
         return 'user_channels'
@@ -147,6 +245,10 @@ class UserRedisService:
     def get_user_detail_key(user_id):
         return f"user:detail:{user_id}"
     
+    @staticmethod
+    def get_invalidation_channel():
+        return "user:detail:invalidate"
+    
     @staticmethod    
     async def get_channel_name(user_id):
         channel_name = await redis_client.hget(UserRedisService.get_channel_name_key(), user_id)
@@ -154,17 +256,102 @@ class UserRedisService:
     
     @staticmethod
     async def cache_user_detail(user_id, user_detail: dict, ttl=21600):
+        await UserRedisService.cache_user_details({user_id: user_detail}, ttl)
+        
+    @staticmethod
+    async def cache_user_details(user_details: dict, ttl=21600):
+        # 여러 프로필 저장과 무효화 알림을 한 번의 파이프라인으로
+        channel = UserRedisService.get_invalidation_channel()
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for user_id, user_detail in user_details.items():
+                pipe.set(UserRedisService.get_user_detail_key(user_id), json.dumps(user_detail), ex=ttl)
+                pipe.publish(channel, f"{settings.WORKER_ID}:{user_id}")
+            await pipe.execute()
+        if UserRedisService.uses_local_cache():
+            for user_id, user_detail in user_details.items():
+                UserRedisService.local_cache.set(str(user_id), dict(user_detail))
+        
+    @staticmethod
+    async def invalidate_user(user_id):
+        # 프로필이 바뀌었을 때 호출. 모든 프로세스의 캐시에서 제거
         key = UserRedisService.get_user_detail_key(user_id)
-        await redis_client.set(key, json.dumps(user_detail), ex=ttl)
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.delete(key)
+            pipe.publish(UserRedisService.get_invalidation_channel(), f"{settings.WORKER_ID}:{user_id}")
+            await pipe.execute()
+        UserRedisService.local_cache.delete(str(user_id))
     
     @staticmethod
     async def get_cached_user(user_id) -> dict:
+        use_local = UserRedisService.uses_local_cache()
+        # 호출하는 쪽이 결과를 수정하므로 (email 제거 등) 항상 복사본을 반환
+        if use_local:
+            cached = UserRedisService.local_cache.get(str(user_id))
+            if cached is not None:
+                return dict(cached)
+        
         key = UserRedisService.get_user_detail_key(user_id)
         raw_data = await redis_client.get(key)
         if raw_data:
-            return json.loads(raw_data)
+            USER_CACHE_REDIS_REQUESTS.labels("hit").inc()
+            user_detail = json.loads(raw_data)
+            if use_local:
+                UserRedisService.local_cache.set(str(user_id), dict(user_detail))
+            return user_detail
+        USER_CACHE_REDIS_REQUESTS.labels("miss").inc()
         return None
     
+    @staticmethod
+    def start_listener():
+        """서버 이벤트 루프에서 호출. 무효화 구독이 살아 있는 이 루프에서만 로컬 캐시를 씀"""
+        listener = UserRedisService._listener
+        if listener is not None and not listener.done() and not listener.get_loop().is_closed():
+            return
+        if UserRedisService.local_cache.maxsize <= 0:
+            return
+        loop = asyncio.get_running_loop()
+        UserRedisService._listener_loop = loop
+        UserRedisService._listener = loop.create_task(UserRedisService._listen())
+        
+    @staticmethod
+    def uses_local_cache():
+        # 관리 명령, 테스트, 서버 밖 async_to_sync 루프는 무효화를 받지 못하므로 Redis만 사용
+        return UserRedisService._subscribed and asyncio.get_running_loop() is UserRedisService._listener_loop
+    
+    @staticmethod
+    async def _listen():
+        channel = UserRedisService.get_invalidation_channel()
+        reconnecting = False
+        try:
+            while True:
+                try:
+                    async with redis_client.pubsub() as pubsub:
+                        await pubsub.subscribe(channel)
+                        if reconnecting:
+                            # 구독이 끊긴 동안 놓친 무효화가 있을 수 있으므로 비우고 다시 사용
+                            UserRedisService.local_cache.clear()
+                        UserRedisService._subscribed = True
+                        while True:
+                            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                            if message:
+                                UserRedisService.handle_invalidation(message["data"])
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception("user cache invalidation listener failed")
+                    UserRedisService._subscribed = False
+                    reconnecting = True
+                    await asyncio.sleep(1)
+        finally:
+            UserRedisService._subscribed = False
+    
+    @staticmethod
+    def handle_invalidation(data):
+        origin, _, user_id = data.decode().partition(":")
+        # 자신이 보낸 메시지는 이미 로컬에 반영됨
+        if origin != settings.WORKER_ID:
+            UserRedisService.local_cache.delete(user_id)
+    
     @staticmethod
     async def get_or_fetch_user(user_id, token):
         if not user_id:
@@ -180,6 +367,50 @@ class UserRedisService:
         
         return user_detail
     
+    @staticmethod
+    async def get_many(user_ids, token):
+        """{user_id: 프로필}. 로컬 캐시 → MGET 한 번 → 누락분은 유저 서비스에 동시 요청 후 파이프라인으로 채움"""
+        use_local = UserRedisService.uses_local_cache()
+        users = {}
+        missing = []
+        for user_id in dict.fromkeys(user_id for user_id in user_ids if user_id):
+            cached = UserRedisService.local_cache.get(str(user_id)) if use_local else None
+            if cached is not None:
+                users[user_id] = dict(cached)
+            else:
+                missing.append(user_id)
+        if not missing:
+            return users
+        
+        raw_list = await redis_client.mget([UserRedisService.get_user_detail_key(user_id) for user_id in missing])
+        unfetched = []
+        for user_id, raw_data in zip(missing, raw_list):
+            if raw_data:
+                USER_CACHE_REDIS_REQUESTS.labels("hit").inc()
+                users[user_id] = json.loads(raw_data)
+                if use_local:
+                    UserRedisService.local_cache.set(str(user_id), dict(users[user_id]))
+            else:
+                USER_CACHE_REDIS_REQUESTS.labels("miss").inc()
+                unfetched.append(user_id)
+        if not unfetched:
+            return users
+        
+        from config.services import UserService
+        results = await asyncio.gather(*(UserService.get_user(user_id, token) for user_id in unfetched))
+        fetched = {user_id: user_detail for user_id, user_detail in zip(unfetched, results) if user_detail}
+        if fetched:
+            await UserRedisService.cache_user_details(fetched)
+            users.update({user_id: dict(user_detail) for user_id, user_detail in fetched.items()})
+        return users
+    
+    @staticmethod
+    async def get_many_exclude_email(user_ids, token):
+        users = await UserRedisService.get_many(user_ids, token)
+        for user in users.values():
+            user.pop('email', None)
+        return users
+    
     @staticmethod
     async def get_or_fetch_user_exclude_email(user_id, token):
         user = await UserRedisService.get_or_fetch_user(user_id, token)
@@ -210,3 +441,163 @@ class ArenaRedisService:
     async def remove_allowed_user(arena_id, user_id):
         key = ArenaRedisService.get_arena_participants_key(arena_id, user_id)
         await redis_client.delete(key)
+
+
+class FanoutRedisService:
+    @staticmethod
+    def get_members_key(group_name):
+        return f"fanout:{group_name}:members"
+    
+    @staticmethod
+    async def add_member(group_name, channel_name, worker_id, ttl=86400):
+        key = FanoutRedisService.get_members_key(group_name)
+        await redis_client.hset(key, channel_name, worker_id)
+        await redis_client.expire(key, ttl)
+        
+    @staticmethod
+    async def remove_member(group_name, channel_name):
+        key = FanoutRedisService.get_members_key(group_name)
+        await redis_client.hdel(key, channel_name)
+        
+    @staticmethod
+    async def has_remote_member(group_name, worker_id):
+        key = FanoutRedisService.get_members_key(group_name)
+        worker_ids = await redis_client.hvals(key)
+        return any(w.decode() != worker_id for w in worker_ids)
+
+
+class ArenaOwnershipRedisService:
+    # 값이 자신의 owner_id일 때만 연장/삭제해서 다른 워커의 lease를 건드리지 않음
+    renew_script = redis_client.register_script("""
+        if redis.call('get', KEYS[1]) == ARGV[1] then
+            return redis.call('expire', KEYS[1], ARGV[2])
+        end
+        return 0
+    """)
+    release_script = redis_client.register_script("""
+        if redis.call('get', KEYS[1]) == ARGV[1] then
+            return redis.call('del', KEYS[1])
+        end
+        return 0
+    """)
+    
+    @staticmethod
+    def get_owner_key(arena_id):
+        return f"arena:{arena_id}:owner"
+    
+    @staticmethod
+    async def claim(arena_id, owner_id, ttl):
+        key = ArenaOwnershipRedisService.get_owner_key(arena_id)
+        while True:
+            if await redis_client.set(key, owner_id, nx=True, ex=ttl):
+                return owner_id
+            owner = await redis_client.get(key)
+            if owner is not None:
+                return owner.decode()
+            
+    @staticmethod
+    async def renew(arena_id, owner_id, ttl):
+        key = ArenaOwnershipRedisService.get_owner_key(arena_id)
+        return await ArenaOwnershipRedisService.renew_script(keys=[key], args=[owner_id, ttl]) == 1
+    
+    @staticmethod
+    async def release(arena_id, owner_id):
+        key = ArenaOwnershipRedisService.get_owner_key(arena_id)
+        await ArenaOwnershipRedisService.release_script(keys=[key], args=[owner_id])
+        
+    @staticmethod
+    async def get_owner(arena_id):
+        key = ArenaOwnershipRedisService.get_owner_key(arena_id)
+        owner = await redis_client.get(key)
+        return owner.decode() if owner else None
+
+
+class ArenaCheckpointRedisService:
+    @staticmethod
+    def get_checkpoint_key(arena_id):
+        return f"arena:{arena_id}:checkpoint"
+    
+    @staticmethod
+    async def save_many(checkpoints: dict, ttl):
+        async with redis_client.pipeline(transaction=False) as pipe:
+            for arena_id, checkpoint in checkpoints.items():
+                key = ArenaCheckpointRedisService.get_checkpoint_key(arena_id)
+                pipe.set(key, json.dumps(checkpoint), ex=ttl)
+            await pipe.execute()
+            
+    @staticmethod
+    async def get(arena_id):
+        key = ArenaCheckpointRedisService.get_checkpoint_key(arena_id)
+        raw_data = await redis_client.get(key)
+        if raw_data:
+            return json.loads(raw_data)
+        return None
+    
+    @staticmethod
+    async def delete_many(arena_ids):
+        keys = [ArenaCheckpointRedisService.get_checkpoint_key(arena_id) for arena_id in arena_ids]
+        await redis_client.delete(*keys)
+
+
+class ArenaSpectatorRedisService:
+    @staticmethod
+    def get_latest_key(arena_id):
+        return f"arena:{arena_id}:spectate"
+    
+    @staticmethod
+    async def set_latest(arena_id, state, ttl):
+        key = ArenaSpectatorRedisService.get_latest_key(arena_id)
+        await redis_client.set(key, json.dumps(state), ex=ttl)
+        
+    @staticmethod
+    async def get_latest(arena_id):
+        key = ArenaSpectatorRedisService.get_latest_key(arena_id)
+        raw_data = await redis_client.get(key)
+        if raw_data:
+            return json.loads(raw_data)
+        return None
+
+
+
+class ArenaReplayRedisService:
+    @staticmethod
+    def get_replay_key(arena_id):
+        return f"arena:{arena_id}:replay"
+    
+    @staticmethod
+    async def append(arena_id, header, data, ttl):
+        # 헤더는 키가 없을 때만 쓰고 기록은 APPEND로 이어 붙임
+        key = ArenaReplayRedisService.get_replay_key(arena_id)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.set(key, header, nx=True)
+            pipe.append(key, data)
+            pipe.expire(key, ttl)
+            await pipe.execute()
+            
+    @staticmethod
+    async def get(arena_id):
+        key = ArenaReplayRedisService.get_replay_key(arena_id)
+        return await redis_client.get(key)
+    
+    @staticmethod
+    async def delete(arena_id):
+        key = ArenaReplayRedisService.get_replay_key(arena_id)
+        await redis_client.delete(key)
+
+
+USER_CACHE_LOCAL_REQUESTS = CallbackCounter(
+    "user_cache_local_requests", "In-process user profile cache lookups.", ("result",),
+    func=lambda: {
+        ("hit",): UserRedisService.local_cache.hits,
+        ("miss",): UserRedisService.local_cache.misses,
+    }
+)
+USER_CACHE_REDIS_REQUESTS = Counter(
+    "user_cache_redis_requests_total", "Redis user profile cache lookups after an in-process miss.", ("result",)
+)
+USER_CACHE_EVICTIONS = CallbackCounter(
+    "user_cache_evictions", "Profiles evicted from the in-process cache by the size bound.",
+    func=lambda: UserRedisService.local_cache.evictions
+)
+USER_CACHE_SIZE = Gauge("user_cache_size", "Profiles held in the in-process cache.")
+USER_CACHE_SIZE.set_function(lambda: len(UserRedisService.local_cache))
@@ -1,4 +1,5 @@
 from pathlib import Path
+import uuid
 from decouple import config # ENV
 
 # ENV
@@ -13,6 +14,40 @@ REDIS_HOST = config('REDIS_HOST')
 REDIS_PORT = config('REDIS_PORT', cast=int)
 REDIS_DB = config('REDIS_DB', cast=int)
 REDIS_CAPACITY = config('REDIS_CAPACITY', cast=int)
+REDIS_MAX_CONNECTIONS = config('REDIS_MAX_CONNECTIONS', default=50, cast=int) # 이벤트 루프별 풀 크기
+REDIS_POOL_TIMEOUT = config('REDIS_POOL_TIMEOUT', default=5.0, cast=float) # 초 단위, 빈 커넥션 대기 한도
+REDIS_SOCKET_TIMEOUT = config('REDIS_SOCKET_TIMEOUT', default=5.0, cast=float)
+REDIS_SOCKET_CONNECT_TIMEOUT = config('REDIS_SOCKET_CONNECT_TIMEOUT', default=2.0, cast=float)
+REDIS_HEALTH_CHECK_INTERVAL = config('REDIS_HEALTH_CHECK_INTERVAL', default=30, cast=int) # 유휴 커넥션 PING 주기
+
+WORKER_ID = config('WORKER_ID', default=uuid.uuid4().hex[:12])
+FANOUT_REMOTE_CHECK_INTERVAL = config('FANOUT_REMOTE_CHECK_INTERVAL', default=1.0, cast=float) # 초 단위
+METRICS_PATH = config('METRICS_PATH', default='/metrics') # 스크레이퍼용, JWT 검사 제외
+USER_CACHE_LOCAL_SIZE = config('USER_CACHE_LOCAL_SIZE', default=1024, cast=int) # 0이면 프로세스 캐시 사용 안 함
+USER_CACHE_LOCAL_TTL = config('USER_CACHE_LOCAL_TTL', default=30.0, cast=float) # 초 단위, 무효화 유실 시 최대 지연
+
+ARENA_TICK_RATE = config('ARENA_TICK_RATE', default=60, cast=int) # 시뮬레이션 Hz
+ARENA_SNAPSHOT_RATE = config('ARENA_SNAPSHOT_RATE', default=20, cast=int) # state 전송 Hz
+ARENA_MAX_CATCHUP_TICKS = config('ARENA_MAX_CATCHUP_TICKS', default=5, cast=int)
+ARENA_KEYFRAME_INTERVAL = config('ARENA_KEYFRAME_INTERVAL', default=20, cast=int) # 스냅샷 단위
+ARENA_INPUT_RATE_LIMIT = config('ARENA_INPUT_RATE_LIMIT', default=20, cast=float) # 커넥션당 초당 입력 메시지
+ARENA_INPUT_BURST = config('ARENA_INPUT_BURST', default=10, cast=int)
+ARENA_PHYSICS_ENGINE = config('ARENA_PHYSICS_ENGINE', default='python') # python | batch (numpy 필요)
+ARENA_BROADCAST_MODE = config('ARENA_BROADCAST_MODE', default='snapshot') # snapshot | trajectory
+ARENA_LEASE_TTL = config('ARENA_LEASE_TTL', default=10, cast=int) # 초 단위, 소유 워커가 TTL/3 마다 연장
+ARENA_CHECKPOINT_INTERVAL = config('ARENA_CHECKPOINT_INTERVAL', default=1.0, cast=float) # 초 단위, 0이면 끔
+ARENA_CHECKPOINT_TTL = config('ARENA_CHECKPOINT_TTL', default=300, cast=int) # 재접속을 기다리는 시간
+ARENA_FORFEIT_GRACE = config('ARENA_FORFEIT_GRACE', default=10, cast=float) # 초 단위, 경기 중 끊긴 선수가 재접속할 수 있는 시간
+ARENA_WAITING_TTL = config('ARENA_WAITING_TTL', default=300, cast=int) # 초 단위, 상대가 오지 않은 대기방 정리
+ARENA_REAP_INTERVAL = config('ARENA_REAP_INTERVAL', default=30, cast=int)
+ARENA_SPECTATOR_RATE = config('ARENA_SPECTATOR_RATE', default=5, cast=int) # 관전자 state 전송 Hz
+ARENA_SPECTATOR_CACHE_TTL = config('ARENA_SPECTATOR_CACHE_TTL', default=60, cast=int)
+ARENA_REPLAY_ENABLED = config('ARENA_REPLAY_ENABLED', default=True, cast=bool) # 끝난 경기는 MatchReplay 테이블에 보관
+ARENA_REPLAY_TTL = config('ARENA_REPLAY_TTL', default=3600, cast=int) # 초 단위, 진행 중인 경기 기록을 Redis에 버퍼링하는 기간
+ARENA_REPLAY_KEYFRAME_INTERVAL = config('ARENA_REPLAY_KEYFRAME_INTERVAL', default=60, cast=int) # 틱 단위
+ARENA_OVERLOAD_LAG = config('ARENA_OVERLOAD_LAG', default=0.02, cast=float) # 초 단위, 평균 틱 지연이 넘으면 과부하
+ARENA_OVERLOAD_MAX_LEVEL = config('ARENA_OVERLOAD_MAX_LEVEL', default=2, cast=int) # 단계마다 스냅샷 주기 2배
+ARENA_OVERLOAD_RECOVER_SECONDS = config('ARENA_OVERLOAD_RECOVER_SECONDS', default=5.0, cast=float)
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -0,0 +1,155 @@
+import asyncio
+import json
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch, AsyncMock
+from django.conf import settings
+from config.local_fanout import LocalFanout
+from config.consumer_utils import build_client_event
+
+
+class FakeConsumer:
+    channel_name = "specific.local!1"
+    
+    def __init__(self):
+        self.events = []
+        
+    async def send_to_client(self, event):
+        self.events.append(event)
+
+
+class FailingConsumer(FakeConsumer):
+    async def send_to_client(self, event):
+        raise RuntimeError("closed")
+
+
+class SlowConsumer(FakeConsumer):
+    def __init__(self):
+        super().__init__()
+        self.release = asyncio.Event()
+        
+    async def send_to_client(self, event):
+        await self.release.wait()
+        self.events.append(event)
+
+
+class TestLocalFanout(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.redis = patch("config.local_fanout.FanoutRedisService").start()
+        self.redis.add_member = AsyncMock()
+        self.redis.remove_member = AsyncMock()
+        self.channel_layer = AsyncMock()
+        patch("config.local_fanout.get_channel_layer", return_value=self.channel_layer).start()
+        self.addCleanup(patch.stopall)
+        LocalFanout._groups.clear()
+        LocalFanout._remote_checks.clear()
+        LocalFanout._deliveries.clear()
+        LocalFanout._memberships.clear()
+        
+    async def test_local_members_skip_channel_layer(self):
+        self.redis.has_remote_member = AsyncMock(return_value=False)
+        consumer = FakeConsumer()
+        await LocalFanout.join("arena_group_a", consumer)
+        event = {'type': 'send_to_client', 'message_type': 'state', 'message': {}}
+        
+        await LocalFanout.group_send("arena_group_a", event)
+        await LocalFanout.group_send("arena_group_a", event)
+        await LocalFanout.drain()
+        
+        self.assertEqual(consumer.events, [event, event])
+        self.channel_layer.group_send.assert_not_awaited()
+        self.redis.has_remote_member.assert_awaited_once()
+
+    async def test_remote_members_get_event_with_origin(self):
+        self.redis.has_remote_member = AsyncMock(return_value=True)
+        consumer = FakeConsumer()
+        await LocalFanout.join("arena_group_a", consumer)
+        event = {'type': 'send_to_client', 'message_type': 'state', 'message': {}}
+        
+        await LocalFanout.group_send("arena_group_a", event)
+        await LocalFanout.drain()
+        
+        self.assertEqual(consumer.events, [event])
+        self.channel_layer.group_send.assert_awaited_once_with(
+            "arena_group_a", {**event, 'origin': settings.WORKER_ID}
+        )
+        
+        await LocalFanout.leave("arena_group_a", consumer)
+        self.assertEqual(LocalFanout.get_local_members("arena_group_a"), ())
+
+    async def test_remote_members_get_compact_event(self):
+        self.redis.has_remote_member = AsyncMock(return_value=True)
+        consumer = FakeConsumer()
+        await LocalFanout.join("arena_group_a", consumer)
+        event = {'type': 'send_to_client', 'message_type': 'state', 'message': {}, 'text': '{}', 'bytes': b''}
+        remote_event = {'type': 'send_to_client', 'message_type': 'state', 'message': {}}
+        
+        await LocalFanout.group_send("arena_group_a", event, remote_event)
+        await LocalFanout.drain()
+        
+        self.assertEqual(consumer.events, [event])
+        self.channel_layer.group_send.assert_awaited_once_with(
+            "arena_group_a", {**remote_event, 'origin': settings.WORKER_ID}
+        )
+
+    async def test_event_is_encoded_once_for_every_member(self):
+        self.redis.has_remote_member = AsyncMock(return_value=False)
+        consumers = [FakeConsumer() for _ in range(3)]
+        for consumer in consumers:
+            await LocalFanout.join("reception_1", consumer)
+        
+        with patch("config.consumer_utils.json.dumps", wraps=json.dumps) as dumps:
+            event = build_client_event('participants', [{'user_id': '1'}])
+            await LocalFanout.group_send("reception_1", event)
+        await LocalFanout.drain()
+        
+        dumps.assert_called_once()
+        self.assertEqual(
+            json.loads(consumers[0].events[-1]['text']),
+            {'type': 'participants', 'message': [{'user_id': '1'}]}
+        )
+        self.assertIs(consumers[0].events[-1], consumers[2].events[-1])
+
+    async def test_failing_member_does_not_block_others(self):
+        self.redis.has_remote_member = AsyncMock(return_value=False)
+        failing, consumer = FailingConsumer(), FakeConsumer()
+        await LocalFanout.join("arena_group_a", failing)
+        await LocalFanout.join("arena_group_a", consumer)
+        event = {'type': 'send_to_client', 'message_type': 'state', 'message': {}}
+        
+        with self.assertLogs("config.local_fanout", level="ERROR"):
+            await LocalFanout.group_send("arena_group_a", event)
+            await LocalFanout.group_send("arena_group_a", event)
+            await LocalFanout.drain()
+        
+        self.assertEqual(consumer.events, [event, event])
+        
+    async def test_slow_member_does_not_block_sender(self):
+        self.redis.has_remote_member = AsyncMock(return_value=False)
+        consumer = SlowConsumer()
+        await LocalFanout.join("arena_group_a", consumer)
+        first = {'type': 'send_to_client', 'message_type': 'state', 'message': {'n': 1}}
+        second = {'type': 'send_to_client', 'message_type': 'state', 'message': {'n': 2}}
+        
+        await asyncio.wait_for(LocalFanout.group_send("arena_group_a", first), 1)
+        await asyncio.wait_for(LocalFanout.group_send("arena_group_a", second), 1)
+        self.assertEqual(consumer.events, [])
+        
+        consumer.release.set()
+        await LocalFanout.drain()
+        self.assertEqual(consumer.events, [first, second])
+        
+    async def test_queued_events_are_delivered_after_leave(self):
+        self.redis.has_remote_member = AsyncMock(return_value=False)
+        consumer = FakeConsumer()
+        await LocalFanout.join("arena_group_a", consumer)
+        event = {'type': 'arena.end', 'message': {}}
+        consumer.arena_end = AsyncMock()
+        
+        delivery = LocalFanout._deliveries[consumer]
+        
+        await LocalFanout.group_send("arena_group_a", event)
+        await LocalFanout.leave("arena_group_a", consumer)
+        await asyncio.wait_for(delivery.task, 1)
+        
+        consumer.arena_end.assert_awaited_once_with(event)
+        self.assertEqual(LocalFanout._deliveries, {})
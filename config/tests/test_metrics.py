@@ -0,0 +1,66 @@
+from unittest.mock import AsyncMock
+from django.db import connection
+from django.test import SimpleTestCase
+from prometheus_client import REGISTRY, CollectorRegistry, generate_latest
+from config.consumer_utils import timed_group_send
+from config.metrics import CallbackCounter, CallbackGauge
+
+
+class TestMetrics(SimpleTestCase):
+    databases = {"default"}
+
+    def setUp(self):
+        self.registry = CollectorRegistry()
+
+    def test_callback_metric_reads_value_at_collection(self):
+        live = {"value": 1}
+        CallbackGauge("live", "Live.", func=lambda: live["value"], registry=self.registry)
+        live["value"] = 7
+
+        self.assertEqual(self.registry.get_sample_value("live"), 7)
+
+    def test_labeled_callback_counter(self):
+        CallbackCounter(
+            "lookups", "Lookups.", ("result",), func=lambda: {("hit",): 3, ("miss",): 1}, registry=self.registry
+        )
+
+        text = generate_latest(self.registry).decode()
+        self.assertIn("# TYPE lookups_total counter", text)
+        self.assertIn('lookups_total{result="hit"} 3.0', text)
+        self.assertIn('lookups_total{result="miss"} 1.0', text)
+
+    def test_duplicate_name_is_rejected(self):
+        CallbackCounter("dup", "Dup.", func=lambda: 0, registry=self.registry)
+        with self.assertRaises(ValueError):
+            CallbackCounter("dup", "Dup.", func=lambda: 0, registry=self.registry)
+
+    def test_db_queries_are_observed(self):
+        before = REGISTRY.get_sample_value("db_query_duration_seconds_count", {"alias": "default"}) or 0
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+        after = REGISTRY.get_sample_value("db_query_duration_seconds_count", {"alias": "default"})
+        self.assertEqual(after, before + 1)
+
+    async def test_direct_group_send_is_observed(self):
+        labels = {"path": "channel_layer"}
+        before = REGISTRY.get_sample_value("fanout_group_send_duration_seconds_count", labels) or 0
+        channel_layer = AsyncMock()
+
+        await timed_group_send(channel_layer, "reception_1", {"type": "move_to_arena"})
+
+        channel_layer.group_send.assert_awaited_once_with("reception_1", {"type": "move_to_arena"})
+        self.assertEqual(REGISTRY.get_sample_value("fanout_group_send_duration_seconds_count", labels), before + 1)
+
+    def test_metrics_endpoint_skips_jwt_check(self):
+        response = self.client.get("/metrics")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"arena_tick_duration_seconds", response.content)
+        self.assertIn(b"websocket_connections", response.content)
+        self.assertIn(b"redis_pool_connections", response.content)
+
+    def test_api_still_requires_jwt(self):
+        response = self.client.get("/api/game/arena/matches/1/")
+
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,63 @@
+import asyncio
+from unittest import TestCase
+from unittest.mock import patch, AsyncMock
+from asgiref.sync import async_to_sync
+from config.redis_pool import RedisPoolManager, MeteredRedis, MeteredConnectionPool, get_pool_connections
+
+
+class TestRedisPoolManager(TestCase):
+    def setUp(self):
+        self.manager = RedisPoolManager(host="localhost", port=6379, max_connections=3, timeout=1)
+
+    def test_each_event_loop_gets_its_own_client(self):
+        async def get_clients():
+            return self.manager.get_client(), self.manager.get_client()
+
+        first, same = asyncio.run(get_clients())
+        second, _ = asyncio.run(get_clients())
+
+        self.assertIs(first, same)
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.connection_pool, second.connection_pool)
+        self.assertIsInstance(first, MeteredRedis)
+
+    def test_clients_of_closed_loops_are_dropped(self):
+        async def get_client():
+            return self.manager.get_client()
+
+        with patch.object(MeteredConnectionPool, "disconnect", new_callable=AsyncMock) as disconnect:
+            for _ in range(3):
+                asyncio.run(get_client())
+            async_to_sync(get_client)()
+
+        self.assertEqual(self.manager.get_pools(), [])
+        self.assertEqual(disconnect.await_count, 4)
+
+    def test_loop_closed_without_shutdown_is_pruned(self):
+        async def get_client():
+            return self.manager.get_client()
+
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(get_client())
+        loop.close()
+        asyncio.run(get_client())
+
+        self.assertEqual(len(self.manager._clients), 0)
+        self.assertEqual(self.manager._shutdown_hooks, {})
+
+    def test_pool_settings_are_applied(self):
+        async def get_pool():
+            return self.manager.connection_pool
+
+        pool = asyncio.run(get_pool())
+
+        self.assertEqual(pool.max_connections, 3)
+        self.assertEqual(pool.timeout, 1)
+        self.assertEqual(get_pool_connections(self.manager), {("in_use",): 0, ("idle",): 0})
+
+    def test_scripts_resolve_client_at_call_time(self):
+        script = self.manager.register_script("return 1")
+
+        self.assertIs(script.registered_client, self.manager)
+        self.assertEqual(len(script.sha), 40)
+        self.assertEqual(self.manager.get_pools(), [])
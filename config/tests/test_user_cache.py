@@ -0,0 +1,146 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase, TestCase
+from unittest.mock import patch, AsyncMock, MagicMock
+from django.conf import settings
+from config.local_cache import LocalCache
+from config.redis_services import UserRedisService
+
+
+class TestLocalCache(TestCase):
+    def test_entries_expire_after_ttl(self):
+        cache = LocalCache(maxsize=10, ttl=5)
+        cache.set("1", {"id": 1}, now=100)
+
+        self.assertEqual(cache.get("1", now=104), {"id": 1})
+        self.assertIsNone(cache.get("1", now=105))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(len(cache), 0)
+
+    def test_least_recently_used_is_evicted(self):
+        cache = LocalCache(maxsize=2, ttl=60)
+        cache.set("1", 1, now=1)
+        cache.set("2", 2, now=1)
+        cache.get("1", now=2)
+        cache.set("3", 3, now=3)
+
+        self.assertIsNone(cache.get("2", now=4))
+        self.assertEqual(cache.get("1", now=4), 1)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_zero_size_disables_cache(self):
+        cache = LocalCache(maxsize=0, ttl=60)
+        cache.set("1", 1)
+
+        self.assertIsNone(cache.get("1"))
+
+
+class TestUserRedisServiceCache(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.redis = patch("config.redis_services.redis_client").start()
+        self.redis.get = AsyncMock(return_value=b'{"id": 1, "nickname": "a", "email": "a@b.c"}')
+        self.pipe = MagicMock()
+        self.pipe.execute = AsyncMock()
+        self.redis.pipeline.return_value.__aenter__ = AsyncMock(return_value=self.pipe)
+        self.redis.pipeline.return_value.__aexit__ = AsyncMock(return_value=False)
+        patch.object(UserRedisService, "uses_local_cache", return_value=True).start()
+        patch.object(UserRedisService, "local_cache", LocalCache(maxsize=10, ttl=60)).start()
+        self.addCleanup(patch.stopall)
+
+    async def test_second_lookup_skips_redis(self):
+        first = await UserRedisService.get_or_fetch_user_exclude_email(1, "token")
+        second = await UserRedisService.get_or_fetch_user(1, "token")
+
+        self.redis.get.assert_awaited_once()
+        self.assertNotIn("email", first)
+        self.assertEqual(second["email"], "a@b.c")
+
+    async def test_refetch_updates_local_and_publishes(self):
+        await UserRedisService.cache_user_detail(1, {"id": 1, "nickname": "b"})
+
+        self.pipe.publish.assert_called_once_with("user:detail:invalidate", f"{settings.WORKER_ID}:1")
+        self.assertEqual((await UserRedisService.get_cached_user(1))["nickname"], "b")
+        self.redis.get.assert_not_called()
+
+    async def test_invalidation_from_other_worker_drops_entry(self):
+        await UserRedisService.get_cached_user(1)
+
+        UserRedisService.handle_invalidation(f"{settings.WORKER_ID}:1".encode())
+        self.assertIsNotNone(UserRedisService.local_cache.get("1"))
+        UserRedisService.handle_invalidation(b"other-worker:1")
+        self.assertIsNone(UserRedisService.local_cache.get("1"))
+
+    async def test_get_many_uses_local_then_mget_then_user_service(self):
+        UserRedisService.local_cache.set("1", {"id": 1, "nickname": "local"})
+        self.redis.mget = AsyncMock(return_value=[b'{"id": 2, "nickname": "redis"}', None])
+        fetched = {3: {"id": 3, "nickname": "fetched", "email": "c@d.e"}}
+        with patch("config.services.UserService.get_user", new=AsyncMock(side_effect=lambda user_id, token: fetched.get(user_id))):
+            users = await UserRedisService.get_many_exclude_email([1, 2, 3, 2, None], "token")
+
+        self.redis.mget.assert_awaited_once_with(["user:detail:2", "user:detail:3"])
+        self.assertEqual({user_id: user["nickname"] for user_id, user in users.items()}, {1: "local", 2: "redis", 3: "fetched"})
+        self.assertNotIn("email", users[3])
+        self.pipe.set.assert_called_once()
+        self.assertEqual(UserRedisService.local_cache.get("3")["email"], "c@d.e")
+
+    async def test_get_many_skips_redis_when_all_local(self):
+        UserRedisService.local_cache.set("1", {"id": 1})
+        self.redis.mget = AsyncMock()
+
+        users = await UserRedisService.get_many([1], "token")
+
+        self.assertEqual(users, {1: {"id": 1}})
+        self.redis.mget.assert_not_called()
+
+
+class TestInvalidationListener(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.redis = patch("config.redis_services.redis_client").start()
+        self.redis.get = AsyncMock(return_value=b'{"id": 1}')
+        self.pubsub = MagicMock()
+        self.pubsub.subscribe = AsyncMock()
+        self.pubsub.get_message = AsyncMock(side_effect=self.wait_for_message)
+        self.redis.pubsub.return_value.__aenter__ = AsyncMock(return_value=self.pubsub)
+        self.redis.pubsub.return_value.__aexit__ = AsyncMock(return_value=False)
+        patch.object(UserRedisService, "local_cache", LocalCache(maxsize=10, ttl=60)).start()
+        patch.multiple(UserRedisService, _listener=None, _listener_loop=None, _subscribed=False).start()
+        self.addCleanup(patch.stopall)
+        
+    async def wait_for_message(self, **kwargs):
+        await asyncio.sleep(0.01)
+        
+    async def asyncTearDown(self):
+        if UserRedisService._listener:
+            UserRedisService._listener.cancel()
+            await asyncio.gather(UserRedisService._listener, return_exceptions=True)
+
+    async def test_without_listener_only_redis_is_used(self):
+        await UserRedisService.get_cached_user(1)
+        await UserRedisService.get_cached_user(1)
+        
+        self.assertEqual(self.redis.get.await_count, 2)
+        self.assertEqual(len(UserRedisService.local_cache), 0)
+        self.assertIsNone(UserRedisService._listener)
+
+    async def test_first_subscribe_keeps_cache_and_listener_is_shared(self):
+        UserRedisService.local_cache.set("2", {"id": 2})
+        
+        UserRedisService.start_listener()
+        listener = UserRedisService._listener
+        UserRedisService.start_listener()
+        await asyncio.sleep(0.02)
+        
+        self.assertIs(UserRedisService._listener, listener)
+        self.redis.pubsub.assert_called_once()
+        self.assertTrue(UserRedisService.uses_local_cache())
+        self.assertEqual(UserRedisService.local_cache.get("2"), {"id": 2})
+
+    async def test_cache_is_unused_from_other_loop(self):
+        UserRedisService.start_listener()
+        await asyncio.sleep(0.02)
+        
+        other_loop = await asyncio.to_thread(lambda: asyncio.run(self.check_local_cache()))
+        
+        self.assertFalse(other_loop)
+        
+    async def check_local_cache(self):
+        return UserRedisService.uses_local_cache()
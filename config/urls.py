@@ -1,7 +1,10 @@
+from django.conf import settings
 from django.urls import path, include
+from .metrics import metrics_view
 
 urlpatterns = [
     path('api/game/reception/', include('reception.urls')),
     path('api/game/tournament/', include('tournament.urls')),
     path('api/game/arena/', include('arena.urls')),
+    path(settings.METRICS_PATH.lstrip('/'), metrics_view),
 ]
@@ -7,15 +7,23 @@ from config.close_codes import CloseCode
 from arena.services import ArenaService
 from arena.models import NormalMatch
 from asgiref.sync import sync_to_async
+from config.consumer_utils import build_client_event, timed_group_send
+from config.metrics import ConsumerMetricsMixin
+from urllib.parse import parse_qs
 
 
-class ReceptionConsumer(AsyncWebsocketConsumer):
+class ReceptionConsumer(ConsumerMetricsMixin, AsyncWebsocketConsumer):
+    metrics_label = 'reception'
+    delta_types = {'participant.join', 'participant.leave', 'participant.ready'}
+    full_participants = False
+    
     async def connect(self):
         self.is_added = False
         self.reception_id = self.scope['url_route']['kwargs']['reception_id']
         self.reception_group_name = ReceptionService.get_group_name(self.reception_id)
         self.user_id = self.scope['user_id']
         self.arena_id = None
+        self.full_participants = self.wants_full_participants()
         
         if not await self.validate_access():
             await self.close(code=CloseCode.INVALID_ACCESS)
@@ -28,12 +36,17 @@ class ReceptionConsumer(AsyncWebsocketConsumer):
             self.channel_name
         )
         
-        self.is_added = await ReceptionRedisService.add_user(self.reception_id, self.user_id, self.scope['token'])
-        if not self.is_added:
-            await self.loopback_user_update()
-            return
-        
-        await self.broadcast_user_update()
+        participant = await ReceptionRedisService.add_user(self.reception_id, self.user_id, self.scope['token'])
+        self.is_added = participant is not None
+        # 본인에게는 전체 명단, 나머지에게는 변경분을 전송
+        await self.loopback_user_update()
+        if self.is_added:
+            await self.broadcast_message('participant.join', participant)
+    
+    def wants_full_participants(self):
+        # 변경분을 모르는 이전 클라이언트는 ?participants=full로 연결하면 변경 때마다 전체 명단을 받음
+        query = parse_qs(self.scope.get('query_string', b'').decode())
+        return query.get('participants') == ['full']
     
     async def validate_access(self):
         if not await ReceptionService.exists(self.reception_id):
@@ -53,12 +66,12 @@ class ReceptionConsumer(AsyncWebsocketConsumer):
                 return
                 
             await ReceptionRedisService.remove_allowed_user(self.reception_id, self.user_id)
-            await ReceptionRedisService.remove_user(self.reception_id, self.user_id)
+            remaining = await ReceptionRedisService.remove_user(self.reception_id, self.user_id)
             
-            if await ReceptionRedisService.should_remove(self.reception_id):
+            if remaining < 1:
                 await ReceptionService.remove(self.reception_id)
             else:
-                await self.broadcast_user_update()
+                await self.broadcast_message('participant.leave', {'user_id': str(self.user_id)})
         
     async def receive(self, text_data):
         try:
@@ -73,15 +86,19 @@ class ReceptionConsumer(AsyncWebsocketConsumer):
             return await self.send_error('unknown message type')
             
     async def handle_ready(self, data):
-        await ReceptionRedisService.toggle_ready(self.reception_id, self.user_id)
+        is_ready = await ReceptionRedisService.toggle_ready(self.reception_id, self.user_id)
+        if is_ready is None:
+            return
         
-        await self.broadcast_user_update()
+        await self.broadcast_message('participant.ready', {'user_id': str(self.user_id), 'is_ready': is_ready})
         
-        if await ReceptionRedisService.should_start(self.reception_id):
+        # 준비를 해제한 경우에는 시작 조건을 볼 필요 없음
+        if is_ready and await ReceptionRedisService.should_start(self.reception_id):
             arena_id = ArenaService.generate_unique_id()
             await ReceptionService.set_playing(self.reception_id)
             # 브로드캐스트
-            await self.channel_layer.group_send(
+            await timed_group_send(
+                self.channel_layer,
                 self.reception_group_name,
                 {
                     'type': 'move_to_arena',
@@ -101,10 +118,6 @@ class ReceptionConsumer(AsyncWebsocketConsumer):
         
         await self.close()
         
-    async def broadcast_user_update(self):
-        message = await ReceptionRedisService.get_participants(self.reception_id)
-        await self.broadcast_message('participants', message)
-        
     async def loopback_user_update(self):
         message = await ReceptionRedisService.get_participants(self.reception_id)
         await self.send_json({
@@ -113,20 +126,16 @@ class ReceptionConsumer(AsyncWebsocketConsumer):
         })
         
     async def broadcast_message(self, message_type, message):
-        await self.channel_layer.group_send(
+        await timed_group_send(
+            self.channel_layer,
             self.reception_group_name,
-            {
-                'type': 'send_to_client',
-                'message_type': message_type,
-                'message': message
-            }
+            build_client_event(message_type, message)
         )
 
     async def send_to_client(self, event):
-        await self.send_json({
-            'type': event['message_type'],
-            'message': event['message']
-        })
+        if self.full_participants and event['message_type'] in self.delta_types:
+            return await self.loopback_user_update()
+        await self.send(text_data=event['text'])
         
     async def send_error(self, error_message):
         await self.send_json(error_message)
@@ -15,7 +15,7 @@ class ReceptionService:
 
     @staticmethod
     async def get_participants_count(reception_id):
-        return len(await ReceptionRedisService.get_participants(reception_id))
+        return await ReceptionRedisService.get_participants_count(reception_id)
     
     @staticmethod
     async def get_reception(reception_id):
@@ -0,0 +1,77 @@
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import patch, AsyncMock
+from reception.consumers import ReceptionConsumer
+from config.consumer_utils import build_client_event
+
+
+class TestReadyState(IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.redis = patch("reception.consumers.ReceptionRedisService").start()
+        self.service = patch("reception.consumers.ReceptionService").start()
+        self.service.set_playing = AsyncMock()
+        self.participants = [{'user_id': '7', 'is_ready': 1}]
+        self.redis.get_participants = AsyncMock(return_value=self.participants)
+        self.addCleanup(patch.stopall)
+
+        self.consumer = ReceptionConsumer()
+        self.consumer.reception_id = 1
+        self.consumer.reception_group_name = "reception_1"
+        self.consumer.user_id = 7
+        self.consumer.broadcast_message = AsyncMock()
+        self.consumer.channel_layer = AsyncMock()
+
+    async def test_ready_broadcasts_delta_and_checks_start(self):
+        self.redis.toggle_ready = AsyncMock(return_value=1)
+        self.redis.should_start = AsyncMock(return_value=False)
+
+        await self.consumer.handle_ready({})
+
+        self.consumer.broadcast_message.assert_awaited_once_with(
+            'participant.ready', {'user_id': '7', 'is_ready': 1}
+        )
+        self.redis.get_participants.assert_not_called()
+        self.redis.should_start.assert_awaited_once_with(1)
+        self.consumer.channel_layer.group_send.assert_not_called()
+
+    async def test_unready_skips_start_check(self):
+        self.redis.toggle_ready = AsyncMock(return_value=0)
+        self.redis.should_start = AsyncMock()
+
+        await self.consumer.handle_ready({})
+
+        self.redis.should_start.assert_not_called()
+
+    async def test_non_participant_is_ignored(self):
+        self.redis.toggle_ready = AsyncMock(return_value=None)
+
+        await self.consumer.handle_ready({})
+
+        self.consumer.broadcast_message.assert_not_called()
+
+    async def test_everyone_ready_moves_to_arena(self):
+        self.redis.toggle_ready = AsyncMock(return_value=1)
+        self.redis.should_start = AsyncMock(return_value=True)
+
+        await self.consumer.handle_ready({})
+
+        self.service.set_playing.assert_awaited_once_with(1)
+        event = self.consumer.channel_layer.group_send.await_args.args[1]
+        self.assertEqual(event['type'], 'move_to_arena')
+
+    async def test_delta_is_forwarded_as_is(self):
+        self.consumer.send = AsyncMock()
+        event = build_client_event('participant.ready', {'user_id': '8', 'is_ready': 1})
+        
+        await self.consumer.send_to_client(event)
+        
+        self.consumer.send.assert_awaited_once_with(text_data=event['text'])
+        self.redis.get_participants.assert_not_called()
+        
+    async def test_full_participants_client_gets_list_instead_of_delta(self):
+        self.consumer.scope = {'query_string': b'participants=full'}
+        self.consumer.full_participants = self.consumer.wants_full_participants()
+        self.consumer.send_json = AsyncMock()
+        
+        await self.consumer.send_to_client(build_client_event('participant.leave', {'user_id': '8'}))
+        
+        self.consumer.send_json.assert_awaited_once_with({'type': 'participants', 'message': self.participants})
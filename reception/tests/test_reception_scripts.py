@@ -0,0 +1,116 @@
+import importlib.util
+import json
+from unittest import IsolatedAsyncioTestCase, skipUnless
+from unittest.mock import patch, AsyncMock
+from config.redis_services import ReceptionRedisService, redis_client
+
+
+def profile(user_id):
+    return {"id": user_id, "nickname": f"user_{user_id}", "avatar": None}
+
+
+@skipUnless(
+    importlib.util.find_spec("fakeredis") and importlib.util.find_spec("lupa"),
+    "fakeredis[lua] is not installed"
+)
+class TestReceptionScripts(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        import fakeredis
+        self.redis = fakeredis.FakeAsyncRedis()
+        # 등록된 스크립트도 redis_client.get_client()로 evalsha를 보내므로 여기만 바꾸면 됨
+        patch.object(redis_client, "get_client", return_value=self.redis).start()
+        patch(
+            "config.redis_services.UserRedisService.get_or_fetch_user",
+            new=AsyncMock(side_effect=lambda user_id, token: profile(user_id))
+        ).start()
+        self.addCleanup(patch.stopall)
+        
+    async def asyncTearDown(self):
+        await self.redis.aclose()
+
+    async def test_join_adds_profile_and_current_reception(self):
+        participant = await ReceptionRedisService.add_user(1, 7, "token")
+        
+        self.assertEqual(participant, {"user_id": "7", "nickname": "user_7", "avatar": None, "is_ready": 0})
+        self.assertEqual(await ReceptionRedisService.get_current_reception(7), "1")
+        self.assertEqual(await ReceptionRedisService.get_participants_count(1), 1)
+
+    async def test_double_join_keeps_existing_state(self):
+        await ReceptionRedisService.add_user(1, 7, "token")
+        await ReceptionRedisService.toggle_ready(1, 7)
+        
+        again = await ReceptionRedisService.add_user(1, 7, "token")
+        
+        self.assertIsNone(again)
+        self.assertEqual(await ReceptionRedisService.get_participants_count(1), 1)
+        self.assertEqual(await ReceptionRedisService.get_counts(1), (1, 1))
+
+    async def test_leave_of_non_member_changes_nothing(self):
+        await ReceptionRedisService.add_user(1, 7, "token")
+        await ReceptionRedisService.toggle_ready(1, 7)
+        
+        remaining = await ReceptionRedisService.remove_user(1, 8)
+        
+        self.assertEqual(remaining, 1)
+        self.assertEqual(await ReceptionRedisService.get_counts(1), (1, 1))
+        self.assertEqual(await ReceptionRedisService.get_current_reception(7), "1")
+
+    async def test_leave_clears_ready_profile_and_current_reception(self):
+        await ReceptionRedisService.add_user(1, 7, "token")
+        await ReceptionRedisService.add_user(1, 8, "token")
+        await ReceptionRedisService.toggle_ready(1, 7)
+        
+        remaining = await ReceptionRedisService.remove_user(1, 7)
+        
+        self.assertEqual(remaining, 1)
+        self.assertEqual(await ReceptionRedisService.get_counts(1), (1, 0))
+        self.assertIsNone(await ReceptionRedisService.get_current_reception(7))
+        self.assertEqual([p["user_id"] for p in await ReceptionRedisService.get_participants(1)], ["8"])
+
+    async def test_ready_of_non_member_is_ignored(self):
+        await ReceptionRedisService.add_user(1, 7, "token")
+        
+        self.assertIsNone(await ReceptionRedisService.toggle_ready(1, 8))
+        self.assertEqual(await ReceptionRedisService.get_counts(1), (1, 0))
+
+    async def test_ready_toggles_back_and_forth(self):
+        await ReceptionRedisService.add_user(1, 7, "token")
+        
+        self.assertEqual(await ReceptionRedisService.toggle_ready(1, 7), 1)
+        self.assertEqual(await ReceptionRedisService.toggle_ready(1, 7), 0)
+        self.assertEqual(await ReceptionRedisService.get_counts(1), (1, 0))
+
+    async def test_ready_when_full_starts(self):
+        await ReceptionRedisService.add_user(1, 7, "token")
+        await ReceptionRedisService.add_user(1, 8, "token")
+        
+        await ReceptionRedisService.toggle_ready(1, 7)
+        self.assertFalse(await ReceptionRedisService.should_start(1))
+        await ReceptionRedisService.toggle_ready(1, 8)
+        
+        self.assertTrue(await ReceptionRedisService.should_start(1))
+        participants = await ReceptionRedisService.get_participants(1)
+        self.assertEqual({p["user_id"]: p["is_ready"] for p in participants}, {"7": 1, "8": 1})
+
+    async def test_alone_and_ready_does_not_start(self):
+        await ReceptionRedisService.add_user(1, 7, "token")
+        await ReceptionRedisService.toggle_ready(1, 7)
+        
+        self.assertFalse(await ReceptionRedisService.should_start(1))
+
+    async def test_legacy_participants_are_drained_on_first_change(self):
+        legacy = ReceptionRedisService.get_legacy_participants_key(1)
+        await self.redis.hset(legacy, mapping={
+            "7": json.dumps({**ReceptionRedisService.get_partial_detail(profile(7)), "is_ready": 1}),
+            "8": json.dumps({**ReceptionRedisService.get_partial_detail(profile(8)), "is_ready": 0}),
+        })
+        self.assertEqual(await ReceptionRedisService.get_participants_count(1), 2)
+        
+        again = await ReceptionRedisService.add_user(1, 7, "token")
+        
+        self.assertIsNone(again)
+        self.assertFalse(await self.redis.exists(legacy))
+        self.assertEqual(await ReceptionRedisService.get_counts(1), (2, 1))
+        participants = await ReceptionRedisService.get_participants(1)
+        self.assertEqual({p["user_id"]: p["is_ready"] for p in participants}, {"7": 1, "8": 0})
+        self.assertEqual(participants[0]["nickname"], f"user_{participants[0]['user_id']}")
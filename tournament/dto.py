@@ -6,8 +6,8 @@ from datetime import datetime
 
 
 class TournamentMatchDTO(BaseMatchDTO):
-    def __init__(self, match: TournamentMatch, token):
-        super().__init__(match, token)
+    def __init__(self, match: TournamentMatch, token, users=None):
+        super().__init__(match, token, users)
         self.round = match.round.round_number
         self.match_number = match.match_number
         self.state = match.state
@@ -23,12 +23,14 @@ class TournamentMatchDTO(BaseMatchDTO):
         
 
 class TournamentDTO():
-    def __init__(self, tournament: Tournament, token):
+    def __init__(self, tournament: Tournament, token, users=None):
+        if users is None:
+            users = self.get_users([tournament], token)
         self.id = getattr(tournament, 'id', None)
         self.name = tournament.name
         self.max_participants = tournament.max_participants
-        self.winner = self._get_user(tournament.winner, token)
-        self.creator = self._get_user(tournament.creator, token)
+        self.winner = users.get(tournament.winner)
+        self.creator = users.get(tournament.creator)
         self.state = tournament.state
         self.current_participants = tournament.current_participants
         self.total_rounds = tournament.total_rounds
@@ -47,9 +49,16 @@ class TournamentDTO():
             "created_at": self.created_at,
         }
         
-    def _get_user(self, user_id, token):
-        user = async_to_sync(UserRedisService.get_or_fetch_user_exclude_email)(user_id, token)
-        return user
+    @classmethod
+    def from_tournaments(cls, tournaments, token):
+        tournaments = list(tournaments)
+        users = cls.get_users(tournaments, token)
+        return [cls(tournament, token, users) for tournament in tournaments]
+    
+    @staticmethod
+    def get_users(tournaments, token):
+        user_ids = [user_id for tournament in tournaments for user_id in (tournament.winner, tournament.creator)]
+        return async_to_sync(UserRedisService.get_many_exclude_email)(user_ids, token)
     
     def _format_datetime(self, dt):
         if isinstance(dt, datetime):
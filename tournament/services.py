@@ -68,11 +68,9 @@ class TournamentService:
     
     @staticmethod
     def get_participants_detail(tournament: Tournament, token):
-        participant_ids = TournamentService.get_all_participant_ids(tournament)
-        participants_detail = [
-            async_to_sync(UserRedisService.get_or_fetch_user_exclude_email)(participant_id, token) for participant_id in participant_ids
-        ]
-        return participants_detail
+        participant_ids = list(TournamentService.get_all_participant_ids(tournament))
+        users = async_to_sync(UserRedisService.get_many_exclude_email)(participant_ids, token)
+        return [users.get(participant_id) for participant_id in participant_ids]
 
     @staticmethod
     def join(tournament_id, user_id, token):
@@ -33,7 +33,7 @@ class TournamentListView(generics.ListAPIView):
     
     def get_queryset(self):
         tournaments = Tournament.objects.all()
-        return [TournamentDTO(tournament, self.request.token).to_dict() for tournament in tournaments]
+        return [dto.to_dict() for dto in TournamentDTO.from_tournaments(tournaments, self.request.token)]
     
         
 class TournamentDetailView(APIView):
@@ -41,7 +41,7 @@ class TournamentDetailView(APIView):
         matches = TournamentMatch.objects.filter(round__tournament_id=tournament_id)\
             .order_by('match_number')
             
-        match_dtos = [TournamentMatchDTO(match, request.token).to_dict() for match in matches]
+        match_dtos = [dto.to_dict() for dto in TournamentMatchDTO.from_matches(matches, request.token)]
         serializer = TournamentMatchSerializer(match_dtos, many=True)
         tournament_bracket = serializer.data
         try:
@@ -76,6 +76,6 @@ class TournamentBracketView(APIView):
         matches = TournamentMatch.objects.filter(round__tournament_id=tournament_id)\
             .order_by('match_number')
             
-        match_dtos = [TournamentMatchDTO(match, request.token).to_dict() for match in matches]
+        match_dtos = [dto.to_dict() for dto in TournamentMatchDTO.from_matches(matches, request.token)]
         serializer = TournamentMatchSerializer(match_dtos, many=True)
         return Response(serializer.data)
\ No newline at end of file